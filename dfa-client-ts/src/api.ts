@@ -23,42 +23,79 @@ interface MinimezedState {
     alphabet: string[];  // Алфавит (массив символов)
     start_state: string | null;  // Начальное состояние (строка или null)
   }
+
+  // Колоночный формат ответа (?format=columnar): переходы — параллельные массивы индексов
+  export interface ColumnarDFA {
+    format: 'columnar';
+    states: string[];  // Имена состояний
+    finals: number[];  // 1, если состояние с тем же индексом финальное
+    alphabet: string[];
+    start: number | null;  // Индекс начального состояния
+    source: number[];  // Индексы исходных состояний
+    symbol: number[];  // Индексы символов алфавита
+    target: number[];  // Индексы целевых состояний
+  }
+
+  // Разворачивает колоночный ответ в привычный MinimezedDFA
+  export const fromColumnar = (data: ColumnarDFA): MinimezedDFA => ({
+    states: data.states.map((name, i) => ({ name, is_final: data.finals[i] === 1 })),
+    transitions: data.source.map((source, i) => ({
+      source: data.states[source],
+      symbol: data.alphabet[data.symbol[i]],
+      target: data.states[data.target[i]],
+    })),
+    alphabet: data.alphabet,
+    start_state: data.start === null ? null : data.states[data.start],
+  });
+
+  // Для больших автоматов колоночный формат заметно меньше; gzip браузер распакует сам
+  const resultUrl = (path: string, columnar: boolean): string =>
+    `${API_BASE_URL}${path}${columnar ? '?format=columnar' : ''}`;
+
+  // Запрос отменён через AbortController — это не ошибка, а замена более новым запросом
+  export const isAbortError = (error: unknown): boolean =>
+    error instanceof DOMException && error.name === 'AbortError';
+
+  const readAutomaton = async (response: Response, columnar: boolean): Promise<MinimezedDFA> => {
+    const result = await response.json();
+    return columnar ? fromColumnar(result as ColumnarDFA) : result;
+  };
   
 
 
 
-export const minimizeAutomaton = async (automaton: DFA): Promise<MinimezedDFA> => {
+export const minimizeAutomaton = async (automaton: DFA, columnar = false, signal?: AbortSignal): Promise<MinimezedDFA> => {
   try {
-    const response = await fetch(`${API_BASE_URL}/minimize`, {
+    const response = await fetch(resultUrl('/minimize', columnar), {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify(automaton),  // Отправляем один автомат
+      signal,
     });
 
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
 
-    const result = await response.json();
-    return result;  // Предполагаем, что сервер вернет один минимизированный автомат
+    return await readAutomaton(response, columnar);  // Сервер вернет один минимизированный автомат
   } catch (error) {
-    console.error('Error minimizing automaton:', error);
+    if (!isAbortError(error)) console.error('Error minimizing automaton:', error);
     throw error;
   }
 };
 
 
-export const checkEquivalence = async (automata: DFA[]): Promise<EquivalenceResponse> => {
+export const checkEquivalence = async (automata: DFA[], signal?: AbortSignal): Promise<EquivalenceResponse> => {
   try {
-    console.log("sent automata: "+ JSON.stringify(automata));
     const response = await fetch(`${API_BASE_URL}/equivalence`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
       },
       body: JSON.stringify(automata),
+      signal,
     });
 
 
@@ -68,65 +105,106 @@ export const checkEquivalence = async (automata: DFA[]): Promise<EquivalenceResp
     const result = await response.json();
     return await result as EquivalenceResponse;
   } catch (error) {
-    console.error('Error checking equivalence:', error);
+    if (!isAbortError(error)) console.error('Error checking equivalence:', error);
     throw error;
   }
 };
 
 // Пример использования (для тестов)
-export const mockCheckEquivalence = async (automata: DFA[]): Promise<EquivalenceResponse> => {
-  console.log('Mock equivalence check for:', automata);
+export const mockCheckEquivalence = async (_automata: DFA[]): Promise<EquivalenceResponse> => {
   await new Promise(resolve => setTimeout(resolve, 5)); // Имитация задержки сети
   return { equivalent: Math.random() < 0.5 }; // Всегда возвращает true в моке
 };
 
-export const checkDifference = async (automata: DFA[]): Promise<MinimezedDFA> => {
+export const checkDifference = async (automata: DFA[], columnar = false, signal?: AbortSignal): Promise<MinimezedDFA> => {
     if (automata.length !== 2) {
         throw new Error("Необходимо передать два автомата для вычисления различия");
     }
     try {
-        const response = await fetch(`${API_BASE_URL}/difference`, {
+        const response = await fetch(resultUrl('/difference', columnar), {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify(automata),
+        signal,
         });
 
         if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
         }
 
-        const result = await response.json();
-        return result;  // Возвращаем результат различия
+        return await readAutomaton(response, columnar);  // Возвращаем результат различия
     } catch (error) {
-        console.error('Error checking difference:', error);
+        if (!isAbortError(error)) console.error('Error checking difference:', error);
         throw error;
     }
 };
 
 // Новый эндпоинт для произведения автоматов
-export const checkProduct = async (automata: DFA[]): Promise<MinimezedDFA> => {
+export const checkProduct = async (automata: DFA[], columnar = false, signal?: AbortSignal): Promise<MinimezedDFA> => {
     if (automata.length !== 2) {
         throw new Error("Необходимо передать два автомата для вычисления произведения");
     }
     try {
-        const response = await fetch(`${API_BASE_URL}/product`, {
+        const response = await fetch(resultUrl('/product', columnar), {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify(automata),
+        signal,
+        });
+
+        if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        return await readAutomaton(response, columnar);  // Возвращаем результат произведения
+    } catch (error) {
+        if (!isAbortError(error)) console.error('Error checking product:', error);
+        throw error;
+    }
+};
+
+// Шаг серверного конвейера: операция над именованными входами или результатами других шагов
+export type PipelineOperation =
+    | 'minimize' | 'difference' | 'product' | 'intersection' | 'union' | 'xor'
+    | 'equivalent' | 'is_empty' | 'witness' | 'accepts'
+    | 'concatenation' | 'star' | 'reversal' | 'right_quotient' | 'left_quotient';
+
+export interface PipelineStep {
+    op: PipelineOperation;
+    args: string[];
+    word?: string;  // только для accepts
+}
+
+export interface PipelineRequest {
+    inputs: Record<string, DFA>;
+    steps: Record<string, PipelineStep>;
+    outputs: string[];
+}
+
+export type PipelineValue = MinimezedDFA | boolean | string | null;
+
+// Выполняет цепочку операций за один запрос: промежуточные автоматы остаются на сервере
+export const runPipeline = async (pipeline: PipelineRequest): Promise<Record<string, PipelineValue>> => {
+    try {
+        const response = await fetch(`${API_BASE_URL}/pipeline`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(pipeline),
         });
 
         if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
         }
 
-        const result = await response.json();
-        return result;  // Возвращаем результат произведения
+        return await response.json();
     } catch (error) {
-        console.error('Error checking product:', error);
+        console.error('Error running pipeline:', error);
         throw error;
     }
-};
\ No newline at end of file
+};
@@ -5,7 +5,8 @@ import rough from 'roughjs/bin/rough';
 import { getArrow } from 'perfect-arrows';
 import './AutomatonCanvas.css';
 import { DFA } from '../types';
-import { checkDifference, checkProduct, MinimezedDFA, minimizeAutomaton } from '../api';
+import { MinimezedDFA } from '../api';
+import { isAbortError, requestDifference, requestMinimize, requestProduct } from '../requestLayer';
 import dagre from 'dagre';
 
 
@@ -55,6 +56,8 @@ const AutomatonCanvas: React.FC<Props> = ({ height, onAutomatonUpdate, otherAuto
   const [isTableView, setIsTableView] = useState(false); // для переключения между графом и таблицей
 
   const clickTimeoutRef = useRef<number | null>(null);
+  // Свой канал запросов у каждого холста: новый запрос отменяет только устаревший запрос этого же холста
+  const canvasId = useRef(uuidv4()).current;
 
   const rc = useMemo(() => rough.svg(document.createElementNS('http://www.w3.org/2000/svg', 'svg')), []);
   const nodeSvgCache = useMemo(() => new Map<string, string>(), []);
@@ -232,11 +235,12 @@ const AutomatonCanvas: React.FC<Props> = ({ height, onAutomatonUpdate, otherAuto
     try {
       const dfa: DFA = getCurrentDFA();
   
-      const minimized = await minimizeAutomaton(dfa);
+      const minimized = await requestMinimize(dfa, `minimize:${canvasId}`);
       
       renderNewDFA(minimized)
       
     } catch (error) {
+      if (isAbortError(error)) return;  // Запрос заменён более новым
       console.error('Ошибка минимизации левого автомата', error);
     }
   };
@@ -250,9 +254,10 @@ const AutomatonCanvas: React.FC<Props> = ({ height, onAutomatonUpdate, otherAuto
       }
 
       const dfa: DFA = getCurrentDFA();
-      const difference = await checkDifference([dfa, otherAutomaton]);
+      const difference = await requestDifference([dfa, otherAutomaton], `difference:${canvasId}`);
       renderNewDFA(difference);
     } catch (error) {
+      if (isAbortError(error)) return;  // Запрос заменён более новым
       console.error('Ошибка выполнения операции разности', error);
     }
   };
@@ -272,9 +277,10 @@ const AutomatonCanvas: React.FC<Props> = ({ height, onAutomatonUpdate, otherAuto
       }
 
       const dfa: DFA = getCurrentDFA();
-      const product = await checkProduct([dfa, otherAutomaton]);
+      const product = await requestProduct([dfa, otherAutomaton], `product:${canvasId}`);
       renderNewDFA(product);
     } catch (error) {
+      if (isAbortError(error)) return;  // Запрос заменён более новым
       console.error('Ошибка выполнения операции произведения', error);
     }
   };
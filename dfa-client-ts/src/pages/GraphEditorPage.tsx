@@ -1,7 +1,7 @@
 // GraphEditorPage.tsx
 import React, { useCallback, useEffect, useMemo, useState } from 'react';
 import AutomatonCanvas from '../components/AutomatonCanvas';
-import { checkEquivalence, minimizeAutomaton, mockCheckEquivalence } from '../api';
+import { isAbortError, requestEquivalence } from '../requestLayer';
 import '../styles/notebook.css';
 import { DFA } from '../types';
 
@@ -36,13 +36,13 @@ const GraphEditorPage: React.FC = () => {
     setEquivalenceResult(null);
     
     try {
-      // Используйте mockCheckEquivalence для тестов без бекенда
-      // или checkEquivalence для реальных запросов
-      const result = await checkEquivalence([leftAutomaton, rightAutomaton]);
+      // Повторная проверка тех же автоматов берётся из кэша (mockCheckEquivalence — для тестов без бекенда)
+      const result = await requestEquivalence([leftAutomaton, rightAutomaton]);
       setEquivalenceResult(result.equivalent);
       setMessage(result.equivalent? 'Эквивалентны, Кириллов!': 'Не эквивалентны, Кириллов!');
       
     } catch (error) {
+      if (isAbortError(error)) return;  // Проверку заменила более новая
       console.error('Error:', error);
       setMessage('Учитель спит, не получилось проверить');
     } finally {
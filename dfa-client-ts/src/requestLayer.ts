@@ -0,0 +1,142 @@
+// requestLayer.ts
+// Слой запросов поверх api.ts: кэш по содержимому автомата, склейка серий правок
+// в один запрос и отмена устаревших запросов через AbortController.
+import {
+  checkDifference,
+  checkEquivalence,
+  checkProduct,
+  isAbortError,
+  MinimezedDFA,
+  minimizeAutomaton,
+} from './api';
+import { DFA, EquivalenceResponse } from './types';
+
+const CACHE_SIZE = 100;  // Сколько последних ответов держать в памяти
+const COALESCE_DELAY_MS = 150;  // Пауза, в течение которой правки склеиваются в один запрос
+
+// Каноническая строка автомата: порядок состояний и переходов и позиции на холсте не влияют
+const canonicalAutomaton = (dfa: DFA): string => {
+  const states = dfa.states.map((s) => `${s.name}${s.is_final ? '*' : ''}`).sort();
+  const transitions = dfa.transitions
+    .map((t) => `${t.source.name}\u0000${t.symbol}\u0000${t.target.name}`)
+    .sort();
+  const alphabet = [...dfa.alphabet].sort();
+  return JSON.stringify([states, transitions, alphabet, dfa.start_state?.name ?? null]);
+};
+
+// 53-битный хеш строки (cyrb53): быстрый и синхронный, криптостойкость здесь не нужна
+const hashString = (text: string): string => {
+  let h1 = 0xdeadbeef;
+  let h2 = 0x41c6ce57;
+  for (let i = 0; i < text.length; i++) {
+    const code = text.charCodeAt(i);
+    h1 = Math.imul(h1 ^ code, 2654435761);
+    h2 = Math.imul(h2 ^ code, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(36);
+};
+
+export const hashAutomaton = (dfa: DFA): string => hashString(canonicalAutomaton(dfa));
+
+// LRU на Map: порядок вставки — порядок использования
+class LRUCache<V> {
+  private entries = new Map<string, V>();
+
+  constructor(private readonly capacity: number) {}
+
+  get(key: string): V | undefined {
+    const value = this.entries.get(key);
+    if (value !== undefined) {
+      this.entries.delete(key);
+      this.entries.set(key, value);
+    }
+    return value;
+  }
+
+  set(key: string, value: V): void {
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    if (this.entries.size > this.capacity) {
+      this.entries.delete(this.entries.keys().next().value as string);
+    }
+  }
+}
+
+interface Pending {
+  key: string;
+  controller: AbortController;
+  promise: Promise<unknown>;
+}
+
+const cache = new LRUCache<unknown>(CACHE_SIZE);
+const inFlight = new Map<string, Pending>();  // Канал -> текущий запрос
+
+const abortError = (): DOMException => new DOMException('Запрос заменён более новым', 'AbortError');
+
+const wait = (ms: number, signal: AbortSignal): Promise<void> =>
+  new Promise((resolve, reject) => {
+    const timer = setTimeout(resolve, ms);
+    signal.addEventListener('abort', () => {
+      clearTimeout(timer);
+      reject(abortError());
+    }, { once: true });
+  });
+
+// Выполняет запрос в канале (например, «минимизация на левом холсте»):
+// повтор уже полученного ответа берётся из кэша, тот же запрос в полёте переиспользуется,
+// а новый запрос в канале отменяет предыдущий — его промис отклоняется с AbortError.
+const request = <T>(channel: string, key: string, run: (signal: AbortSignal) => Promise<T>): Promise<T> => {
+  const current = inFlight.get(channel);
+  const cached = cache.get(key);
+  if (cached !== undefined) {
+    // Ответ из кэша — самый свежий в канале: запрос в полёте устарел и не должен его перекрыть
+    if (current) {
+      current.controller.abort();
+      inFlight.delete(channel);
+    }
+    return Promise.resolve(cached as T);
+  }
+
+  if (current && current.key === key) {
+    return current.promise as Promise<T>;
+  }
+  current?.controller.abort();
+
+  const controller = new AbortController();
+  const promise = (async () => {
+    try {
+      await wait(COALESCE_DELAY_MS, controller.signal);
+      const result = await run(controller.signal);
+      cache.set(key, result);
+      if (controller.signal.aborted) {
+        throw abortError();  // ответ успел прийти, но канал уже показывает более новый результат
+      }
+      return result;
+    } finally {
+      if (inFlight.get(channel)?.controller === controller) {
+        inFlight.delete(channel);
+      }
+    }
+  })();
+  inFlight.set(channel, { key, controller, promise });
+  return promise;
+};
+
+export const requestMinimize = (dfa: DFA, channel = 'minimize'): Promise<MinimezedDFA> =>
+  request(channel, `minimize:${hashAutomaton(dfa)}`, (signal) => minimizeAutomaton(dfa, false, signal));
+
+export const requestEquivalence = (automata: DFA[], channel = 'equivalence'): Promise<EquivalenceResponse> =>
+  request(channel, `equivalence:${automata.map(hashAutomaton).join(':')}`,
+    (signal) => checkEquivalence(automata, signal));
+
+export const requestDifference = (automata: DFA[], channel = 'difference'): Promise<MinimezedDFA> =>
+  request(channel, `difference:${automata.map(hashAutomaton).join(':')}`,
+    (signal) => checkDifference(automata, false, signal));
+
+export const requestProduct = (automata: DFA[], channel = 'product'): Promise<MinimezedDFA> =>
+  request(channel, `product:${automata.map(hashAutomaton).join(':')}`,
+    (signal) => checkProduct(automata, false, signal));
+
+export { isAbortError };
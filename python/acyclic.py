@@ -0,0 +1,132 @@
+from collections import deque
+
+from models import DFA
+from util import dfa_from_canonical
+
+
+class _Node:
+    __slots__ = ("id", "final", "children")
+
+    def __init__(self, node_id: int):
+        self.id = node_id
+        self.final = False
+        self.children = {}
+
+    def signature(self):
+        # Дети уже зарегистрированы (канонические), поэтому достаточно их id.
+        # Слова идут по возрастанию, значит и дети добавлялись в порядке символов.
+        return self.final, tuple((symbol, child.id) for symbol, child in self.children.items())
+
+
+class AcyclicDFABuilder:
+    """
+    Инкрементальное построение минимального ациклического ДКА (алгоритм Дачука).
+
+    Слова подаются по возрастанию. Когда очередное слово расходится с предыдущим,
+    «хвост» предыдущего слова больше не изменится: его узлы либо заменяются
+    равными уже зарегистрированными, либо сами попадают в реестр. Поэтому
+    автомат всё время остаётся минимальным, кроме пути последнего слова.
+    """
+
+    def __init__(self):
+        self._next_id = 0
+        self.root = self._new_node()
+        self._register = {}
+        self._path = [self.root]  # узлы на пути предыдущего слова
+        self._previous = ""
+        self._finished = False
+
+    def _new_node(self):
+        node = _Node(self._next_id)
+        self._next_id += 1
+        return node
+
+    def add(self, word: str):
+        if self._finished:
+            raise ValueError("Построение уже завершено")
+        if word < self._previous:
+            raise ValueError(f"Слова должны идти по возрастанию: {word!r} после {self._previous!r}")
+        if word == self._previous and self._path[-1].final:
+            return  # повтор
+
+        common = 0
+        limit = min(len(word), len(self._previous))
+        while common < limit and word[common] == self._previous[common]:
+            common += 1
+
+        self._replace_or_register(common)
+        node = self._path[-1]
+        for symbol in word[common:]:
+            child = self._new_node()
+            node.children[symbol] = child
+            self._path.append(child)
+            node = child
+        node.final = True
+        self._previous = word
+
+    def _replace_or_register(self, down_to: int):
+        """Минимизирует узлы пути предыдущего слова глубже down_to."""
+        while len(self._path) > down_to + 1:
+            node = self._path.pop()
+            parent = self._path[-1]
+            symbol = self._previous[len(self._path) - 1]
+            key = node.signature()
+            existing = self._register.get(key)
+            if existing is not None:
+                parent.children[symbol] = existing
+            else:
+                self._register[key] = node
+
+    def finish(self):
+        """Завершает построение и возвращает корень минимального автомата."""
+        if not self._finished:
+            self._replace_or_register(0)
+            self._finished = True
+        return self.root
+
+    @property
+    def state_count(self) -> int:
+        """Число состояний (после finish — размер минимального автомата)."""
+        return len(self._register) + len(self._path)
+
+    def to_canonical(self):
+        """Компактная форма (алфавит, финальность, строки переходов), как util.canonical_form."""
+        root = self.finish()
+        alphabet = set()
+        numbering = {root.id: 0}
+        order = [root]
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for symbol, child in node.children.items():
+                alphabet.add(symbol)
+                if child.id not in numbering:
+                    numbering[child.id] = len(order)
+                    order.append(child)
+                    queue.append(child)
+
+        alphabet = tuple(sorted(alphabet))
+        columns = {symbol: idx for idx, symbol in enumerate(alphabet)}
+        rows = []
+        for node in order:
+            row = [-1] * len(alphabet)
+            for symbol, child in node.children.items():
+                row[columns[symbol]] = numbering[child.id]
+            rows.append(tuple(row))
+        return alphabet, tuple(node.final for node in order), tuple(rows)
+
+    def to_dfa(self) -> DFA:
+        return dfa_from_canonical(*self.to_canonical())
+
+
+def dfa_from_sorted_words(words, compact: bool = False):
+    """
+    Строит минимальный ДКА для конечного множества слов, поданных по возрастанию.
+
+    :param compact: Вернуть компактную форму (алфавит, финальность, строки переходов)
+        вместо DFA — её можно передать в util.dfa_from_canonical позже.
+    """
+    builder = AcyclicDFABuilder()
+    for word in words:
+        builder.add(word)
+    return builder.to_canonical() if compact else builder.to_dfa()
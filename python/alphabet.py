@@ -0,0 +1,91 @@
+from collections import defaultdict
+
+from models import DFA, Transition
+
+
+class SymbolClasses:
+    """
+    Разбиение алфавита на классы символов с одинаковыми столбцами переходов.
+
+    Символы одного класса ведут из каждого состояния в одно и то же состояние,
+    поэтому алгоритмам достаточно перебирать по одному представителю класса.
+    """
+
+    def __init__(self, classes):
+        self.classes = [tuple(sorted(cls)) for cls in classes if cls]
+        self.classes.sort()
+        self.members = {cls[0]: cls for cls in self.classes}
+        self.representative = {symbol: cls[0] for cls in self.classes for symbol in cls}
+
+    @classmethod
+    def from_dfas(cls, *dfas):
+        """Строит общее разбиение алфавитов нескольких ДКА (например, операндов произведения)."""
+        alphabet = set().union(*(dfa.alphabet for dfa in dfas))
+        columns = defaultdict(list)
+        for idx, dfa in enumerate(dfas):
+            for t in dfa.transitions:
+                columns[t.symbol].append((idx, t.source, t.target))
+
+        groups = defaultdict(set)
+        for symbol in alphabet:
+            groups[frozenset(columns.get(symbol, ()))].add(symbol)
+        return cls(groups.values())
+
+    def __len__(self):
+        return len(self.classes)
+
+    def representatives(self):
+        """По одному символу из каждого класса."""
+        return list(self.members)
+
+    def is_trivial(self) -> bool:
+        """True, если сжатие ничего не даёт: каждый символ в своём классе."""
+        return len(self.classes) == len(self.representative)
+
+    def label(self, symbol: str) -> str:
+        """Метка класса символа в виде диапазонов, например `0-9,a-f`."""
+        return range_label(self.members[self.representative[symbol]])
+
+
+def range_label(symbols, escape=None) -> str:
+    """
+    Сворачивает набор символов в строку диапазонов: {a, b, c, x} -> `a-c,x`.
+
+    :param escape: Необязательное экранирование каждого символа (и концов диапазонов),
+        чтобы символы `-` и `,` не путались с разделителями.
+    """
+    escape = escape or (lambda symbol: symbol)
+    chars = sorted(s for s in symbols if len(s) == 1)
+    others = sorted(s for s in symbols if len(s) != 1)
+
+    parts = []
+    idx = 0
+    while idx < len(chars):
+        end = idx
+        while end + 1 < len(chars) and ord(chars[end + 1]) == ord(chars[end]) + 1:
+            end += 1
+        if end - idx >= 2:
+            parts.append(f"{escape(chars[idx])}-{escape(chars[end])}")
+        else:
+            parts.extend(escape(char) for char in chars[idx:end + 1])
+        idx = end + 1
+    return ",".join(parts + [escape(symbol) for symbol in others])
+
+
+def compress_dfa(dfa: DFA, classes: SymbolClasses) -> DFA:
+    """ДКА над представителями классов вместо исходного алфавита."""
+    representatives = set(classes.representatives())
+    transitions = {t for t in dfa.transitions if t.symbol in representatives}
+    return DFA(dfa.states, representatives & dfa.alphabet, transitions, dfa.start_state)
+
+
+def expand_dfa(dfa: DFA, classes: SymbolClasses) -> DFA:
+    """Обратное к compress_dfa: размножает переходы представителя на весь класс."""
+    transitions = set()
+    alphabet = set()
+    for t in dfa.transitions:
+        for symbol in classes.members.get(t.symbol, (t.symbol,)):
+            transitions.add(Transition(t.source, symbol, t.target))
+    for symbol in dfa.alphabet:
+        alphabet.update(classes.members.get(symbol, (symbol,)))
+    return DFA(dfa.states, alphabet, transitions, dfa.start_state)
@@ -0,0 +1,143 @@
+import threading
+import time
+
+# Как часто (в вызовах charge) сверяться с часами и токеном отмены
+CHECK_INTERVAL = 256
+
+
+class CancellationToken:
+    """Флаг кооперативной отмены: алгоритмы проверяют его во внутренних циклах."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class BudgetExceeded(Exception):
+    """
+    Операция вышла за бюджет или была отменена.
+
+    :ivar reason: "states", "transitions", "deadline" или "cancelled".
+    :ivar stats: Сколько успели сделать к моменту остановки.
+    """
+
+    def __init__(self, reason: str, stats: dict):
+        super().__init__(f"Превышен бюджет операции ({reason}): {stats}")
+        self.reason = reason
+        self.stats = stats
+
+    def to_dict(self):
+        return {"error": str(self), "reason": self.reason, "stats": self.stats}
+
+
+class Budget:
+    """
+    Ограничения на ресурсы одной операции.
+
+    Алгоритмы вызывают charge() по мере работы; при выходе за любой лимит
+    бросается BudgetExceeded со статистикой выполненной части.
+    Все лимиты необязательны: None — без ограничения.
+    """
+
+    def __init__(self, max_states: int | None = None, max_transitions: int | None = None,
+                 timeout: float | None = None, token: CancellationToken | None = None,
+                 on_progress=None):
+        """
+        :param timeout: Ограничение по времени в секундах, отсчитывается от создания бюджета.
+        :param on_progress: Необязательная функция, которой периодически передаётся stats().
+        """
+        self.max_states = max_states
+        self.max_transitions = max_transitions
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.token = token
+        self.on_progress = on_progress
+        self.started = time.monotonic()
+        self.states = 0
+        self.transitions = 0
+        self.rounds = 0
+        self.stage = None
+        self._calls = 0
+
+    def charge(self, states: int = 0, transitions: int = 0):
+        """Учитывает обработанные состояния и переходы и проверяет лимиты."""
+        self.states += states
+        self.transitions += transitions
+        if self.max_states is not None and self.states > self.max_states:
+            raise BudgetExceeded("states", self.stats())
+        if self.max_transitions is not None and self.transitions > self.max_transitions:
+            raise BudgetExceeded("transitions", self.stats())
+        self._calls += 1
+        if self._calls % CHECK_INTERVAL == 0:
+            self.check()
+
+    def next_round(self, stage: str):
+        """Отмечает начало очередного раунда (например, уточнения разбиения)."""
+        self.stage = stage
+        self.rounds += 1
+        self.check()
+
+    def check(self):
+        """Проверка времени и отмены без учёта работы."""
+        if self.token is not None and self.token.cancelled:
+            raise BudgetExceeded("cancelled", self.stats())
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded("deadline", self.stats())
+        if self.on_progress is not None:
+            self.on_progress(self.stats())
+
+    def stats(self) -> dict:
+        return {
+            "states_explored": self.states,
+            "transitions_built": self.transitions,
+            "rounds": self.rounds,
+            "stage": self.stage,
+            "elapsed": round(time.monotonic() - self.started, 6),
+        }
+
+
+LIMIT_NAMES = ("max_states", "max_transitions", "timeout")
+
+
+class InvalidLimits(ValueError):
+    """Лимит задан не числом или отрицательным числом."""
+
+
+def _parse_limit(name: str, value):
+    try:
+        parsed = float(value) if name == "timeout" else int(value)
+    except (TypeError, ValueError):
+        raise InvalidLimits(f"Некорректное значение лимита {name}: {value!r}") from None
+    if not parsed >= 0:  # отсекает и NaN
+        raise InvalidLimits(f"Лимит {name} должен быть неотрицательным: {value!r}")
+    return parsed
+
+
+def merge_limits(ceiling: dict, requested: dict) -> dict:
+    """
+    Объединяет лимиты: из запрошенных и предельных берётся меньший.
+
+    Запросить можно только не больше, чем разрешено сервером или CLI.
+    При некорректном значении бросается InvalidLimits.
+    """
+    if not isinstance(requested, dict):
+        raise InvalidLimits("Лимиты должны быть объектом")
+    merged = {}
+    for name in LIMIT_NAMES:
+        values = [_parse_limit(name, v) for v in (ceiling.get(name), requested.get(name)) if v is not None]
+        if values:
+            merged[name] = min(values)
+    return merged
+
+
+def budget_from_limits(limits: dict, token: CancellationToken | None = None, on_progress=None) -> Budget | None:
+    """Создаёт Budget по словарю лимитов или возвращает None, если ограничивать нечего."""
+    limits = {name: limits[name] for name in LIMIT_NAMES if limits.get(name) is not None}
+    if not limits and token is None and on_progress is None:
+        return None
+    return Budget(token=token, on_progress=on_progress, **limits)
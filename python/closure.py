@@ -0,0 +1,210 @@
+from collections import defaultdict, deque
+
+from metrics import registry as metrics
+from models import DFA, State, Transition
+
+
+class _NFA:
+    """
+    НКА без ε-переходов: состояния — любые хешируемые значения,
+    edges[состояние][символ] — множество преемников.
+    """
+
+    def __init__(self, alphabet=()):
+        self.alphabet = set(alphabet)
+        self.starts = set()
+        self.finals = set()
+        self.edges = defaultdict(lambda: defaultdict(set))
+
+    def add(self, source, symbol, target):
+        self.edges[source][symbol].add(target)
+
+    @classmethod
+    def from_dfa(cls, dfa: DFA, tag=None):
+        """Копия ДКА; состояния помечаются tag, чтобы копии разных автоматов не пересекались."""
+        nfa = cls(dfa.alphabet)
+        if dfa.start_state is not None:
+            nfa.starts.add((tag, dfa.start_state))
+        nfa.finals = {(tag, state) for state in dfa.states if state.is_final}
+        for t in dfa.transitions:
+            nfa.add((tag, t.source), t.symbol, (tag, t.target))
+        return nfa
+
+
+def _reverse(nfa: _NFA) -> _NFA:
+    reversed_nfa = _NFA(nfa.alphabet)
+    reversed_nfa.starts = set(nfa.finals)
+    reversed_nfa.finals = set(nfa.starts)
+    for source, by_symbol in nfa.edges.items():
+        for symbol, targets in by_symbol.items():
+            for target in targets:
+                reversed_nfa.add(target, symbol, source)
+    return reversed_nfa
+
+
+def _determinize(nfa: _NFA, budget=None) -> _NFA:
+    """
+    Построение подмножеств на лету: достижимые подмножества интернируются
+    в номера 0, 1, … (0 — стартовое), пустое подмножество не создаётся.
+    Результат — детерминированный _NFA с одноэлементными множествами преемников.
+    """
+    dfa = _NFA(nfa.alphabet)
+    if not nfa.starts:
+        return dfa
+    symbols = sorted(nfa.alphabet)
+    start = frozenset(nfa.starts)
+    ids = {start: 0}
+    subsets = [start]
+    dfa.starts.add(0)
+    idx = 0
+    while idx < len(subsets):
+        subset = subsets[idx]
+        if budget is not None:
+            budget.charge(states=1, transitions=len(symbols))
+        if not subset.isdisjoint(nfa.finals):
+            dfa.finals.add(idx)
+        for symbol in symbols:
+            target = frozenset(t for state in subset for t in nfa.edges[state].get(symbol, ()))
+            if not target:
+                continue
+            if target not in ids:
+                ids[target] = len(subsets)
+                subsets.append(target)
+            dfa.add(idx, symbol, ids[target])
+        idx += 1
+    return dfa
+
+
+def _to_dfa(nfa: _NFA) -> DFA:
+    if not nfa.starts:
+        return DFA(set(), set(nfa.alphabet), set(), None)
+    numbers = {0} | nfa.finals | set(nfa.edges)
+    numbers.update(target for by_symbol in nfa.edges.values() for targets in by_symbol.values() for target in targets)
+    states = {state: State(f"C{state}", is_final=state in nfa.finals) for state in numbers}
+    transitions = {
+        Transition(states[source], symbol, states[target])
+        for source, by_symbol in nfa.edges.items()
+        for symbol, targets in by_symbol.items()
+        for target in targets
+    }
+    return DFA(set(states.values()), set(nfa.alphabet), transitions, states[0])
+
+
+def _minimal(nfa: _NFA, operation: str, budget=None) -> DFA:
+    """
+    Минимальный ДКА по НКА алгоритмом Бжозовского: det(rev(det(rev(N)))).
+
+    Детерминизация самого N никогда не строится: подмножества создаются
+    на лету только для обращённых автоматов, а второе построение подмножеств
+    сразу даёт минимальный ДКА без недостижимых и мёртвых состояний.
+    """
+    if budget is not None:
+        budget.stage = operation
+    with metrics.timer(operation):
+        with metrics.timer(operation, "reverse_determinize"):
+            intermediate = _determinize(_reverse(nfa), budget)
+        with metrics.timer(operation, "determinize"):
+            result = _to_dfa(_determinize(_reverse(intermediate), budget))
+        metrics.observe("dfa_output_states", len(result.states), operation=operation)
+    return result
+
+
+def concatenation(dfa1: DFA, dfa2: DFA, budget=None) -> DFA:
+    """Минимальный ДКА для L(A)·L(B)."""
+    nfa = _NFA(dfa1.alphabet | dfa2.alphabet)
+    if dfa1.start_state is None or dfa2.start_state is None:
+        return _minimal(nfa, "concatenation", budget)
+
+    first, second = _NFA.from_dfa(dfa1, 1), _NFA.from_dfa(dfa2, 2)
+    nfa.edges = first.edges
+    for source, by_symbol in second.edges.items():
+        nfa.edges[source] = by_symbol
+    b_start = (2, dfa2.start_state)
+    # ε-переход из финальных состояний A в старт B заменяем копиями переходов в финальные
+    for t in dfa1.transitions:
+        if t.target.is_final:
+            nfa.add((1, t.source), t.symbol, b_start)
+    nfa.starts = {(1, dfa1.start_state)}
+    if dfa1.start_state.is_final:
+        nfa.starts.add(b_start)
+    nfa.finals = second.finals
+    return _minimal(nfa, "concatenation", budget)
+
+
+def star(dfa: DFA, budget=None) -> DFA:
+    """Минимальный ДКА для L(A)*."""
+    nfa = _NFA.from_dfa(dfa, 1)
+    start = (0, None)  # новое финальное стартовое состояние — копия старта A
+    nfa.starts = {start}
+    nfa.finals.add(start)
+    if dfa.start_state is not None:
+        for symbol, targets in list(nfa.edges[(1, dfa.start_state)].items()):
+            nfa.edges[start][symbol] |= targets
+        for t in dfa.transitions:
+            if t.target.is_final:
+                nfa.add((1, t.source), t.symbol, start)
+                if t.source == dfa.start_state:
+                    nfa.add(start, t.symbol, start)
+    return _minimal(nfa, "star", budget)
+
+
+def reversal(dfa: DFA, budget=None) -> DFA:
+    """Минимальный ДКА для обращения языка L(A)."""
+    return _minimal(_reverse(_NFA.from_dfa(dfa)), "reversal", budget)
+
+
+def _product_edges(dfa: DFA, divisor: DFA, starts):
+    """Достижимые из starts пары (q, d) произведения A × D и обратные рёбра между ними."""
+    seen = set(starts)
+    backward = defaultdict(set)
+    symbols = sorted(dfa.alphabet & divisor.alphabet)
+    queue = deque(seen)
+    while queue:
+        q, d = queue.popleft()
+        for symbol in symbols:
+            next_q, next_d = dfa.get_next_state(q, symbol), divisor.get_next_state(d, symbol)
+            if next_q is None or next_d is None:
+                continue
+            backward[(next_q, next_d)].add((q, d))
+            if (next_q, next_d) not in seen:
+                seen.add((next_q, next_d))
+                queue.append((next_q, next_d))
+    return seen, backward
+
+
+def right_quotient(dfa: DFA, divisor: DFA, budget=None) -> DFA:
+    """
+    Минимальный ДКА для правого частного L(A)/L(D) = {u | ∃v ∈ L(D): uv ∈ L(A)}.
+
+    Переходы A не меняются, финальными становятся состояния q, из которых
+    некоторое слово D ведёт в финальное состояние A.
+    """
+    nfa = _NFA.from_dfa(dfa)
+    nfa.finals = set()
+    if divisor.start_state is not None:
+        # Один обход произведения из всех (q, старт D), затем обратный обход от финальных пар
+        seen, backward = _product_edges(dfa, divisor, [(q, divisor.start_state) for q in dfa.states])
+        good = {pair for pair in seen if pair[0].is_final and pair[1].is_final}
+        queue = deque(good)
+        while queue:
+            for previous in backward[queue.popleft()]:
+                if previous not in good:
+                    good.add(previous)
+                    queue.append(previous)
+        nfa.finals = {(None, q) for q, d in good if d == divisor.start_state}
+    return _minimal(nfa, "right_quotient", budget)
+
+
+def left_quotient(divisor: DFA, dfa: DFA, budget=None) -> DFA:
+    """
+    Минимальный ДКА для левого частного L(D)\\L(A) = {v | ∃u ∈ L(D): uv ∈ L(A)}.
+
+    Стартовыми становятся все состояния A, в которые ведёт какое-нибудь слово D.
+    """
+    nfa = _NFA.from_dfa(dfa)
+    if dfa.start_state is None or divisor.start_state is None:
+        nfa.starts = set()
+    else:
+        pairs, _ = _product_edges(dfa, divisor, [(dfa.start_state, divisor.start_state)])
+        nfa.starts = {(None, q) for q, d in pairs if d.is_final}
+    return _minimal(nfa, "left_quotient", budget)
@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+
+from minimize import remove_dead_states
+from models import DFA
+from util import canonical_form, dfa_digest
+
+CACHE_SIZE = 256
+
+# Ключ, которым помечены таблицы финальных состояний; символы алфавита — строки, с ним не совпадут
+_FINAL = None
+
+
+class CompiledMatcher:
+    """
+    Скомпилированный распознаватель для ДКА.
+
+    Каждое состояние — словарь «символ -> словарь следующего состояния», поэтому
+    шаг автомата — это одно обращение по индексу без хеширования State и пар
+    (состояние, символ). Мёртвые состояния выброшены: переход в них даёт KeyError,
+    и слово отвергается сразу.
+    """
+
+    def __init__(self, dfa: DFA, digest: str | None = None):
+        self.digest = digest or dfa_digest(dfa)
+        alphabet, finals, rows = canonical_form(remove_dead_states(dfa))
+        self.state_count = len(rows)
+
+        tables = [dict() for _ in rows]
+        for table, is_final, row in zip(tables, finals, rows):
+            if is_final:
+                table[_FINAL] = True
+            for symbol, target in zip(alphabet, row):
+                if target != -1:
+                    table[symbol] = tables[target]
+        self._start = tables[0] if tables else None
+
+    def check_word(self, word) -> bool:
+        """Проверяет, принадлежит ли слово языку; тот же контракт, что у DFA.check_word."""
+        table = self._start
+        if table is None:
+            return False
+        try:
+            for symbol in word:
+                table = table[symbol]
+        except KeyError:
+            return False
+        return _FINAL in table
+
+    __call__ = check_word
+
+    def __repr__(self):
+        return f"CompiledMatcher(states={self.state_count}, digest={self.digest[:12]})"
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_dfa(dfa: DFA) -> CompiledMatcher:
+    """Возвращает скомпилированный распознаватель, переиспользуя его для ДКА с тем же дайджестом."""
+    digest = dfa_digest(dfa)
+    with _cache_lock:
+        matcher = _cache.get(digest)
+        if matcher is not None:
+            _cache.move_to_end(digest)
+            return matcher
+
+    matcher = CompiledMatcher(dfa, digest)
+    with _cache_lock:
+        _cache[digest] = matcher
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return matcher
@@ -0,0 +1,254 @@
+import itertools
+import heapq
+
+from metrics import registry as metrics
+from minimize import minimize_dfa
+from models import DFA
+
+# Виды узлов выражения
+EMPTY, EPSILON, SYMBOL, UNION, CONCAT, STAR = range(6)
+
+# Символы, которые в выводе нужно экранировать
+_SPECIAL = set("()[]{}|*+?.\\-^$ε∅")
+
+
+class Regex:
+    """
+    Узел регулярного выражения.
+
+    Узлы создаются только через RegexBuilder и хеш-консятся: равные выражения —
+    один и тот же объект, поэтому общие подвыражения хранятся и печатаются один раз,
+    а сравнение сводится к сравнению ссылок.
+    """
+
+    __slots__ = ("kind", "args", "size", "_text", "_prec")
+
+    def __init__(self, kind: int, args: tuple, size: int):
+        self.kind = kind
+        self.args = args
+        self.size = size  # число символов и операций — для эвристик и статистики
+        self._text = None
+        self._prec = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text, self._prec = _render(self)
+        return self._text
+
+    def _level(self) -> int:
+        if self._prec is None:
+            str(self)
+        return self._prec
+
+    def __repr__(self):
+        return f"Regex({self})"
+
+
+class RegexBuilder:
+    """Фабрика хеш-консящихся узлов с упрощениями на лету."""
+
+    def __init__(self):
+        self._nodes = {}
+        self.empty = self._make(EMPTY, (), 0)
+        self.epsilon = self._make(EPSILON, (), 0)
+
+    def _make(self, kind, args, size):
+        key = (kind, args)
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = Regex(kind, args, size)
+        return node
+
+    def symbol(self, symbol: str) -> Regex:
+        return self._make(SYMBOL, (symbol,), 1)
+
+    def union(self, *parts: Regex) -> Regex:
+        items = set()
+        for part in parts:
+            if part.kind == UNION:
+                items.update(part.args)
+            elif part is not self.empty:
+                items.add(part)
+        # ε поглощается звёздочкой: ε | r* = r*
+        if self.epsilon in items and any(item.kind == STAR for item in items):
+            items.discard(self.epsilon)
+        if not items:
+            return self.empty
+        if len(items) == 1:
+            return items.pop()
+        args = tuple(sorted(items, key=id))
+        return self._make(UNION, args, sum(item.size for item in args) + len(args) - 1)
+
+    def concat(self, *parts: Regex) -> Regex:
+        items = []
+        for part in parts:
+            if part is self.empty:
+                return self.empty
+            if part.kind == CONCAT:
+                items.extend(part.args)
+            elif part is not self.epsilon:
+                items.append(part)
+        if not items:
+            return self.epsilon
+        if len(items) == 1:
+            return items[0]
+        args = tuple(items)
+        return self._make(CONCAT, args, sum(item.size for item in args))
+
+    def star(self, part: Regex) -> Regex:
+        if part is self.empty or part is self.epsilon:
+            return self.epsilon
+        if part.kind == STAR:
+            return part
+        if part.kind == UNION and self.epsilon in part.args:
+            # (ε | r)* = r*
+            return self.star(self.union(*(item for item in part.args if item is not self.epsilon)))
+        return self._make(STAR, (part,), part.size + 1)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+
+def _escape(symbol: str) -> str:
+    return "".join("\\" + char if char in _SPECIAL else char for char in symbol)
+
+
+def _char_class(symbols) -> str:
+    """[a-cx] для набора односимвольных альтернатив."""
+    chars = sorted(symbols)
+    parts = []
+    idx = 0
+    while idx < len(chars):
+        end = idx
+        while end + 1 < len(chars) and ord(chars[end + 1]) == ord(chars[end]) + 1:
+            end += 1
+        if end - idx >= 2:
+            parts.append(f"{_escape(chars[idx])}-{_escape(chars[end])}")
+        else:
+            parts.extend(_escape(char) for char in chars[idx:end + 1])
+        idx = end + 1
+    return "[" + "".join(parts) + "]"
+
+
+def _render(node: Regex):
+    """Текст узла и его приоритет: 0 — объединение, 1 — конкатенация, 2 — атом или постфикс."""
+    if node.kind == EMPTY:
+        return "∅", 2
+    if node.kind == EPSILON:
+        return "ε", 2
+    if node.kind == SYMBOL:
+        return _escape(node.args[0]), 2 if len(node.args[0]) == 1 else 1
+    if node.kind == STAR:
+        return _wrap(node.args[0], 2) + "*", 2
+    if node.kind == CONCAT:
+        return "".join(_wrap(item, 1) for item in node.args), 1
+
+    chars = [item.args[0] for item in node.args if item.kind == SYMBOL and len(item.args[0]) == 1]
+    alternatives = [_char_class(chars)] if len(chars) > 1 else [_escape(char) for char in chars]
+    others = [item for item in node.args
+              if item.kind != EPSILON and not (item.kind == SYMBOL and len(item.args[0]) == 1)]
+    alternatives += [str(item) for item in others]
+    alternatives.sort()
+    optional = any(item.kind == EPSILON for item in node.args)
+
+    if len(alternatives) == 1:
+        # Единственная альтернатива — класс символов, символ или подвыражение
+        single = others[0] if others else None
+        text, level = (str(single), single._level()) if single is not None else (alternatives[0], 2)
+        if not optional:
+            return text, level
+        return (text if level == 2 else f"({text})") + "?", 2
+    text = "|".join(alternatives)
+    return (f"({text})?", 2) if optional else (text, 0)
+
+
+def _wrap(node: Regex, level: int) -> str:
+    """Текст узла, взятый в скобки, если его приоритет ниже требуемого."""
+    return str(node) if node._level() >= level else f"({node})"
+
+
+def _eliminate(dfa: DFA, builder: RegexBuilder) -> Regex:
+    """
+    Удаление состояний из обобщённого НКА с выбором порядка по весу in × out.
+
+    Дешёвые состояния (мало входящих и исходящих дуг) удаляются первыми:
+    каждое удаление порождает in × out новых дуг, так что такой порядок держит
+    выражения короткими. Веса пересчитываются лениво через кучу.
+    """
+    start, final = object(), object()
+    outgoing = {start: {}, final: {}}
+    incoming = {start: set(), final: set()}
+    for state in dfa.states:
+        outgoing[state] = {}
+        incoming[state] = set()
+
+    def add_edge(source, target, regex):
+        if regex is builder.empty:
+            return
+        edges = outgoing[source]
+        edges[target] = builder.union(edges[target], regex) if target in edges else regex
+        incoming[target].add(source)
+
+    add_edge(start, dfa.start_state, builder.epsilon)
+    for state in dfa.states:
+        if state.is_final:
+            add_edge(state, final, builder.epsilon)
+    for transition in dfa.transitions:
+        add_edge(transition.source, transition.target, builder.symbol(transition.symbol))
+
+    def weight(state):
+        ins = len(incoming[state] - {state})
+        outs = len(outgoing[state]) - (state in outgoing[state])
+        return ins * outs
+
+    remaining = set(dfa.states)
+    order = itertools.count()  # при равных весе и имени State не сравниваются
+    heap = [(weight(state), state.name, next(order), state) for state in remaining]
+    heapq.heapify(heap)
+    while heap:
+        current, _, _, state = heapq.heappop(heap)
+        if state not in remaining:
+            continue
+        if current != weight(state):
+            heapq.heappush(heap, (weight(state), state.name, next(order), state))
+            continue
+        remaining.discard(state)
+
+        loop = builder.star(outgoing[state].pop(state, builder.empty))
+        incoming[state].discard(state)
+        sources = incoming.pop(state)
+        targets = outgoing.pop(state)
+        for source in sources:
+            into = outgoing[source].pop(state)
+            for target, out in targets.items():
+                add_edge(source, target, builder.concat(into, loop, out))
+        for target in targets:
+            incoming[target].discard(state)
+        for neighbour in (sources | set(targets)) & remaining:
+            heapq.heappush(heap, (weight(neighbour), neighbour.name, next(order), neighbour))
+
+    return outgoing[start].get(final, builder.empty)
+
+
+def dfa_to_regex(dfa: DFA, minimize: bool = True) -> str:
+    """
+    Регулярное выражение для языка ДКА.
+
+    Автомат сначала минимизируется (меньше состояний — короче выражение),
+    затем состояния удаляются в порядке возрастания веса in × out.
+    Узлы выражения хеш-консятся, так что повторяющиеся подвыражения
+    строятся и печатаются один раз.
+
+    Синтаксис: `|` — объединение, `*` — звёздочка, `?` — необязательность,
+    `[a-c]` — класс символов, `ε` — пустое слово, `∅` — пустой язык.
+    """
+    with metrics.timer("to_regex"):
+        if minimize:
+            dfa = minimize_dfa(dfa)
+        builder = RegexBuilder()
+        if dfa.start_state is None:
+            return str(builder.empty)
+        regex = _eliminate(dfa, builder)
+        metrics.observe("dfa_regex_size", regex.size, operation="to_regex")
+        return str(regex)
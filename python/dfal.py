@@ -1,11 +1,18 @@
 import argparse
 import json
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from typing import Optional
 
+from budget import BudgetExceeded, budget_from_limits, merge_limits
 from difference import build_difference_automaton, build_product_automaton
 from equivalency import are_equivalent
+from export import EXPORT_FORMATS, iter_export
+from metrics import registry as metrics
 from minimize import minimize_dfa
 from models import *
+from profiling import PROFILE_MODES, parse_modes, profile_call
 
 def dfa_from_json(data):
     """Полное чтение, десериализация объектов через JSON"""
@@ -32,18 +39,25 @@ def dfa_from_json(data):
     )
 
 def dfa_from_string(description):
-    """Сокращённое чтение, быстрое создание DFA по описанию"""
+    """
+    Сокращённое чтение, быстрое создание DFA по описанию.
+
+    Переходы — словарь {(from, symbol): to} или, в JSON, список троек [from, symbol, to].
+    """
     states = {}
     transitions = set()
     for name, final in description['states'].items():
         states[name] = State(name, is_final=final)
-    for (from_, symbol), to in description['transitions'].items():
+    items = description['transitions']
+    items = items.items() if isinstance(items, dict) else (((from_, symbol), to) for from_, symbol, to in items)
+    for (from_, symbol), to in items:
         transitions.add(Transition(states[from_], symbol, states[to]))
+    start = description.get('start')
     return DFA(
         states=set(states.values()),
         alphabet=description['alphabet'],
         transitions=transitions,
-        start_state=states[description['start']]
+        start_state=states[start] if start is not None else None
     )
 
 def load_dfa(file_path: Optional[str], input_str: Optional[str], full: bool):
@@ -85,24 +99,164 @@ def dfa_to_dict(dfa: DFA, full: bool):
         return {
             "states": {state.name: state.is_final for state in dfa.states},
             "alphabet": list(dfa.alphabet),
-            "transitions": {(t.source.name, t.symbol): t.target.name for t in dfa.transitions},
+            "transitions": [[t.source.name, t.symbol, t.target.name] for t in dfa.transitions],
             "start": dfa.start_state.name if dfa.start_state else None
         }
 
+BATCH_OPERATIONS = {
+    "minimize": (1, minimize_dfa),
+    "difference": (2, build_difference_automaton),
+    "product": (2, build_product_automaton),
+    "equivalent": (2, are_equivalent),
+}
+
+
+def process_job(line: str, limits: Optional[dict] = None) -> str:
+    """
+    Выполняет одно задание пакета и возвращает строку результата JSONL.
+
+    Задание: {"id": ..., "op": "minimize" | "difference" | "product" | "equivalent",
+    "dfas": [...], "full": false, "limits": {...}}. Результат: {"id": ..., "result": ...}
+    или {"id": ..., "error": ...}. Лимиты задания не могут превышать limits из CLI.
+    """
+    job_id = None
+    try:
+        job = json.loads(line)
+        if not isinstance(job, dict):
+            raise ValueError("Задание должно быть JSON-объектом")
+        job_id = job.get("id")
+        full = job.get("full", False)
+        arity, operation = BATCH_OPERATIONS[job["op"]]
+        if len(job["dfas"]) != arity:
+            raise ValueError(f"Операция {job['op']} ожидает автоматов: {arity}")
+
+        dfas = [dfa_from_json(d) if full else dfa_from_string(d) for d in job["dfas"]]
+        budget = budget_from_limits(merge_limits(limits or {}, job.get("limits", {})))
+        result = operation(*dfas, budget=budget)
+        if isinstance(result, DFA):
+            result = dfa_to_dict(result, full)
+        return json.dumps({"id": job_id, "result": result}, ensure_ascii=False)
+    except BudgetExceeded as e:
+        return json.dumps({"id": job_id, **e.to_dict()}, ensure_ascii=False)
+    except Exception as e:
+        # Ошибка одного задания (разбор, валидация, алгоритм) не должна останавливать весь пакет
+        return json.dumps({"id": job_id, "error": f"{type(e).__name__}: {e}"}, ensure_ascii=False)
+
+
+def run_batch(lines, write, workers: int = 1, ordered: bool = True, limits: Optional[dict] = None):
+    """
+    Потоково обрабатывает задания пакета.
+
+    Одновременно в работе не больше workers * 4 заданий, поэтому память не растёт
+    с размером пакета. При ordered=True результаты выдаются в порядке заданий,
+    иначе — по готовности (их можно сопоставить по id).
+    """
+    jobs = (line for line in lines if line.strip())
+    if workers <= 1:
+        for line in jobs:
+            write(process_job(line, limits))
+        return
+
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for line in jobs:
+            pending.append(pool.submit(process_job, line, limits))
+            if len(pending) >= window:
+                pending = _drain(pending, write, ordered)
+        while pending:
+            pending = _drain(pending, write, ordered)
+
+
+def _drain(pending, write, ordered):
+    """Дожидается хотя бы одного результата и выводит всё, что можно вывести."""
+    if ordered:
+        write(pending.popleft().result())
+        while pending and pending[0].done():
+            write(pending.popleft().result())
+        return pending
+
+    done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        write(future.result())
+    return deque(not_done)
+
+
+def run_batch_files(input_path: str, output_path: Optional[str], workers: int, ordered: bool,
+                    limits: Optional[dict] = None):
+    """Пакетный режим CLI: JSONL из файла или stdin в файл или stdout."""
+    source = sys.stdin if input_path == '-' else open(input_path, 'r')
+    sink = open(output_path, 'w') if output_path else sys.stdout
+    try:
+        run_batch(source, lambda line: sink.write(line + "\n"), workers, ordered, limits)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
 def main():
     parser = argparse.ArgumentParser(description="CLI утилита для работы с ДКА")
     parser.add_argument('--input', type=str, help="Входные данные как строка JSON")
     parser.add_argument('--input-file', type=str, help="Файл с входными данными")
+    parser.add_argument('--input2', type=str, help="Второй автомат как строка JSON (по умолчанию — тот же, что и первый)")
+    parser.add_argument('--input-file2', type=str, help="Файл со вторым автоматом")
     parser.add_argument('--output-file', type=str, help="Файл для записи выходных данных")
     parser.add_argument('--full', action='store_true', help="Использовать полное чтение данных")
     parser.add_argument('--difference', action='store_true', help="Построить автомат разности")
     parser.add_argument('--minimize', action='store_true', help="Минимизировать автомат")
     parser.add_argument('--equivalent', action='store_true', help="Проверить эквивалентность автоматов")
     parser.add_argument('--product', action='store_true', help="Построить автомат произведения двух ДКА")
+    parser.add_argument('--batch', type=str,
+                        help="Пакетный режим: файл JSONL с заданиями или '-' для stdin")
+    parser.add_argument('--workers', type=int, default=1, help="Число процессов для пакетного режима")
+    parser.add_argument('--unordered', action='store_true',
+                        help="Выдавать результаты пакета по готовности, а не в порядке заданий")
+    parser.add_argument('--max-states', type=int, help="Максимум обрабатываемых состояний (пар состояний)")
+    parser.add_argument('--max-transitions', type=int, help="Максимум строящихся переходов")
+    parser.add_argument('--timeout', type=float, help="Ограничение времени операции, секунды")
+    parser.add_argument('--export', type=str, choices=EXPORT_FORMATS,
+                        help="Вывести результат (или входной автомат) в формате DOT или GraphML")
+    parser.add_argument('--trim', action='store_true',
+                        help="При экспорте отбросить недостижимые и мёртвые состояния")
+    parser.add_argument('--stats', action='store_true', help="Вывести в stderr время по стадиям и размеры автоматов")
+    parser.add_argument('--profile', type=str, choices=PROFILE_MODES + ("all",),
+                        help="Профилировать операцию: cpu (cProfile и стеки), memory (tracemalloc) или all")
+    parser.add_argument('--profile-output', type=str,
+                        help="Файл для свёрнутых стеков (формат flamegraph), сводка пишется рядом")
 
     args = parser.parse_args()
+    metrics.enabled = args.stats
+
+    try:
+        if args.profile:
+            _, report = profile_call(run, args, modes=parse_modes(args.profile))
+            if args.profile_output:
+                with open(args.profile_output, 'w') as f:
+                    f.write(report.collapsed_text())
+                with open(args.profile_output + '.txt', 'w') as f:
+                    f.write(report.summary())
+            else:
+                print(report.summary(), file=sys.stderr)
+        else:
+            run(args)
+    except BudgetExceeded as e:
+        print(e, file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if args.stats:
+            print(metrics.summary(), file=sys.stderr)
+
 
-    if not (args.difference or args.minimize or args.equivalent):
+def run(args):
+    """Выполняет выбранную операцию над загруженными ДКА"""
+    limits = {"max_states": args.max_states, "max_transitions": args.max_transitions, "timeout": args.timeout}
+    if args.batch:
+        run_batch_files(args.batch, args.output_file, args.workers, not args.unordered, limits)
+        return
+    budget = budget_from_limits(limits)
+
+    if not (args.difference or args.minimize or args.equivalent or args.product or args.export):
         print("Не указана операция для выполнения.")
         return
 
@@ -110,20 +264,39 @@ def main():
     dfa1 = load_dfa(args.input_file, args.input, args.full)
     dfa2 = None
     if args.difference or args.equivalent or args.product:
-        dfa2 = load_dfa(args.input_file, args.input, args.full)
+        if args.input2 or args.input_file2:
+            dfa2 = load_dfa(args.input_file2, args.input2, args.full)
+        else:
+            dfa2 = load_dfa(args.input_file, args.input, args.full)
 
     if args.difference:
-        result = build_difference_automaton(dfa1, dfa2) 
+        result = build_difference_automaton(dfa1, dfa2, budget)
     elif args.product:
-        result = build_product_automaton(dfa1, dfa2)
+        result = build_product_automaton(dfa1, dfa2, budget)
     elif args.minimize:
-        result = minimize_dfa(dfa1)
+        result = minimize_dfa(dfa1, budget)
     elif args.equivalent:
-        result = are_equivalent(dfa1, dfa2)
+        result = are_equivalent(dfa1, dfa2, budget)
         print(f"Автоматы {'эквивалентны' if result else 'не эквивалентны'}")
         return
+    else:
+        result = dfa1
+
+    if args.export:
+        write_export(result, args.export, args.trim, args.output_file)
+    else:
+        write_dfa(result, args.full, args.output_file)
+
 
-    write_dfa(result, args.full, args.output_file)
+def write_export(dfa, fmt, trim, output_file=None):
+    """Потоково пишет DOT/GraphML в файл или stdout."""
+    out = open(output_file, 'w', encoding='utf-8') if output_file else sys.stdout
+    try:
+        for chunk in iter_export(dfa, fmt, trim):
+            out.write(chunk)
+    finally:
+        if output_file:
+            out.close()
 
 if __name__ == "__main__":
     main()
@@ -1,28 +1,73 @@
+from alphabet import SymbolClasses
+from metrics import registry as metrics
 from models import DFA, State, Transition
 
-def create_initial_state(dfa1, dfa2, state_map, queue):
+
+def is_difference_final(q1, q2):
+    """Финальность пары в автомате разности A - B."""
+    return q1.is_final and not q2.is_final
+
+
+def is_product_final(q1, q2):
+    """Финальность пары в автомате произведения A х B."""
+    return q1.is_final and not q2.is_final
+
+
+def is_intersection_final(q1, q2):
+    """Финальность пары в автомате пересечения A ∩ B."""
+    return q1.is_final and q2.is_final
+
+
+def is_union_final(q1, q2):
+    """Финальность пары в автомате объединения A ∪ B."""
+    return q1.is_final or q2.is_final
+
+
+def is_xor_final(q1, q2):
+    """Финальность пары в автомате симметрической разности A △ B."""
+    return q1.is_final != q2.is_final
+
+
+def create_initial_state(dfa1, dfa2, state_map, queue, is_final=is_difference_final):
     """Создаёт начальное состояние автомата разности."""
     start_pair = (dfa1.start_state, dfa2.start_state)
     if not start_pair[0] or not start_pair[1]:
         raise ValueError("В одном из автоматов отсутствует стартовое состояние!")
     
-    new_start_state = State(f"({start_pair[0].name},{start_pair[1].name})")
+    new_start_state = State(f"({start_pair[0].name},{start_pair[1].name})", is_final(*start_pair))
     state_map[start_pair] = new_start_state
     queue.append(start_pair)
     return new_start_state
 
-def process_state_pairs(dfa1, dfa2, state_map, queue, new_transitions):
-    """Обрабатывает пары состояний и создаёт переходы."""
+def process_state_pairs(dfa1, dfa2, state_map, queue, new_transitions, classes=None,
+                        is_final=is_difference_final, budget=None):
+    """
+    Обрабатывает пары состояний и создаёт переходы.
+
+    Финальность новой пары задаётся предикатом is_final сразу при создании
+    состояния: State неизменяем, а после попадания в множества и ключи словарей
+    менять его хеш нельзя.
+
+    Преемники пары считаются один раз на класс символов (общий для обоих ДКА),
+    переходы затем размножаются на все символы класса.
+
+    :param budget: Необязательный budget.Budget; каждая обработанная пара списывается с него.
+    """
+    if classes is None:
+        classes = SymbolClasses.from_dfas(dfa1, dfa2)
+    symbol_count = len(classes.representative)
     new_states = set()
 
     while queue:
         q1, q2 = queue.pop(0)
         new_state = state_map[(q1, q2)]
         new_states.add(new_state)
+        if budget is not None:
+            budget.charge(states=1, transitions=symbol_count)
 
-        for symbol in dfa1.alphabet.union(dfa2.alphabet):
-            next_q1 = dfa1.get_next_state(q1, symbol)
-            next_q2 = dfa2.get_next_state(q2, symbol)
+        for representative, members in classes.members.items():
+            next_q1 = dfa1.get_next_state(q1, representative)
+            next_q2 = dfa2.get_next_state(q2, representative)
 
             # если нет перехода — уходим в "поглощающее состояние"
             next_q1 = next_q1 if next_q1 else State("⊥1", is_final=False)
@@ -32,54 +77,64 @@ def process_state_pairs(dfa1, dfa2, state_map, queue, new_transitions):
 
             if next_pair not in state_map:
                 new_state_name = f"({next_q1.name},{next_q2.name})"
-                state_map[next_pair] = State(new_state_name)
+                state_map[next_pair] = State(new_state_name, is_final(next_q1, next_q2))
                 queue.append(next_pair)
 
-            new_transitions.add(Transition(new_state, symbol, state_map[next_pair]))
+            for symbol in members:
+                new_transitions.add(Transition(new_state, symbol, state_map[next_pair]))
 
     return new_states
 
 
-def mark_difference_final_states(state_map):
-    """Отмечает финальные состояния в автомате разности A - B."""
-    for (q1, q2), new_state in state_map.items():
-        if q1.is_final and not q2.is_final:
-            new_state.is_final = True
+def _start_or_sink(dfa: DFA, sink_name: str) -> DFA:
+    """
+    ДКА без стартового состояния (пустой язык, например результат minimize_dfa)
+    заменяется единственным нефинальным поглощающим состоянием — тем же ⊥,
+    в которое уходят недостающие переходы.
+    """
+    if dfa.start_state is not None:
+        return dfa
+    sink = State(sink_name, is_final=False)
+    return DFA({sink}, dfa.alphabet, set(), sink)
 
 
-def mark_product_final_states(state_map):
-    """Отмечает финальные состояния в автомате произведения A х B."""
-    for (q1, q2), new_state in state_map.items():
-        if q1.is_final and not q2.is_final:
-            new_state.is_final = True
+def build_pair_automaton(dfa1: DFA, dfa2: DFA, is_final, operation: str = "product", budget=None) -> DFA:
+    """
+    Строит автомат на парах состояний двух ДКА.
 
+    Автомат без стартового состояния считается автоматом пустого языка.
 
-def build_product_automaton(dfa1: DFA, dfa2: DFA) -> DFA:
-    """Создаёт автомат разности для двух ДКА."""
+    :param is_final: Предикат финальности пары (q1, q2), например is_intersection_final.
+    :param operation: Имя операции для метрик.
+    :param budget: Необязательный budget.Budget с лимитами на число пар, переходов и время.
+    """
+    if budget is not None:
+        budget.stage = operation
+    dfa1, dfa2 = _start_or_sink(dfa1, "⊥1"), _start_or_sink(dfa2, "⊥2")
     new_transitions = set()
     state_map = {}
     queue = []
 
-    new_start_state = create_initial_state(dfa1, dfa2, state_map, queue)
-    new_states = process_state_pairs(dfa1, dfa2, state_map, queue, new_transitions)
-    mark_product_final_states(state_map)
+    with metrics.timer(operation):
+        with metrics.timer(operation, "explore"):
+            new_start_state = create_initial_state(dfa1, dfa2, state_map, queue, is_final)
+            new_states = process_state_pairs(dfa1, dfa2, state_map, queue, new_transitions,
+                                             is_final=is_final, budget=budget)
+        metrics.observe("dfa_product_states_explored", len(state_map), operation=operation)
 
     return DFA(set(state_map.values()), dfa1.alphabet.union(dfa2.alphabet), new_transitions, new_start_state)
 
 
-def build_difference_automaton(dfa1: DFA, dfa2: DFA) -> DFA:
+def build_product_automaton(dfa1: DFA, dfa2: DFA, budget=None) -> DFA:
+    """Создаёт автомат разности для двух ДКА."""
+    return build_pair_automaton(dfa1, dfa2, is_product_final, "product", budget)
+
+
+def build_difference_automaton(dfa1: DFA, dfa2: DFA, budget=None) -> DFA:
     """Создаёт автомат разности для двух ДКА."""
     if not dfa1.start_state:
         return DFA(set(), set(), set(), None)  # Пустой автомат
     if not dfa2.start_state:
         return dfa1
-    
-    new_transitions = set()
-    state_map = {}
-    queue = []
-
-    new_start_state = create_initial_state(dfa1, dfa2, state_map, queue)
-    new_states = process_state_pairs(dfa1, dfa2, state_map, queue, new_transitions)
-    mark_difference_final_states(state_map)
 
-    return DFA(set(state_map.values()), dfa1.alphabet.union(dfa2.alphabet), new_transitions, new_start_state)
+    return build_pair_automaton(dfa1, dfa2, is_difference_final, "difference", budget)
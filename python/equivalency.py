@@ -1,12 +1,18 @@
 
 from difference import build_difference_automaton
 from final_state import has_reachable_final_state
+from metrics import registry as metrics
 from minimize import minimize_dfa
 from models import DFA
 
 
-def are_equivalent(dfa1: DFA, dfa2: DFA) -> bool:
+def are_equivalent(dfa1: DFA, dfa2: DFA, budget=None) -> bool:
     """Проверяет эквивалентность двух ДКА."""
+    with metrics.timer("equivalence"):
+        return _are_equivalent(dfa1, dfa2, budget)
+
+
+def _are_equivalent(dfa1: DFA, dfa2: DFA, budget=None) -> bool:
     # Проверка на пустые автоматы
     if not dfa1.start_state and not dfa2.start_state:
         return True  # Два пустых автомата эквивалентны
@@ -14,16 +20,16 @@ def are_equivalent(dfa1: DFA, dfa2: DFA) -> bool:
         return False  # Один из автоматов пустой, другой — нет
 
     # Минимизация автоматов
-    minimized_dfa1 = minimize_dfa(dfa1)
-    minimized_dfa2 = minimize_dfa(dfa2)
+    minimized_dfa1 = minimize_dfa(dfa1, budget)
+    minimized_dfa2 = minimize_dfa(dfa2, budget)
 
     # Строим автомат разности A - B
-    diff_ab = build_difference_automaton(minimized_dfa1, minimized_dfa2)
+    diff_ab = build_difference_automaton(minimized_dfa1, minimized_dfa2, budget)
     if has_reachable_final_state(diff_ab):
         return False  # Найдено слово, которое принимает первый автомат, но не второй
 
     # Строим автомат разности B - A
-    diff_ba = build_difference_automaton(minimized_dfa2, minimized_dfa1)
+    diff_ba = build_difference_automaton(minimized_dfa2, minimized_dfa1, budget)
     if has_reachable_final_state(diff_ba):
         return False  # Найдено слово, которое принимает второй автомат, но не первый
 
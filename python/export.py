@@ -0,0 +1,140 @@
+from collections import defaultdict, deque
+from xml.sax.saxutils import escape, quoteattr
+
+from alphabet import range_label
+from models import DFA
+
+EXPORT_FORMATS = ("dot", "graphml")
+
+
+# Внутри всё хранится по именам состояний: хеш строки кэшируется, а хеш State —
+# вызов Python-метода, и на миллионах переходов это заметно.
+
+def _adjacency(dfa: DFA):
+    """Имя источника -> его переходы. Группировка по цели — уже при выводе, по одному источнику."""
+    outgoing = {}
+    for t in dfa.transitions:
+        outgoing.setdefault(t.source.name, []).append(t)
+    return outgoing
+
+
+def useful_states(dfa: DFA, trim: bool = True, adjacency=None):
+    """Состояния для вывода: при trim — только достижимые из старта и живые."""
+    if not trim:
+        return set(dfa.states)
+    if dfa.start_state is None:
+        return set()
+    adjacency = adjacency if adjacency is not None else _adjacency(dfa)
+
+    # Живые — обратным обходом от финальных; расстояния (DFA.distances_to_final) здесь не нужны
+    predecessors = defaultdict(list)
+    for source, transitions in adjacency.items():
+        for t in transitions:
+            predecessors[t.target.name].append(source)
+    live = {state.name for state in dfa.states if state.is_final}
+    queue = deque(live)
+    while queue:
+        for source in predecessors.get(queue.popleft(), ()):
+            if source not in live:
+                live.add(source)
+                queue.append(source)
+    if dfa.start_state.name not in live:
+        return set()
+
+    seen = {dfa.start_state.name}
+    queue = deque(seen)
+    while queue:
+        for t in adjacency.get(queue.popleft(), ()):
+            target = t.target.name
+            if target not in seen and target in live:
+                seen.add(target)
+                queue.append(target)
+    return {state for state in dfa.states if state.name in seen}
+
+
+def _escape_symbol(symbol: str) -> str:
+    # Символы-разделители метки экранируются обратной косой чертой: {',', '-', '.'} -> `\,-.`
+    return symbol.replace("\\", "\\\\").replace(",", "\\,").replace("-", "\\-")
+
+
+class _EscapedSymbols(dict):
+    """Символ -> экранированный символ; экранирование считается один раз на символ."""
+
+    def __missing__(self, symbol):
+        self[symbol] = escaped = _escape_symbol(symbol)
+        return escaped
+
+
+def _label(symbols, escaped) -> str:
+    if len(symbols) == 1:
+        return escaped[symbols[0]]
+    return range_label(symbols, escaped.__getitem__)
+
+
+def merged_edges(dfa: DFA, states, adjacency=None):
+    """
+    Параллельные переходы между одной парой состояний — одно ребро.
+
+    :return: Генератор (имя источника, [(имя цели, метка), ...]) по источникам; метка —
+        набор символов в виде диапазонов (alphabet.range_label), например `0-9,a`;
+        символы `\\`, `,` и `-` экранируются обратной косой чертой.
+    """
+    adjacency = adjacency if adjacency is not None else _adjacency(dfa)
+    names = {state.name for state in states}
+    escaped = _EscapedSymbols()
+    for source in sorted(names):
+        transitions = adjacency.pop(source, None)  # выведенные группы сразу освобождаются
+        if transitions:
+            by_target = {}
+            for t in transitions:
+                by_target.setdefault(t.target.name, []).append(t.symbol)
+            yield source, [(target, _label(symbols, escaped)) for target, symbols in by_target.items() if target in names]
+
+
+def _dot_id(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def iter_dot(dfa: DFA, trim: bool = False):
+    """DOT-описание ДКА кусками по состоянию; документ целиком не собирается."""
+    adjacency = _adjacency(dfa)
+    states = useful_states(dfa, trim, adjacency)
+    ids = {state.name: _dot_id(state.name) for state in states}
+    yield "digraph DFA {\n  rankdir=LR;\n  node [shape=circle];\n"
+    if dfa.start_state in states:
+        yield f'  "__start" [shape=point, label=""];\n  "__start" -> {ids[dfa.start_state.name]};\n'
+    for state in sorted(states, key=lambda s: s.name):
+        shape = ", shape=doublecircle" if state.is_final else ""
+        yield f"  {ids[state.name]} [label={ids[state.name]}{shape}];\n"
+    for source, edges in merged_edges(dfa, states, adjacency):
+        yield "".join(f"  {ids[source]} -> {ids[target]} [label={_dot_id(label)}];\n" for target, label in edges)
+    yield "}\n"
+
+
+def iter_graphml(dfa: DFA, trim: bool = False):
+    """GraphML-описание ДКА кусками по состоянию; документ целиком не собирается."""
+    adjacency = _adjacency(dfa)
+    states = useful_states(dfa, trim, adjacency)
+    ids = {state.name: quoteattr(state.name) for state in states}
+    yield ('<?xml version="1.0" encoding="UTF-8"?>\n'
+           '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+           '  <key id="final" for="node" attr.name="final" attr.type="boolean"/>\n'
+           '  <key id="start" for="node" attr.name="start" attr.type="boolean"/>\n'
+           '  <key id="label" for="edge" attr.name="label" attr.type="string"/>\n'
+           '  <graph id="dfa" edgedefault="directed">\n')
+    for state in sorted(states, key=lambda s: s.name):
+        yield (f"    <node id={ids[state.name]}>"
+               f'<data key="final">{str(state.is_final).lower()}</data>'
+               f'<data key="start">{str(state == dfa.start_state).lower()}</data></node>\n')
+    for source, edges in merged_edges(dfa, states, adjacency):
+        yield "".join(f"    <edge source={ids[source]} target={ids[target]}>"
+                      f'<data key="label">{escape(label)}</data></edge>\n' for target, label in edges)
+    yield "  </graph>\n</graphml>\n"
+
+
+def iter_export(dfa: DFA, fmt: str, trim: bool = False):
+    if fmt == "dot":
+        return iter_dot(dfa, trim)
+    if fmt == "graphml":
+        return iter_graphml(dfa, trim)
+    raise ValueError(f"Неизвестный формат экспорта: {fmt!r}")
@@ -0,0 +1,349 @@
+import heapq
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+
+from metrics import registry as metrics
+from models import DFA, State, Transition
+from util import canonical_form
+
+# Сколько записей сигнатур сортировать в памяти за раз (остальное — на диске)
+CHUNK_RECORDS = 1 << 18
+
+# Размер буфера при последовательном чтении и записи массивов, в элементах
+BUFFER_ITEMS = 1 << 16
+
+_ITEM = array("q").itemsize
+
+META = "meta.json"
+TRANSITIONS = "transitions.bin"
+FINALS = "finals.bin"
+
+
+class _MappedArray:
+    """Массив int64 (или байтов) в файле, отображённом в память: в RAM живут только нужные страницы."""
+
+    def __init__(self, path: str, length: int | None = None, fill: int | None = None,
+                 typecode: str = "q", writable: bool = False):
+        itemsize = array(typecode).itemsize
+        if length is not None:
+            with open(path, "wb") as file:
+                if fill is None:
+                    file.truncate(length * itemsize)
+                else:
+                    chunk = array(typecode, [fill]) * min(length, BUFFER_ITEMS)
+                    for start in range(0, length, BUFFER_ITEMS):
+                        file.write(chunk[:min(BUFFER_ITEMS, length - start)].tobytes())
+            writable = True
+        self._file = open(path, "r+b" if writable else "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = None
+        if size:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self._map = mmap.mmap(self._file.fileno(), 0, access=access)
+            self.view = memoryview(self._map).cast(typecode)
+        else:
+            self.view = memoryview(array(typecode))
+
+    def __len__(self):
+        return len(self.view)
+
+    def close(self):
+        self.view.release()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class _ArrayWriter:
+    """Последовательная буферизованная запись int64 в файл."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self._buffer = array("q")
+        self.count = 0
+
+    def extend(self, values):
+        self._buffer.extend(values)
+        self.count += len(values)
+        if len(self._buffer) >= BUFFER_ITEMS:
+            self._flush()
+
+    def _flush(self):
+        self._buffer.tofile(self._file)
+        self._buffer = array("q")
+
+    def close(self):
+        self._flush()
+        self._file.close()
+
+
+def _read_records(path: str, width: int):
+    """Последовательно читает из файла записи по width чисел int64."""
+    per_read = max(1, BUFFER_ITEMS // width) * width
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(per_read * _ITEM)
+            if not data:
+                return
+            values = array("q")
+            values.frombytes(data)
+            for idx in range(0, len(values), width):
+                yield tuple(values[idx:idx + width])
+
+
+class TableWriter:
+    """
+    Потоковая запись ДКА в дисковый формат: каталог с meta.json,
+    transitions.bin (n × |алфавит| чисел int64, -1 — нет перехода)
+    и finals.bin (по байту на состояние).
+    """
+
+    def __init__(self, directory: str, alphabet, start: int | None = 0):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.alphabet = tuple(alphabet)
+        self.start = start
+        self._transitions = _ArrayWriter(os.path.join(directory, TRANSITIONS))
+        self._finals = open(os.path.join(directory, FINALS), "wb")
+        self.states = 0
+
+    def add_row(self, row, is_final: bool):
+        self._transitions.extend(row)
+        self._finals.write(b"\x01" if is_final else b"\x00")
+        self.states += 1
+
+    def close(self):
+        self._transitions.close()
+        self._finals.close()
+        with open(os.path.join(self.directory, META), "w", encoding="utf-8") as file:
+            json.dump({"alphabet": list(self.alphabet), "states": self.states, "start": self.start}, file)
+
+
+class DiskTables:
+    """Дисковый ДКА, открытый через mmap. Состояния — номера 0..n-1."""
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, META), encoding="utf-8") as file:
+            meta = json.load(file)
+        self.alphabet = tuple(meta["alphabet"])
+        self.size = meta["states"]
+        self.start = meta["start"]
+        self.transitions = _MappedArray(os.path.join(directory, TRANSITIONS))
+        self.finals = _MappedArray(os.path.join(directory, FINALS), typecode="B")
+
+    def close(self):
+        self.transitions.close()
+        self.finals.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_dfa(dfa: DFA, directory: str):
+    """Записывает ДКА в дисковый формат (нумерация — как в util.canonical_form)."""
+    alphabet, finals, rows = canonical_form(dfa)
+    writer = TableWriter(directory, alphabet, start=0 if rows else None)
+    for row, final in zip(rows, finals):
+        writer.add_row(row, final)
+    writer.close()
+
+
+def load_dfa(directory: str) -> DFA:
+    """Читает дисковый ДКА целиком в память — для небольших результатов."""
+    with DiskTables(directory) as tables:
+        width = len(tables.alphabet)
+        states = [State(f"Q{idx}", is_final=bool(tables.finals.view[idx])) for idx in range(tables.size)]
+        transitions = set()
+        for source in range(tables.size):
+            for column, symbol in enumerate(tables.alphabet):
+                target = tables.transitions.view[source * width + column]
+                if target != -1:
+                    transitions.add(Transition(states[source], symbol, states[target]))
+        start = states[tables.start] if tables.start is not None else None
+        return DFA(set(states), set(tables.alphabet), transitions, start)
+
+
+class _Minimizer:
+    """Одна внешняя минимизация: все рабочие массивы — файлы в workdir."""
+
+    def __init__(self, tables: DiskTables, workdir: str, chunk_records: int, budget):
+        self.tables = tables
+        self.workdir = workdir
+        self.chunk_records = chunk_records
+        self.budget = budget
+        self.width = len(tables.alphabet)
+        self.sink = tables.size  # недостающие переходы ведут в добавленное поглощающее состояние
+        self.total = tables.size + 1
+        # Номер блока каждого состояния; -1 — состояние недостижимо
+        self.blocks = _MappedArray(self._path("blocks.bin"), self.total, fill=-1)
+
+    def _path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def successors(self, state):
+        if state == self.sink:
+            return [self.sink] * self.width
+        row = self.tables.transitions.view[state * self.width:(state + 1) * self.width]
+        return [self.sink if target < 0 else target for target in row]
+
+    def is_final(self, state):
+        return state != self.sink and self.tables.finals.view[state] == 1
+
+    def mark_reachable(self):
+        """BFS по уровням: текущий и следующий уровни лежат в файлах, посещённость — в blocks."""
+        blocks = self.blocks.view
+        start = self.tables.start
+        blocks[start] = int(self.is_final(start))
+        level = self._path("level.bin")
+        writer = _ArrayWriter(level)
+        writer.extend([start])
+        writer.close()
+        count = writer.count
+        while count:
+            following = self._path("level.next.bin")
+            writer = _ArrayWriter(following)
+            for (state,) in _read_records(level, 1):
+                for target in self.successors(state):
+                    if blocks[target] == -1:
+                        blocks[target] = int(self.is_final(target))
+                        writer.extend([target])
+            writer.close()
+            count = writer.count
+            os.replace(following, level)
+            if self.budget is not None:
+                self.budget.charge(states=count)
+        os.unlink(level)
+
+    def refine(self):
+        """
+        Раунды Мура: сигнатура состояния — (свой блок, блоки преемников).
+        Сигнатуры сортируются внешней сортировкой, новые номера блоков
+        раздаются одним последовательным проходом по слитым прогонам.
+        """
+        blocks = self.blocks.view
+        count = len({blocks[state] for state in range(self.total) if blocks[state] >= 0})
+        while True:
+            if self.budget is not None:
+                self.budget.next_round("refine")
+            runs = []
+            buffer = []
+            for state in range(self.total):
+                if blocks[state] < 0:
+                    continue
+                buffer.append((blocks[state], *(blocks[t] for t in self.successors(state)), state))
+                if len(buffer) >= self.chunk_records:
+                    runs.append(self._write_run(buffer, len(runs)))
+                    buffer = []
+            buffer.sort()
+            streams = [_read_records(path, self.width + 2) for path in runs] + [iter(buffer)]
+
+            # Все сигнатуры уже посчитаны, так что номера блоков можно переписывать на месте
+            previous = None
+            new_count = 0
+            for record in heapq.merge(*streams):
+                if record[:-1] != previous:
+                    previous = record[:-1]
+                    new_count += 1
+                blocks[record[-1]] = new_count - 1
+            for path in runs:
+                os.unlink(path)
+
+            if new_count == count:
+                return count
+            count = new_count
+
+    def _write_run(self, buffer, number):
+        buffer.sort()
+        path = self._path(f"run-{number}.bin")
+        writer = _ArrayWriter(path)
+        for record in buffer:
+            writer.extend(record)
+        writer.close()
+        return path
+
+    def build(self, count: int, target: str) -> int:
+        """Записывает фактор-автомат без мёртвого блока; возвращает число состояний."""
+        blocks = self.blocks.view
+        representatives = _MappedArray(self._path("representatives.bin"), count, fill=-1)
+        try:
+            reps = representatives.view
+            for state in range(self.total):
+                block = blocks[state]
+                if block >= 0 and reps[block] == -1:
+                    reps[block] = state
+
+            # В минимальном полном ДКА все мёртвые состояния — один нефинальный блок с петлями
+            dead = None
+            for block in range(count):
+                state = reps[block]
+                if not self.is_final(state) and all(blocks[t] == block for t in self.successors(state)):
+                    dead = block
+                    break
+
+            def renumber(block):
+                if block == dead:
+                    return -1
+                return block - 1 if dead is not None and block > dead else block
+
+            start = renumber(blocks[self.tables.start])
+            writer = TableWriter(target, self.tables.alphabet, start=start if start != -1 else None)
+            if start != -1:
+                for block in range(count):
+                    if block != dead:
+                        state = reps[block]
+                        writer.add_row([renumber(blocks[t]) for t in self.successors(state)], self.is_final(state))
+            writer.close()
+            return writer.states
+        finally:
+            representatives.close()
+            os.unlink(self._path("representatives.bin"))
+
+    def close(self):
+        self.blocks.close()
+        os.unlink(self._path("blocks.bin"))
+
+
+def minimize_external(source: str, target: str, workdir: str | None = None,
+                      chunk_records: int = CHUNK_RECORDS, budget=None) -> int:
+    """
+    Минимизация ДКА, который не помещается в память.
+
+    Вход и выход — каталоги в дисковом формате (см. TableWriter). Переходы и
+    номера блоков читаются через mmap, уточнение разбиения идёт раундами Мура
+    с внешней сортировкой сигнатур, так что в памяти одновременно находится
+    не больше chunk_records сигнатур и буферы последовательного чтения.
+    Результат совпадает с minimize_dfa: недостижимые и мёртвые состояния удалены.
+
+    :param workdir: Каталог для временных файлов; по умолчанию — временный.
+    :param budget: Необязательный budget.Budget; раунд уточнения — один раунд бюджета.
+    :return: Число состояний минимального автомата.
+    """
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="dfa-minimize-")
+    try:
+        with metrics.timer("minimize_external"), DiskTables(source) as tables:
+            if tables.start is None:
+                TableWriter(target, tables.alphabet, start=None).close()
+                return 0
+            minimizer = _Minimizer(tables, workdir, chunk_records, budget)
+            try:
+                with metrics.timer("minimize_external", "trim"):
+                    minimizer.mark_reachable()
+                with metrics.timer("minimize_external", "refine"):
+                    count = minimizer.refine()
+                with metrics.timer("minimize_external", "build"):
+                    states = minimizer.build(count, target)
+            finally:
+                minimizer.close()
+        metrics.observe("dfa_output_states", states, operation="minimize_external")
+        return states
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
@@ -1,13 +1,55 @@
+from collections import deque
+
+from alphabet import SymbolClasses
+from metrics import registry as metrics
 from models import DFA
 from util import bfs
 
-def has_reachable_final_state(dfa: DFA) -> bool:
-    """Проверяет, достижимо ли хотя бы одно финальное состояние в ДКА."""
+def has_reachable_final_state(dfa: DFA, classes: SymbolClasses | None = None) -> bool:
+    """
+    Проверяет, достижимо ли хотя бы одно финальное состояние в ДКА.
+
+    :param classes: Необязательные классы символов ДКА (alphabet.SymbolClasses), если они
+        уже посчитаны вызывающим: тогда перебираются только представители. Сами классы
+        здесь не строятся — это проход по всем переходам до начала обхода.
+    """
     if dfa.start_state is None:
         return False 
     
-    return bfs(
-        start=dfa.start_state,
-        is_goal=lambda state: state.is_final,
-        get_neighbors=lambda state: [dfa.get_next_state(state, symbol) for symbol in dfa.alphabet]
-    )
+    with metrics.timer("emptiness"):
+        symbols = classes.representatives() if classes is not None else dfa.alphabet
+        return bfs(
+            start=dfa.start_state,
+            is_goal=lambda state: state.is_final,
+            get_neighbors=lambda state: [dfa.get_next_state(state, symbol) for symbol in symbols]
+        )
+
+
+def find_accepted_word(dfa: DFA) -> str | None:
+    """
+    Кратчайшее слово, принимаемое ДКА (свидетель непустоты), или None для пустого языка.
+
+    Символы перебираются по возрастанию, поэтому среди кратчайших слов
+    возвращается лексикографически наименьшее.
+    """
+    if dfa.start_state is None:
+        return None
+
+    with metrics.timer("witness"):
+        symbols = sorted(dfa.alphabet)
+        parents = {dfa.start_state: None}
+        queue = deque([dfa.start_state])
+        while queue:
+            state = queue.popleft()
+            if state.is_final:
+                word = []
+                while parents[state] is not None:
+                    state, symbol = parents[state]
+                    word.append(symbol)
+                return "".join(reversed(word))
+            for symbol in symbols:
+                next_state = dfa.get_next_state(state, symbol)
+                if next_state is not None and next_state not in parents:
+                    parents[next_state] = (state, symbol)
+                    queue.append(next_state)
+        return None
@@ -0,0 +1,77 @@
+from collections import deque
+
+from alphabet import SymbolClasses
+from metrics import registry as metrics
+from models import DFA
+
+
+def _is_covered(cover) -> bool:
+    return any(state.is_final for _, state in cover)
+
+
+def find_uncovered_word(dfa: DFA, covers, budget=None) -> str | None:
+    """
+    Проверка включения L(A) ⊆ L(B1) ∪ … ∪ L(Bn) без построения объединения.
+
+    A обходится в ширину вместе с множеством текущих состояний всех Bi
+    (Bi без перехода по символу из множества выпадает). Вершина (p, T)
+    отбрасывается, если уже посещена (p, T') с T' ⊆ T: любое слово, не
+    покрытое из (p, T), не покрыто и из (p, T'). Посещённые вершины хранятся
+    антицепью — для каждого p только минимальные по включению T.
+
+    :param covers: Список ДКА B1, …, Bn.
+    :param budget: Необязательный budget.Budget; каждая раскрытая вершина списывается с него.
+    :return: Кратчайшее слово из L(A), не принадлежащее ни одному Bi, или None, если включение выполнено.
+    """
+    covers = list(covers)
+    if dfa.start_state is None or not dfa.is_live(dfa.start_state):
+        return None
+
+    with metrics.timer("inclusion"):
+        classes = SymbolClasses.from_dfas(dfa, *covers)
+        symbols = sorted(classes.representatives())
+        start = (dfa.start_state, frozenset((idx, b.start_state) for idx, b in enumerate(covers)
+                                            if b.start_state is not None))
+        antichain = {start[0]: [start[1]]}
+        parents = {start: None}
+        queue = deque([start])
+        explored = 0
+        try:
+            while queue:
+                node = queue.popleft()
+                state, cover = node
+                explored += 1
+                if budget is not None:
+                    budget.charge(states=1, transitions=len(symbols))
+                if state.is_final and not _is_covered(cover):
+                    word = []
+                    while parents[node] is not None:
+                        node, symbol = parents[node]
+                        word.append(symbol)
+                    return "".join(reversed(word))
+
+                for symbol in symbols:
+                    next_state = dfa.get_next_state(state, symbol)
+                    if next_state is None or not dfa.is_live(next_state):
+                        continue
+                    next_cover = frozenset(
+                        (idx, target) for idx, current in cover
+                        if (target := covers[idx].get_next_state(current, symbol)) is not None
+                    )
+                    chain = antichain.setdefault(next_state, [])
+                    if any(visited <= next_cover for visited in chain):
+                        continue
+                    # Новая вершина сильнее всех, что включают её множество: убираем их из антицепи
+                    chain[:] = [visited for visited in chain if not next_cover <= visited]
+                    chain.append(next_cover)
+                    next_node = (next_state, next_cover)
+                    parents[next_node] = (node, symbol)
+                    queue.append(next_node)
+            return None
+        finally:
+            metrics.observe("dfa_inclusion_states_explored", explored, operation="inclusion")
+
+
+def is_included(dfa: DFA, covers, budget=None) -> bool:
+    """True, если каждое слово A принимается хотя бы одним из covers."""
+    return find_uncovered_word(dfa, covers, budget) is None
@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+from collections import deque
+
+from budget import BudgetExceeded, CancellationToken, budget_from_limits
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+MAX_EVENTS = 100  # сколько последних снимков прогресса хранить для стриминга
+
+
+class JobQueueFull(Exception):
+    """Очередь заданий заполнена — клиенту стоит повторить позже."""
+
+
+class Job:
+    """Одна долгая операция: статус, прогресс, результат."""
+
+    def __init__(self, func, args, limits: dict, expected_states: int | None = None):
+        self.id = uuid.uuid4().hex
+        self.func = func
+        self.args = args
+        self.limits = limits
+        self.expected_states = expected_states
+        self.token = CancellationToken()
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._seq = 0
+        self._changed = threading.Condition()
+
+    def _update(self, **fields):
+        with self._changed:
+            for key, value in fields.items():
+                setattr(self, key, value)
+            self._seq += 1
+            self.events.append((self._seq, self.snapshot()))
+            self._changed.notify_all()
+
+    def report_progress(self, stats: dict):
+        """Вызывается из Budget.check: обновляет прогресс и оценку оставшегося времени."""
+        self._update(progress=dict(stats, eta=self._eta(stats)))
+
+    def _eta(self, stats):
+        # Только для операций с верхней границей числа состояний (построение произведения);
+        # у остальных expected_states не задан и ETA не сообщается
+        if not self.expected_states or not stats.get("states_explored"):
+            return None
+        done = min(stats["states_explored"] / self.expected_states, 1.0)
+        return round(stats["elapsed"] * (1 - done) / done, 3)
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "submitted": self.submitted,
+            "finished": self.finished,
+        }
+
+    def wait_for_event(self, after: int, timeout: float):
+        """Ждёт событие с номером больше after; возвращает список новых (номер, снимок)."""
+        with self._changed:
+            if self._seq <= after and self.status not in FINISHED:
+                self._changed.wait(timeout)
+            return [(seq, event) for seq, event in self.events if seq > after]
+
+
+class JobManager:
+    """
+    Локальный пул заданий без внешнего брокера.
+
+    Задания выполняются потоками-воркерами из ограниченной очереди; отменённое
+    ожидающее задание сразу убирается из неё и не занимает место. Прогресс
+    поступает через бюджет (budget.Budget.on_progress), отмена — через
+    CancellationToken. Завершённые задания хранятся ttl секунд.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 100, ttl: float = 3600):
+        self.ttl = ttl
+        self.max_queue = max_queue
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pending = deque()
+        self._has_pending = threading.Condition(self._lock)
+        self._threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, func, args, limits: dict | None = None, expected_states: int | None = None) -> Job:
+        """
+        Ставит func(*args, budget=...) в очередь.
+
+        :raises JobQueueFull: Если очередь заполнена.
+        """
+        self._purge()
+        job = Job(func, args, limits or {}, expected_states)
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                raise JobQueueFull("Очередь заданий заполнена")
+            self._jobs[job.id] = job
+            self._pending.append(job)
+            self._has_pending.notify()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        self._purge()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        # Отмена и переход в RUNNING (см. _run) идут под блокировкой задания,
+        # поэтому CANCELLED не может быть перезаписан
+        with self._lock, job._changed:
+            job.token.cancel()
+            if job.status == QUEUED:
+                if job in self._pending:  # воркер мог уже забрать его, но ещё не запустить
+                    self._pending.remove(job)
+                job._update(status=CANCELLED, finished=time.time())
+        return job
+
+    def _worker(self):
+        while True:
+            with self._has_pending:
+                while not self._pending:
+                    self._has_pending.wait()
+                job = self._pending.popleft()
+            self._run(job)
+
+    def _run(self, job: Job):
+        with job._changed:
+            if job.status != QUEUED:
+                return
+            job._update(status=RUNNING)
+        budget = budget_from_limits(job.limits, token=job.token, on_progress=job.report_progress)
+        try:
+            result = job.func(*job.args, budget=budget)
+        except BudgetExceeded as e:
+            status = CANCELLED if e.reason == "cancelled" else FAILED
+            job._update(status=status, error=e.to_dict(), progress=e.stats, finished=time.time())
+        except Exception as e:
+            job._update(status=FAILED, error={"error": f"{type(e).__name__}: {e}"}, finished=time.time())
+        else:
+            job.result = result
+            job._update(status=DONE, progress=budget.stats(), finished=time.time())
+        finally:
+            job.args = None  # входные автоматы больше не нужны
+
+    def _purge(self):
+        now = time.time()
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished is not None and now - job.finished > self.ttl]
+            for job_id in expired:
+                del self._jobs[job_id]
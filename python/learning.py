@@ -0,0 +1,201 @@
+import random
+
+from difference import build_pair_automaton, is_xor_final
+from final_state import find_accepted_word
+from metrics import registry as metrics
+from models import DFA
+from util import dfa_from_canonical
+
+
+class MembershipOracle:
+    """
+    Кэширующая обёртка над «чёрным ящиком» word -> bool.
+
+    Ответы хранятся в префиксном боре: узел — словарь «символ -> дочерний узел»,
+    ответ для слова лежит в его узле под ключом None. Одно и то же слово
+    никогда не спрашивается у ящика дважды, а общие префиксы слов таблицы
+    наблюдений хранятся один раз.
+
+    :ivar queries: Сколько раз спросили ящик (дорогие запросы).
+    :ivar lookups: Сколько всего было запросов, включая ответы из кэша.
+    """
+
+    def __init__(self, ask):
+        self.ask = ask
+        self.queries = 0
+        self.lookups = 0
+        self._root = {}
+
+    def __call__(self, word: str) -> bool:
+        self.lookups += 1
+        node = self._root
+        for symbol in word:
+            node = node.setdefault(symbol, {})
+        if None not in node:
+            node[None] = bool(self.ask(word))
+            self.queries += 1
+            metrics.inc("dfa_learning_membership_queries_total")
+        return node[None]
+
+
+class ReferenceOracle:
+    """
+    Оракул эквивалентности по эталонному ДКА.
+
+    Контрпример — кратчайшее слово симметрической разности гипотезы и эталона.
+    """
+
+    def __init__(self, reference: DFA):
+        self.reference = reference
+        self.queries = 0
+
+    def __call__(self, hypothesis: DFA) -> str | None:
+        self.queries += 1
+        return find_accepted_word(build_pair_automaton(hypothesis, self.reference, is_xor_final, "xor"))
+
+
+class RandomWalkOracle:
+    """
+    Приближённый оракул эквивалентности: сравнивает гипотезу с ящиком
+    на случайных словах. Слова спрашиваются через тот же кэш, что и у ученика.
+    """
+
+    def __init__(self, membership: MembershipOracle, alphabet, walks: int = 1000,
+                 max_length: int = 20, seed: int | None = None):
+        self.membership = membership
+        self.alphabet = sorted(alphabet)
+        self.walks = walks
+        self.max_length = max_length
+        self.random = random.Random(seed)
+        self.queries = 0
+
+    def __call__(self, hypothesis: DFA) -> str | None:
+        self.queries += 1
+        for _ in range(self.walks):
+            length = self.random.randint(0, self.max_length)
+            word = "".join(self.random.choice(self.alphabet) for _ in range(length))
+            if hypothesis.check_word(word) != self.membership(word):
+                return word
+        return None
+
+
+class ObservationTable:
+    """
+    Таблица наблюдений L*.
+
+    Строка префикса хранится одним целым числом: бит i — ответ на prefix + suffixes[i].
+    Префиксы доступа (access) всегда попарно различимы, поэтому согласованность
+    проверять не нужно — контрпримеры разбираются по Ривесту–Шапире и добавляют
+    ровно один новый суффикс.
+    """
+
+    def __init__(self, alphabet, membership: MembershipOracle):
+        self.alphabet = sorted(alphabet)
+        self.membership = membership
+        self.suffixes = [""]
+        self.access = []  # префиксы доступа: i-й соответствует состоянию i гипотезы
+        self._rows = {}  # префикс -> строка
+        self._states = {}  # строка -> номер состояния
+        self._add_access("")
+
+    def row(self, prefix: str) -> int:
+        row = self._rows.get(prefix)
+        if row is None:
+            row = 0
+            for bit, suffix in enumerate(self.suffixes):
+                row |= self.membership(prefix + suffix) << bit
+            self._rows[prefix] = row
+        return row
+
+    def _add_access(self, prefix: str):
+        self._states[self.row(prefix)] = len(self.access)
+        self.access.append(prefix)
+
+    def add_suffix(self, suffix: str):
+        bit = len(self.suffixes)
+        self.suffixes.append(suffix)
+        for prefix in self._rows:
+            self._rows[prefix] |= self.membership(prefix + suffix) << bit
+        self._states = {self._rows[prefix]: idx for idx, prefix in enumerate(self.access)}
+
+    def close(self, budget=None):
+        """Дополняет префиксы доступа, пока каждое продолжение не совпадёт с известной строкой."""
+        idx = 0
+        while idx < len(self.access):
+            prefix = self.access[idx]
+            for symbol in self.alphabet:
+                if self.row(prefix + symbol) not in self._states:
+                    self._add_access(prefix + symbol)
+                    if budget is not None:
+                        budget.charge(states=1, transitions=len(self.alphabet))
+            idx += 1
+
+    def hypothesis(self) -> DFA:
+        rows = tuple(
+            tuple(self._states[self.row(prefix + symbol)] for symbol in self.alphabet)
+            for prefix in self.access
+        )
+        finals = tuple(bool(self.row(prefix) & 1) for prefix in self.access)
+        return dfa_from_canonical(tuple(self.alphabet), finals, rows, prefix="L")
+
+    def state_of(self, word: str) -> int:
+        """Состояние гипотезы после чтения word."""
+        state = 0
+        for symbol in word:
+            state = self._states[self.row(self.access[state] + symbol)]
+        return state
+
+    def process_counterexample(self, word: str):
+        """
+        Разбор контрпримера по Ривесту–Шапире: двоичным поиском находим позицию i,
+        где ответ на access(δ(word[:i])) + word[i:] меняется, и добавляем суффикс word[i+1:].
+        """
+        def answer(i):
+            return self.membership(self.access[self.state_of(word[:i])] + word[i:])
+
+        low, high = 0, len(word)
+        low_answer = answer(low)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if answer(middle) == low_answer:
+                low = middle
+            else:
+                high = middle
+        self.add_suffix(word[high:])
+
+
+def learn_dfa(alphabet, membership, equivalence, budget=None) -> DFA:
+    """
+    Активное обучение минимального ДКА (L* с разбором контрпримеров по Ривесту–Шапире).
+
+    :param alphabet: Алфавит чёрного ящика.
+    :param membership: MembershipOracle (или функция word -> bool, она будет обёрнута в кэш).
+    :param equivalence: Функция hypothesis -> контрпример или None
+        (ReferenceOracle, RandomWalkOracle или своя).
+    :param budget: Необязательный budget.Budget; состояния гипотезы списываются с него,
+        раунд — одна проверка эквивалентности.
+    :return: Минимальный полный ДКА с состояниями L0, L1, ...
+    """
+    if not isinstance(membership, MembershipOracle):
+        membership = MembershipOracle(membership)
+
+    with metrics.timer("learn"):
+        table = ObservationTable(alphabet, membership)
+        rounds = 0
+        while True:
+            table.close(budget)
+            hypothesis = table.hypothesis()
+            if budget is not None:
+                budget.next_round("learn")
+            rounds += 1
+            metrics.inc("dfa_learning_equivalence_queries_total")
+            counterexample = equivalence(hypothesis)
+            if counterexample is None:
+                break
+            if hypothesis.check_word(counterexample) == membership(counterexample):
+                raise ValueError(f"Оракул эквивалентности вернул не контрпример: {counterexample!r}")
+            table.process_counterexample(counterexample)
+
+        metrics.observe("dfa_learning_rounds", rounds, operation="learn")
+        metrics.observe("dfa_output_states", len(hypothesis.states), operation="learn")
+    return hypothesis
@@ -1,14 +1,99 @@
-from flask import Flask, request, jsonify
+import json
+import os
+import uuid
+from functools import wraps
+
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+from budget import LIMIT_NAMES, BudgetExceeded, InvalidLimits, budget_from_limits, merge_limits
 from difference import build_difference_automaton, build_product_automaton
 from equivalency import are_equivalent
+from export import EXPORT_FORMATS, iter_export
 from final_state import has_reachable_final_state
+from metrics import registry as metrics
+from jobs import DONE, FINISHED, JobManager, JobQueueFull
 from minimize import minimize_dfa
 from models import DFA, State, Transition
+from pipeline import OPERATIONS, PipelineError, run_pipeline
+from profiling import parse_modes, profile_call, should_profile
+from serialization import gzip_chunks, iter_dfa_columnar, iter_dfa_json
+from store import ResultStore, cached_minimize, cached_verdict
 
 app = Flask(__name__)
 CORS(app)  # Разрешаем CORS для всех доменов
 
+# Метрики собираются по умолчанию, отключаются через DFA_METRICS=0
+metrics.enabled = os.environ.get("DFA_METRICS", "1") != "0"
+
+# Персистентное хранилище результатов включается переменной DFA_STORE_PATH
+store = None
+if os.environ.get("DFA_STORE_PATH"):
+    store = ResultStore(
+        os.environ["DFA_STORE_PATH"],
+        max_entries=int(os.environ.get("DFA_STORE_MAX_ENTRIES", "100000")),
+        warm=os.environ.get("DFA_STORE_WARM", "0") == "1",
+    )
+
+# Предельные ресурсы на один запрос; клиент может попросить меньше параметрами
+# ?max_states=...&max_transitions=...&timeout=...
+SERVER_LIMITS = {
+    "max_states": os.environ.get("DFA_MAX_STATES"),
+    "max_transitions": os.environ.get("DFA_MAX_TRANSITIONS"),
+    "timeout": os.environ.get("DFA_TIMEOUT"),
+}
+
+
+def request_budget():
+    """Бюджет текущего запроса: меньшее из серверных лимитов и лимитов из параметров запроса."""
+    requested = {name: request.args.get(name) for name in LIMIT_NAMES}
+    return budget_from_limits(merge_limits(SERVER_LIMITS, requested))
+
+
+@app.errorhandler(BudgetExceeded)
+def budget_exceeded(e):
+    return jsonify(e.to_dict()), 422
+
+
+@app.errorhandler(InvalidLimits)
+def invalid_limits(e):
+    return jsonify({"error": str(e)}), 400
+
+# Долгие операции выполняются асинхронно локальным пулом заданий
+job_manager = JobManager(
+    workers=int(os.environ.get("DFA_JOB_WORKERS", "2")),
+    max_queue=int(os.environ.get("DFA_JOB_QUEUE", "100")),
+    ttl=float(os.environ.get("DFA_JOB_TTL", "3600")),
+)
+
+# Профилирование по заголовку X-DFA-Profile: cpu, memory или all
+PROFILE_HEADER = "X-DFA-Profile"
+PROFILE_RATE = float(os.environ.get("DFA_PROFILE_RATE", "1"))
+PROFILE_DIR = os.environ.get("DFA_PROFILE_DIR")
+
+
+def profiled(view):
+    """Запускает эндпоинт под профилировщиком, если клиент попросил об этом заголовком."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        modes = parse_modes(request.headers.get(PROFILE_HEADER))
+        if not modes or not should_profile(PROFILE_RATE):
+            return view(*args, **kwargs)
+
+        rv, report = profile_call(view, *args, modes=modes, **kwargs)
+        response = app.make_response(rv)
+        profile_id = uuid.uuid4().hex
+        response.headers["X-DFA-Profile-Id"] = profile_id
+        if PROFILE_DIR:
+            report.save(PROFILE_DIR, profile_id)
+        elif response.is_json and not response.is_streamed:
+            # Без каталога для профилей возвращаем отчёт прямо в ответе
+            body = response.get_json()
+            if isinstance(body, dict):
+                body["profile"] = report.to_dict()
+                response.set_data(app.json.dumps(body))
+        return response
+    return wrapper
+
 # Преобразование ДКА из JSON в объект
 def dfa_from_json(data):
     """ десериализация, если структуры совпадают один в один"""
@@ -43,11 +128,33 @@ def dfa_to_json(dfa):
         "states": [{"name": state.name, "is_final": state.is_final} for state in dfa.states],
         "transitions": [{"source": t.source.name, "symbol": t.symbol, "target": t.target.name} for t in dfa.transitions],
         "alphabet": list(dfa.alphabet),
-        "start_state": dfa.start_state.name
+        "start_state": dfa.start_state.name if dfa.start_state else None
     }
 
+
+def dfa_response(dfa):
+    """
+    Ответ с автоматом.
+
+    По умолчанию — обычный jsonify(dfa_to_json(...)). Параметр ?format=columnar
+    выбирает колоночный JSON, ?stream=1 — потоковую отдачу того же JSON по кускам.
+    Потоковый ответ сжимается gzip, если клиент указал это в Accept-Encoding.
+    """
+    columnar = request.args.get("format") == "columnar"
+    if not columnar and request.args.get("stream") != "1":
+        return jsonify(dfa_to_json(dfa))
+
+    chunks = iter_dfa_columnar(dfa) if columnar else iter_dfa_json(dfa)
+    headers = {}
+    if "gzip" in request.accept_encodings:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(stream_with_context(chunks), mimetype="application/json", headers=headers)
+
 # Эндпоинт минимизации ДКА
 @app.route('/minimize', methods=['POST'])
+@profiled
 def minimize():
     data = request.get_json()
     dfa = dfa_from_json(data)
@@ -55,27 +162,27 @@ def minimize():
     print('got dfa on min ', dfa)
     
     # Минимизируем каждый ДКА
-    minimized_dfa = minimize_dfa(dfa)
-    
-    minimized_dfa_json = dfa_to_json(minimized_dfa)
-
-    print("returning ", minimized_dfa_json)
+    budget = request_budget()
+    minimized_dfa = cached_minimize(dfa, store, lambda d: minimize_dfa(d, budget))
     
-    return jsonify(minimized_dfa_json)
+    return dfa_response(minimized_dfa)
 
 # Эндпоинт проверки эквивалентности нескольких ДКА
 @app.route('/equivalence', methods=['POST'])
+@profiled
 def equivalence():
     data = request.get_json()
     
     # Преобразуем все ДКА из списка
     dfa_list = [dfa_from_json(dfa_data) for dfa_data in data]
+    budget = request_budget()
     
     # Проверяем эквивалентность всех ДКА
     def are_all_equivalent(dfa_list):
         """Проверяет эквивалентность всех ДКА в списке с использованием логарифмической сложности.""" 
         if (len(dfa_list) == 2):
-            return are_equivalent(dfa_list[0], dfa_list[1])
+            return cached_verdict("equivalent", dfa_list[0], dfa_list[1], store,
+                                  lambda a, b: are_equivalent(a, b, budget))
         elif (len(dfa_list) == 1):
             return True
         elif (len(dfa_list) == 0):
@@ -92,6 +199,7 @@ def equivalence():
 
 
 @app.route('/difference', methods=['POST'])
+@profiled
 def difference():
     data = request.get_json()
     if len(data) != 2:
@@ -100,10 +208,11 @@ def difference():
     dfa1 = dfa_from_json(data[0])
     dfa2 = dfa_from_json(data[1])
 
-    result_dfa = build_difference_automaton(dfa1, dfa2)
-    return jsonify(dfa_to_json(result_dfa))
+    result_dfa = build_difference_automaton(dfa1, dfa2, request_budget())
+    return dfa_response(result_dfa)
 
 @app.route('/product', methods=['POST'])
+@profiled
 def product():
     data = request.get_json()
     if len(data) != 2:
@@ -112,8 +221,141 @@ def product():
     dfa1 = dfa_from_json(data[0])
     dfa2 = dfa_from_json(data[1])
 
-    result_dfa = build_product_automaton(dfa1, dfa2)
-    return jsonify(dfa_to_json(result_dfa))
+    result_dfa = build_product_automaton(dfa1, dfa2, request_budget())
+    return dfa_response(result_dfa)
+
+EXPORT_MIMETYPES = {"dot": "text/vnd.graphviz", "graphml": "application/graphml+xml"}
+
+@app.route('/export', methods=['POST'])
+@profiled
+def export():
+    """
+    Потоковый экспорт автомата для визуализации: ?format=dot|graphml, ?trim=1 —
+    без недостижимых и мёртвых состояний. Параллельные рёбра склеиваются.
+    """
+    fmt = request.args.get("format", "dot")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Неизвестный формат экспорта: {fmt!r}"}), 400
+    dfa = dfa_from_json(request.get_json())
+
+    chunks = iter_export(dfa, fmt, trim=request.args.get("trim") == "1")
+    headers = {}
+    if "gzip" in request.accept_encodings:
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt], headers=headers)
+
+@app.route('/pipeline', methods=['POST'])
+@profiled
+def pipeline():
+    """
+    Выполняет цепочку операций за один запрос.
+
+    Тело: {"inputs": {имя: ДКА}, "steps": {имя: {"op": ..., "args": [...]}}, "outputs": [имена]}.
+    Промежуточные автоматы не сериализуются — в ответ попадают только outputs.
+    """
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"error": "Тело запроса должно быть JSON-объектом"}), 400
+    try:
+        results = run_pipeline(
+            data.get("inputs", {}),
+            data.get("steps", {}),
+            data.get("outputs", []),
+            parse=dfa_from_json,
+            budget=request_budget(),
+        )
+    except (PipelineError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        name: dfa_to_json(value) if isinstance(value, DFA) else value
+        for name, value in results.items()
+    })
+
+# Операции-произведения: число обработанных пар ограничено произведением размеров входов
+PAIR_OPERATIONS = {"difference", "product", "intersection", "union", "xor"}
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Ставит операцию в очередь. Тело: {"op": ..., "dfas": [...], "limits": {...}}.
+
+    Операции те же, что у /pipeline. Ответ 202 с id задания, 429 при заполненной очереди.
+    """
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"error": "Тело запроса должно быть JSON-объектом"}), 400
+    op = data.get("op")
+    if op not in OPERATIONS:
+        return jsonify({"error": f"Неизвестная операция {op!r}"}), 400
+    arity, operation = OPERATIONS[op]
+    dfas = [dfa_from_json(d) for d in data.get("dfas", [])]
+    if len(dfas) != arity:
+        return jsonify({"error": f"Операция {op} ожидает автоматов: {arity}"}), 400
+
+    # Верхняя граница числа пар — для оценки ETA; у остальных операций разумной границы нет
+    expected_states = None
+    if op in PAIR_OPERATIONS:
+        expected_states = 1
+        for dfa in dfas:
+            expected_states *= len(dfa.states) + 1
+
+    limits = merge_limits(SERVER_LIMITS, data.get("limits", {}))
+    try:
+        job = job_manager.submit(lambda *args, budget: operation(*args, data, budget), dfas, limits, expected_states)
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "1"}
+    return jsonify(job.snapshot()), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Задание не найдено"}), 404
+    return jsonify(job.snapshot())
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Задание не найдено"}), 404
+    return jsonify(job.snapshot())
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Задание не найдено"}), 404
+    if job.status != DONE:
+        return jsonify(job.snapshot()), 409
+    result = job.result
+    return jsonify({"result": dfa_to_json(result) if isinstance(result, DFA) else result})
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """Поток снимков прогресса в формате Server-Sent Events до завершения задания."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Задание не найдено"}), 404
+
+    def generate():
+        seen = 0
+        while True:
+            events = job.wait_for_event(seen, timeout=15)
+            for seen, event in events:
+                yield f"id: {seen}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            if not events:
+                if job.status in FINISHED:
+                    return
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(generate()), mimetype="text/event-stream")
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
 
 # Запуск Flask-приложения
 if __name__ == '__main__':
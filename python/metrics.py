@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import defaultdict
+
+# Границы корзин гистограмм: секунды для длительностей, штуки для размеров
+TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+METRIC_HELP = {
+    "dfa_operations_total": ("counter", "Количество выполненных операций над ДКА"),
+    "dfa_operation_seconds": ("histogram", "Длительность операций над ДКА"),
+    "dfa_stage_seconds": ("histogram", "Длительность отдельных стадий операций"),
+    "dfa_input_states": ("histogram", "Число состояний во входных автоматах"),
+    "dfa_output_states": ("histogram", "Число состояний в результирующих автоматах"),
+    "dfa_refinement_rounds": ("histogram", "Число раундов уточнения разбиения"),
+    "dfa_product_states_explored": ("histogram", "Число пар состояний, обойдённых при построении произведения"),
+}
+
+
+class _NullTimer:
+    """Заглушка таймера, когда сбор метрик выключен."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, registry, operation, stage):
+        self.registry = registry
+        self.operation = operation
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        if self.stage is None:
+            self.registry.inc("dfa_operations_total", operation=self.operation)
+            self.registry.observe("dfa_operation_seconds", elapsed, operation=self.operation)
+        else:
+            self.registry.observe("dfa_stage_seconds", elapsed, operation=self.operation, stage=self.stage)
+        return False
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+                break
+
+
+class MetricsRegistry:
+    """
+    Хранилище счётчиков и гистограмм.
+
+    Пока `enabled` выключен, все методы возвращаются сразу, поэтому
+    инструментированный код почти ничего не теряет в скорости.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                buckets = TIME_BUCKETS if name.endswith("_seconds") else SIZE_BUCKETS
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def timer(self, operation: str, stage: str | None = None):
+        """Контекстный менеджер для замера операции целиком или одной её стадии."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, operation, stage)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Выгружает метрики в текстовом формате Prometheus."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            lines = []
+            described = set()
+
+            for (name, labels), value in counters:
+                _describe(lines, described, name)
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for (name, labels), histogram in histograms:
+                _describe(lines, described, name)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    bucket_labels = labels + (("le", _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Короткая человекочитаемая сводка для CLI."""
+        with self._lock:
+            lines = []
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                where = "/".join(value for _, value in labels)
+                if name.endswith("_seconds"):
+                    lines.append(f"{name} {where}: {histogram.count} раз, всего {histogram.sum * 1000:.3f} мс")
+                else:
+                    lines.append(f"{name} {where}: {_format_value(histogram.sum)} (замеров: {histogram.count})")
+        return "\n".join(lines)
+
+
+def _describe(lines, described, name):
+    if name in described:
+        return
+    described.add(name)
+    kind, help_text = METRIC_HELP.get(name, ("untyped", name))
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Общий реестр процесса; сервис и CLI включают его явно
+registry = MetricsRegistry()
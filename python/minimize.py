@@ -1,5 +1,7 @@
 from collections import defaultdict
 
+from alphabet import SymbolClasses
+from metrics import registry as metrics
 from models import DFA, State, Transition
 def find_partition(state, partitions):
     """Находит индекс класса разбиения для состояния."""
@@ -8,28 +10,45 @@ def find_partition(state, partitions):
             return idx  # индекс, а не сам set
     return None
 
-def refine_partitions(dfa, partitions):
-    """Итеративно уточняет разбиение состояний с учетом переходов и финальности."""
+def refine_partitions(dfa, partitions, symbols=None, budget=None):
+    """
+    Итеративно уточняет разбиение состояний с учетом переходов и финальности.
+
+    :param symbols: Символы, по которым строятся сигнатуры; по умолчанию весь алфавит.
+        Достаточно передать представителей классов символов (см. alphabet.SymbolClasses).
+    :param budget: Необязательный budget.Budget; проверяется на каждом раунде и состоянии.
+    """
+    symbols = dfa.alphabet if symbols is None else symbols
+    rounds = 0
     while True:
+        rounds += 1
+        if budget is not None:
+            budget.next_round("refine")
         new_partitions = []
         for part in partitions:
             groups = defaultdict(set)
             for state in part:
+                # Проверяем на каждом состоянии: один большой блок может считаться долго
+                if budget is not None:
+                    budget.charge()
                 signature = tuple(
                     (find_partition(dfa.get_next_state(state, symbol), partitions)) 
-                    for symbol in dfa.alphabet
+                    for symbol in symbols
                 )
                 groups[signature].add(state)
             new_partitions.extend(groups.values())
 
         if new_partitions == partitions:
+            metrics.observe("dfa_refinement_rounds", rounds, operation="minimize")
             return partitions  # Разбиение стабилизировалось
         partitions = new_partitions
 
 
 
-def build_minimized_dfa(dfa, partitions):
+def build_minimized_dfa(dfa, partitions, classes=None):
     """Создаёт новый минимизированный ДКА на основе разбиения."""
+    if classes is None:
+        classes = SymbolClasses([{symbol} for symbol in dfa.alphabet])
     index_to_part = {idx: frozenset(part) for idx, part in enumerate(partitions)}
     new_states = {
         part: State(f"Q{idx}", any(s.is_final for s in part))
@@ -39,26 +58,46 @@ def build_minimized_dfa(dfa, partitions):
 
 
     for part, new_state in new_states.items():
-        for symbol in dfa.alphabet:
+        for representative, members in classes.members.items():
             old_state = next(iter(part))  # Берём любое состояние из класса
-            next_old_state = dfa.get_next_state(old_state, symbol)
+            next_old_state = dfa.get_next_state(old_state, representative)
             if next_old_state:
                 target_partition_index = find_partition(next_old_state, partitions)
                 target_partition = index_to_part[target_partition_index]
                 next_new_state = new_states[target_partition]
-                new_transitions.add(Transition(new_state, symbol, next_new_state))
+                for symbol in members:
+                    new_transitions.add(Transition(new_state, symbol, next_new_state))
 
     new_start_state = new_states[index_to_part[find_partition(dfa.start_state, partitions)]]
     return DFA(set(new_states.values()), dfa.alphabet, new_transitions, new_start_state)
 
 
-def minimize_dfa(dfa: DFA) -> DFA:
-    """Минимизирует ДКА с помощью алгоритма Хопкрофта."""
-    
-    final_states = {s for s in dfa.states if s.is_final}
-    dfa = remove_unreachable_states(dfa) 
-    final_states = {s for s in dfa.states if s.is_final}
-    dfa = remove_dead_states(dfa)
+def minimize_dfa(dfa: DFA, budget=None) -> DFA:
+    """
+    Минимизирует ДКА с помощью алгоритма Хопкрофта.
+
+    :param budget: Необязательный budget.Budget: размер входа списывается сразу,
+        уточнение разбиения проверяет время и отмену на каждом раунде.
+    """
+    with metrics.timer("minimize"):
+        metrics.observe("dfa_input_states", len(dfa.states), operation="minimize")
+        if budget is not None:
+            budget.stage = "minimize"
+            budget.charge(states=len(dfa.states), transitions=len(dfa.transitions))
+        minimized = _minimize_dfa(dfa, budget)
+        metrics.observe("dfa_output_states", len(minimized.states), operation="minimize")
+    return minimized
+
+
+def _minimize_dfa(dfa: DFA, budget=None) -> DFA:
+    if dfa.start_state is None:
+        # Без стартового состояния язык пуст
+        return DFA(states=set(), alphabet=set(), transitions=set(), start_state=None)
+
+    with metrics.timer("minimize", "trim"):
+        dfa = remove_unreachable_states(dfa)
+        final_states = {s for s in dfa.states if s.is_final}
+        dfa = remove_dead_states(dfa)
 
     if not dfa.transitions:
         # Если нет переходов, то автомат может быть либо пустым, либо состоять из одного состояния
@@ -81,8 +120,12 @@ def minimize_dfa(dfa: DFA) -> DFA:
             )
 
     non_final_states = dfa.states - final_states
-    partitions = refine_partitions(dfa, [final_states, non_final_states])
-    return build_minimized_dfa(dfa, partitions)
+    # Символы с одинаковыми столбцами переходов неразличимы — уточняем по классам
+    classes = SymbolClasses.from_dfas(dfa)
+    with metrics.timer("minimize", "refine"):
+        partitions = refine_partitions(dfa, [final_states, non_final_states], classes.representatives(), budget)
+    with metrics.timer("minimize", "build"):
+        return build_minimized_dfa(dfa, partitions, classes)
 
 
 def remove_unreachable_states(dfa: DFA) -> DFA:
@@ -104,22 +147,8 @@ def remove_unreachable_states(dfa: DFA) -> DFA:
 
 def remove_dead_states(dfa: DFA) -> DFA:
     """Удаляет мертвые состояния — те, из которых нельзя попасть в финальное состояние."""
-    reverse_graph = defaultdict(set)
-
-    # Построим обратный граф
-    for t in dfa.transitions:
-        reverse_graph[t.target].add((t.source, t.symbol))
-
-    # Начнем поиск из финальных состояний
-    alive = set()
-    frontier = {s for s in dfa.states if s.is_final}
-
-    while frontier:
-        state = frontier.pop()
-        if state not in alive:
-            alive.add(state)
-            for prev_state, _ in reverse_graph[state]:
-                frontier.add(prev_state)
+    # Живые состояния — те, до которых дошёл BFS по обратному графу от финальных
+    alive = set(dfa.distances_to_final())
 
     # Фильтруем состояния и переходы
     alive_transitions = {t for t in dfa.transitions if t.source in alive and t.target in alive}
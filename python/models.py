@@ -1,29 +1,65 @@
+from collections import defaultdict, deque
+
+
 class State:
+    """Неизменяемое состояние автомата; хеш вычисляется один раз при создании."""
+
+    __slots__ = ("name", "is_final", "_hash")
+
     def __init__(self, name: str, is_final: bool = False):
-        self.name = name
-        self.is_final = is_final
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "is_final", is_final)
+        object.__setattr__(self, "_hash", hash((name, is_final)))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("State неизменяем")
+
+    def __delattr__(self, key):
+        raise AttributeError("State неизменяем")
+
+    def __reduce__(self):
+        return State, (self.name, self.is_final)
+
+    def to_dict(self):
+        return {"name": self.name, "is_final": self.is_final}
 
     def __repr__(self):
         return f"State({self.name}, final={self.is_final})"
 
     def __eq__(self, other):
-        return isinstance(other, State) and self.name == other.name and self.is_final == other.is_final
+        return self is other or (
+            isinstance(other, State) and self.name == other.name and self.is_final == other.is_final
+        )
 
     def __hash__(self):
-        return hash((self.name, self.is_final))
+        return self._hash
 
 
 class Transition:
+    """Неизменяемый переход автомата."""
+
+    __slots__ = ("source", "symbol", "target", "_hash")
+
     def __init__(self, source: State, symbol: str, target: State):
-        self.source = source
-        self.symbol = symbol
-        self.target = target
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "symbol", symbol)
+        object.__setattr__(self, "target", target)
+        object.__setattr__(self, "_hash", hash((source, symbol, target)))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Transition неизменяем")
+
+    def __delattr__(self, key):
+        raise AttributeError("Transition неизменяем")
+
+    def __reduce__(self):
+        return Transition, (self.source, self.symbol, self.target)
 
     def __repr__(self):
         return f"Transition({self.source} --{self.symbol}--> {self.target})"
 
     def __eq__(self, other):
-        return (
+        return self is other or (
             isinstance(other, Transition) and
             self.source == other.source and
             self.symbol == other.symbol and
@@ -31,16 +67,43 @@ class Transition:
         )
 
     def __hash__(self):
-        return hash((self.source, self.symbol, self.target))
+        return self._hash
 
 
 class DFA:
+    """
+    Неизменяемый ДКА.
+
+    Равные состояния интернируются: переходы и стартовое состояние ссылаются
+    на те же объекты State, что лежат в `states`. Поэтому готовый автомат можно
+    кешировать и отдавать нескольким потокам без копирования.
+    """
+
+    __slots__ = ("states", "alphabet", "transitions", "start_state", "transition_dict",
+                 "_distances", "_live_transition_dict")
+
     def __init__(self, states: set[State], alphabet: set[str], transitions: set[Transition], start_state: State):
-        self.states = states
-        self.alphabet = alphabet
-        self.transitions = transitions
-        self.start_state = start_state
-        self.transition_dict = self._build_transition_dict()
+        interned = {s: s for s in states}
+        start_state = interned.get(start_state, start_state) if start_state is not None else None
+        transitions = frozenset(_intern_transition(t, interned) for t in transitions)
+
+        object.__setattr__(self, "states", frozenset(interned))
+        object.__setattr__(self, "alphabet", frozenset(alphabet))
+        object.__setattr__(self, "transitions", transitions)
+        object.__setattr__(self, "start_state", start_state)
+        object.__setattr__(self, "transition_dict", self._build_transition_dict())
+        # Индекс живых состояний строится лениво, при первом обращении
+        object.__setattr__(self, "_distances", None)
+        object.__setattr__(self, "_live_transition_dict", None)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("DFA неизменяем")
+
+    def __delattr__(self, key):
+        raise AttributeError("DFA неизменяем")
+
+    def __reduce__(self):
+        return DFA, (self.states, self.alphabet, self.transitions, self.start_state)
 
     def _build_transition_dict(self):
         """Создаёт удобную структуру данных для быстрого доступа к переходам."""
@@ -52,16 +115,84 @@ class DFA:
     def get_next_state(self, current_state: State, symbol: str) -> State | None:
         """Возвращает следующее состояние по символу или None, если перехода нет."""
         return self.transition_dict.get((current_state, symbol))
-    
+
+    def build_reverse_graph(self):
+        """Обратный граф: состояние -> множество пар (предшественник, символ)."""
+        reverse_graph = defaultdict(set)
+        for t in self.transitions:
+            reverse_graph[t.target].add((t.source, t.symbol))
+        return reverse_graph
+
+    def distances_to_final(self) -> dict[State, int]:
+        """
+        Длина кратчайшего пути до финального состояния для каждого живого состояния.
+
+        Мёртвые состояния (из которых финальное недостижимо) в словарь не попадают.
+        Считается один раз BFS по обратному графу от всех финальных состояний.
+        """
+        if self._distances is None:
+            reverse_graph = self.build_reverse_graph()
+            distances = {s: 0 for s in self.states if s.is_final}
+            queue = deque(distances)
+            while queue:
+                state = queue.popleft()
+                for prev_state, _ in reverse_graph[state]:
+                    if prev_state not in distances:
+                        distances[prev_state] = distances[state] + 1
+                        queue.append(prev_state)
+            object.__setattr__(self, "_distances", distances)
+        return self._distances
+
+    def is_live(self, state: State) -> bool:
+        """Можно ли из состояния дойти до финального."""
+        return state in self.distances_to_final()
+
+    def min_remaining_length(self, prefix) -> int | None:
+        """
+        Минимальное число символов, которое нужно дописать к prefix, чтобы слово было принято.
+
+        None, если после prefix принять слово уже невозможно.
+        """
+        current_state = self.start_state
+        for symbol in prefix:
+            current_state = self._live_transitions().get((current_state, symbol))
+            if current_state is None:
+                return None
+        return self.distances_to_final().get(current_state)
+
+    def _live_transitions(self):
+        """Словарь переходов без переходов в мёртвые состояния."""
+        if self._live_transition_dict is None:
+            distances = self.distances_to_final()
+            live = {key: target for key, target in self.transition_dict.items() if target in distances}
+            object.__setattr__(self, "_live_transition_dict", live)
+        return self._live_transition_dict
+
     def check_word(self, word: str) -> bool:
-        """Проверяет, принадлежит ли слово языку, который распознаёт ДКА."""
+        """
+        Проверяет, принадлежит ли слово языку, который распознаёт ДКА.
+
+        Переходы в мёртвые состояния отброшены, поэтому разбор останавливается,
+        как только принять слово становится невозможно.
+        """
+        transitions = self._live_transitions()
         current_state = self.start_state
+        if current_state not in self._distances:
+            return False
         for symbol in word:
-            current_state = self.get_next_state(current_state, symbol)
-            if current_state is None:  # Нет перехода по символу
+            current_state = transitions.get((current_state, symbol))
+            if current_state is None:  # Нет перехода по символу или дальше только мёртвые состояния
                 return False
         return current_state.is_final  # Проверяем, финальное ли состояние
 
 
     def __repr__(self):
         return f"DFA(states={self.states}, alphabet={self.alphabet}, start_state={self.start_state}, transtitions={self.transitions})"
+
+
+def _intern_transition(t: Transition, interned) -> Transition:
+    source = interned.get(t.source, t.source)
+    target = interned.get(t.target, t.target)
+    if source is t.source and target is t.target:
+        return t
+    return Transition(source, t.symbol, target)
@@ -0,0 +1,283 @@
+import mmap
+import multiprocessing
+import os
+import shutil
+import tempfile
+from array import array
+
+from alphabet import SymbolClasses
+from difference import is_difference_final
+from metrics import registry as metrics
+from models import DFA, State, Transition
+
+# Сколько пар отправлять соседу одним сообщением
+BATCH_SIZE = 4096
+
+# Множитель для перемешивания номера пары перед выбором владельца
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+
+# Служебные сообщения
+_END = "end"
+_CONTINUE = "continue"
+_STOP = "stop"
+_PARENT = "parent"
+
+
+def owner(pair: int, workers: int) -> int:
+    """Номер процесса, которому принадлежит пара (хеш-разбиение пространства пар)."""
+    return (((pair * _HASH_MULTIPLIER) & _MASK) >> 32) % workers
+
+
+class _Tables:
+    """
+    Компактное представление операндов: состояния пронумерованы, переходы —
+    строки целых чисел по классам символов. Номер n — поглощающее состояние ⊥.
+    """
+
+    def __init__(self, dfa1: DFA, dfa2: DFA):
+        self.classes = SymbolClasses.from_dfas(dfa1, dfa2)
+        self.representatives = self.classes.representatives()
+        self.states1, self.table1 = self._encode(dfa1, "⊥1")
+        self.states2, self.table2 = self._encode(dfa2, "⊥2")
+        self.width = len(self.states2)
+        self.start = self.pair(self.states1.index(dfa1.start_state), self.states2.index(dfa2.start_state))
+
+    def _encode(self, dfa, sink_name):
+        states = sorted(dfa.states, key=lambda s: s.name) + [State(sink_name, is_final=False)]
+        sink = len(states) - 1
+        index = {state: idx for idx, state in enumerate(states)}
+        table = []
+        for state in states:
+            row = array("l")
+            for symbol in self.representatives:
+                target = dfa.get_next_state(state, symbol) if state in dfa.states else None
+                row.append(index[target] if target is not None else sink)
+            table.append(row)
+        return states, table
+
+    def pair(self, q1: int, q2: int) -> int:
+        return q1 * self.width + q2
+
+    def split(self, pair: int):
+        return divmod(pair, self.width)
+
+
+def _worker(rank, workers, tables, is_final, build, inboxes, control, results, path):
+    """
+    Процесс-исследователь своей части пространства пар.
+
+    Работа идёт синхронными раундами (уровнями BFS): принять пары от всех,
+    отметить новые, доложить координатору, получить команду, разослать
+    преемников новых пар их владельцам.
+    """
+    seen = {}  # пара -> (родительская пара, класс символа) или None для стартовой
+    inbox = inboxes[rank]
+    output = open(path, "wb") if build else None
+    try:
+        while True:
+            ends = 0
+            found = None
+            new = []
+            while ends < workers:
+                message = inbox.get()
+                if message == _END:
+                    ends += 1
+                    continue
+                for pair, parent, symbol in message:
+                    if pair in seen:
+                        continue
+                    seen[pair] = (parent, symbol) if parent is not None else None
+                    new.append(pair)
+                    if found is None:
+                        q1, q2 = tables.split(pair)
+                        if is_final(tables.states1[q1], tables.states2[q2]):
+                            found = pair
+            frontier = new
+            results.put((rank, len(new), found))
+
+            while True:
+                command = control[rank].get()
+                if command[0] == _PARENT:
+                    results.put((rank, seen.get(command[1])))
+                    continue
+                break
+            if command[0] == _STOP:
+                if output is not None:
+                    finals = array("q", (pair for pair in seen
+                                         if is_final(tables.states1[pair // tables.width],
+                                                     tables.states2[pair % tables.width])))
+                    results.put((rank, array("q", seen).tobytes(), finals.tobytes()))
+                return
+
+            batches = [[] for _ in range(workers)]
+            edges = array("q")
+            for pair in frontier:
+                q1, q2 = tables.split(pair)
+                row1, row2 = tables.table1[q1], tables.table2[q2]
+                for symbol in range(len(tables.representatives)):
+                    target = tables.pair(row1[symbol], row2[symbol])
+                    if build:
+                        edges.extend((pair, symbol, target))
+                    batch = batches[owner(target, workers)]
+                    batch.append((target, pair, symbol))
+                    if len(batch) >= BATCH_SIZE:
+                        inboxes[owner(target, workers)].put(batch)
+                        batches[owner(target, workers)] = []
+            for idx, batch in enumerate(batches):
+                if batch:
+                    inboxes[idx].put(batch)
+            if output is not None:
+                edges.tofile(output)
+            for other in inboxes:
+                other.put(_END)
+    finally:
+        if output is not None:
+            output.close()
+
+
+class ParallelProductExplorer:
+    """
+    Параллельный обход произведения двух ДКА несколькими процессами.
+
+    Пространство пар разбито по хешу номера пары: каждую пару хранит и
+    раскрывает ровно один процесс. Процессы обмениваются пачками фронтира
+    через очереди multiprocessing, пары хранятся целыми числами, а переходы
+    результата пишутся каждым процессом в свой файл и читаются через mmap.
+
+    Обход идёт уровнями, поэтому при stop_on_final все процессы останавливаются
+    в конце уровня, на котором хоть один нашёл финальную пару, а найденный
+    свидетель — одно из кратчайших слов.
+    """
+
+    def __init__(self, dfa1: DFA, dfa2: DFA, is_final=is_difference_final, workers: int | None = None,
+                 budget=None):
+        if not dfa1.start_state or not dfa2.start_state:
+            raise ValueError("В одном из автоматов отсутствует стартовое состояние!")
+        self.dfa1 = dfa1
+        self.dfa2 = dfa2
+        self.is_final = is_final
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget
+        self.tables = _Tables(dfa1, dfa2)
+
+    def _run(self, stop_on_final: bool, build: bool):
+        """Запускает процессы; возвращает (финальная пара, свидетель, файлы переходов, пары, финальные пары)."""
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(self.workers)]
+        control = [context.Queue() for _ in range(self.workers)]
+        results = context.Queue()
+        directory = tempfile.mkdtemp(prefix="dfa-product-") if build else None
+        paths = [os.path.join(directory, f"edges-{rank}.bin") if build else None for rank in range(self.workers)]
+        processes = [
+            context.Process(target=_worker, daemon=True,
+                            args=(rank, self.workers, self.tables, self.is_final, build,
+                                  inboxes, control, results, paths[rank]))
+            for rank in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        start = self.tables.start
+        inboxes[owner(start, self.workers)].put([(start, None, None)])
+        for inbox in inboxes:
+            for _ in range(self.workers):
+                inbox.put(_END)
+
+        found = None
+        explored = 0
+        try:
+            while True:
+                reports = [results.get() for _ in range(self.workers)]
+                new = sum(count for _, count, _ in reports)
+                explored += new
+                found = next((pair for _, _, pair in sorted(reports) if pair is not None), None)
+                if self.budget is not None:
+                    self.budget.charge(states=new, transitions=new * len(self.tables.representatives))
+                    self.budget.next_round("parallel_product")
+                if new == 0 or (stop_on_final and found is not None):
+                    break
+                for queue in control:
+                    queue.put((_CONTINUE,))
+
+            word = self._trace(found, control, results) if found is not None and stop_on_final else None
+            for queue in control:
+                queue.put((_STOP,))
+            pairs, finals = array("q"), array("q")
+            if build:
+                for rank, seen, final in sorted(results.get() for _ in range(self.workers)):
+                    pairs.frombytes(seen)
+                    finals.frombytes(final)
+            for process in processes:
+                process.join()
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            if directory is not None:
+                shutil.rmtree(directory, ignore_errors=True)
+            raise
+        metrics.observe("dfa_product_states_explored", explored, operation="parallel_product")
+        return found, word, [path for path in paths if path], pairs, finals
+
+    def _trace(self, pair, control, results):
+        """Восстанавливает слово до пары, спрашивая родителей у процессов-владельцев."""
+        symbols = []
+        while True:
+            control[owner(pair, self.workers)].put((_PARENT, pair))
+            _, link = results.get()
+            if link is None:
+                break
+            pair, symbol = link
+            symbols.append(self.tables.representatives[symbol])
+        return "".join(reversed(symbols))
+
+    def is_empty(self) -> bool:
+        """True, если ни одна достижимая пара не финальна; процессы останавливаются при первой находке."""
+        with metrics.timer("parallel_product", "empty"):
+            found, _, _, _, _ = self._run(stop_on_final=True, build=False)
+        return found is None
+
+    def witness(self) -> str | None:
+        """Кратчайшее слово, приводящее в финальную пару, или None."""
+        with metrics.timer("parallel_product", "witness"):
+            found, word, _, _, _ = self._run(stop_on_final=True, build=False)
+        return word if found is not None else None
+
+    def build(self) -> DFA:
+        """Полный автомат на парах — тот же, что строит difference.build_pair_automaton."""
+        with metrics.timer("parallel_product", "build"):
+            _, _, paths, pairs, finals = self._run(stop_on_final=False, build=True)
+            tables = self.tables
+            final_pairs = set(finals)
+            states = {}
+            for pair in pairs:
+                q1, q2 = tables.split(pair)
+                name = f"({tables.states1[q1].name},{tables.states2[q2].name})"
+                states[pair] = State(name, is_final=pair in final_pairs)
+
+            transitions = set()
+            for path in paths:
+                try:
+                    for source, symbol, target in _read_edges(path):
+                        representative = tables.representatives[symbol]
+                        for member in tables.classes.members[representative]:
+                            transitions.add(Transition(states[source], member, states[target]))
+                finally:
+                    os.unlink(path)
+            os.rmdir(os.path.dirname(paths[0]))
+
+        return DFA(set(states.values()), self.dfa1.alphabet.union(self.dfa2.alphabet), transitions,
+                   states[tables.start])
+
+
+def _read_edges(path):
+    """Тройки (пара, класс символа, пара) из файла процесса, без чтения файла целиком."""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped).cast("q")
+        try:
+            for idx in range(0, len(view), 3):
+                yield view[idx], view[idx + 1], view[idx + 2]
+        finally:
+            view.release()
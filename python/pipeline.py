@@ -0,0 +1,106 @@
+from closure import concatenation, left_quotient, reversal, right_quotient, star
+from difference import (
+    build_difference_automaton,
+    build_pair_automaton,
+    build_product_automaton,
+    is_intersection_final,
+    is_union_final,
+    is_xor_final,
+)
+from equivalency import are_equivalent
+from final_state import find_accepted_word, has_reachable_final_state
+from minimize import minimize_dfa
+from models import DFA
+
+
+def _accepts(dfa, step):
+    if "word" not in step:
+        raise PipelineError("Для операции accepts нужно поле word")
+    return dfa.check_word(step["word"])
+
+
+# Операция -> (число аргументов, функция(*аргументы, step, budget))
+OPERATIONS = {
+    "minimize": (1, lambda dfa, step, budget: minimize_dfa(dfa, budget)),
+    "difference": (2, lambda a, b, step, budget: build_difference_automaton(a, b, budget)),
+    "product": (2, lambda a, b, step, budget: build_product_automaton(a, b, budget)),
+    "intersection": (2, lambda a, b, step, budget: build_pair_automaton(a, b, is_intersection_final, "intersection", budget)),
+    "union": (2, lambda a, b, step, budget: build_pair_automaton(a, b, is_union_final, "union", budget)),
+    "xor": (2, lambda a, b, step, budget: build_pair_automaton(a, b, is_xor_final, "xor", budget)),
+    "equivalent": (2, lambda a, b, step, budget: are_equivalent(a, b, budget)),
+    "is_empty": (1, lambda dfa, step, budget: not has_reachable_final_state(dfa)),
+    "witness": (1, lambda dfa, step, budget: find_accepted_word(dfa)),
+    "accepts": (1, lambda dfa, step, budget: _accepts(dfa, step)),
+    "concatenation": (2, lambda a, b, step, budget: concatenation(a, b, budget)),
+    "star": (1, lambda dfa, step, budget: star(dfa, budget)),
+    "reversal": (1, lambda dfa, step, budget: reversal(dfa, budget)),
+    "right_quotient": (2, lambda a, b, step, budget: right_quotient(a, b, budget)),
+    "left_quotient": (2, lambda a, b, step, budget: left_quotient(a, b, budget)),
+}
+
+
+class PipelineError(ValueError):
+    """Некорректное описание конвейера: неизвестная операция, цикл, лишние или пропущенные имена."""
+
+
+def run_pipeline(inputs: dict, steps: dict, outputs: list, parse=None, budget=None) -> dict:
+    """
+    Выполняет на сервере DAG операций над именованными ДКА.
+
+    Вычисляются только шаги, от которых зависят запрошенные outputs; каждый шаг —
+    не больше одного раза, его результат переиспользуется всеми зависящими шагами.
+
+    :param inputs: Имя -> ДКА (или его JSON-описание, если задан parse).
+    :param steps: Имя -> {"op": операция, "args": [имена входов или шагов], ...}.
+    :param outputs: Имена входов или шагов, значения которых нужно вернуть.
+    :param parse: Функция разбора входа; входы разбираются лениво, только если нужны.
+    :param budget: Необязательный budget.Budget, общий на все шаги конвейера.
+    :return: Имя -> значение (DFA, bool или str/None для witness).
+    """
+    if not isinstance(inputs, dict) or not isinstance(steps, dict):
+        raise PipelineError("inputs и steps должны быть объектами")
+    if not isinstance(outputs, list):
+        raise PipelineError("outputs должен быть списком имён")
+    overlap = set(inputs) & set(steps)
+    if overlap:
+        raise PipelineError(f"Имена входов и шагов совпадают: {sorted(overlap)}")
+
+    values = {}
+    in_progress = set()
+
+    def resolve(name):
+        if not isinstance(name, str):
+            raise PipelineError(f"Имя должно быть строкой: {name!r}")
+        if name in values:
+            return values[name]
+        if name in inputs:
+            value = inputs[name]
+            values[name] = parse(value) if parse and not isinstance(value, DFA) else value
+            return values[name]
+        if name not in steps:
+            raise PipelineError(f"Неизвестное имя: {name}")
+        if name in in_progress:
+            raise PipelineError(f"Цикл в конвейере через шаг {name}")
+
+        step = steps[name]
+        if not isinstance(step, dict):
+            raise PipelineError(f"Шаг {name} должен быть объектом вида {{\"op\": ..., \"args\": [...]}}")
+        if step.get("op") not in OPERATIONS:
+            raise PipelineError(f"Неизвестная операция {step.get('op')!r} в шаге {name}")
+        arity, operation = OPERATIONS[step["op"]]
+        args = step.get("args", [])
+        if not isinstance(args, list):
+            raise PipelineError(f"Аргументы шага {name} должны быть списком")
+        if len(args) != arity:
+            raise PipelineError(f"Операция {step['op']} ожидает аргументов: {arity}, в шаге {name} — {len(args)}")
+
+        in_progress.add(name)
+        arguments = [resolve(arg) for arg in args]
+        for arg, value in zip(args, arguments):
+            if not isinstance(value, DFA):
+                raise PipelineError(f"Аргумент {arg} шага {name} не является автоматом")
+        values[name] = operation(*arguments, step, budget)
+        in_progress.discard(name)
+        return values[name]
+
+    return {name: resolve(name) for name in outputs}
@@ -0,0 +1,191 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Ограничения, чтобы профилирование под нагрузкой не съедало память и CPU
+SAMPLE_INTERVAL = 0.001  # период снятия стеков, секунды
+MAX_SAMPLES = 20_000     # после этого сэмплер останавливается
+MAX_STACK_DEPTH = 64
+MAX_STACKS = 500         # уникальных стеков в свёрнутом профиле
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 1
+
+PROFILE_MODES = ("cpu", "memory")
+
+# cProfile и tracemalloc глобальны для процесса — одновременно профилируем только один вызов
+_profile_lock = threading.Lock()
+
+
+class ProfileReport:
+    """Результат профилирования одного вызова."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.collapsed = {}
+        self.samples = 0
+        self.top_functions = ""
+        self.allocations = []
+        self.skipped = False
+
+    def collapsed_text(self) -> str:
+        """Свёрнутые стеки в формате flamegraph.pl / speedscope: `f1;f2;f3 count`."""
+        return "\n".join(f"{stack} {count}" for stack, count in
+                         sorted(self.collapsed.items(), key=lambda item: -item[1]))
+
+    def to_dict(self):
+        return {
+            "elapsed": self.elapsed,
+            "skipped": self.skipped,
+            "samples": self.samples,
+            "collapsed": self.collapsed_text(),
+            "top_functions": self.top_functions,
+            "allocations": self.allocations,
+        }
+
+    def save(self, directory: str, name: str) -> str:
+        """Сохраняет свёрнутые стеки и сводку в каталог, возвращает путь к .folded файлу."""
+        os.makedirs(directory, exist_ok=True)
+        folded_path = os.path.join(directory, f"{name}.folded")
+        with open(folded_path, "w") as f:
+            f.write(self.collapsed_text())
+        with open(os.path.join(directory, f"{name}.txt"), "w") as f:
+            f.write(self.summary())
+        return folded_path
+
+    def summary(self) -> str:
+        lines = [f"Время: {self.elapsed * 1000:.3f} мс, стеков снято: {self.samples}"]
+        if self.top_functions:
+            lines.append(self.top_functions)
+        if self.allocations:
+            lines.append("Крупнейшие места выделения памяти:")
+            for alloc in self.allocations:
+                lines.append(f"  {alloc['size']} байт, {alloc['count']} блоков: {alloc['where']}")
+        return "\n".join(lines)
+
+
+class _StackSampler(threading.Thread):
+    """Фоновый поток, периодически снимающий стек профилируемого потока."""
+
+    def __init__(self, target_thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval) and self.samples < MAX_SAMPLES:
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            self.stacks[_collapse(frame)] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def should_profile(rate: float) -> bool:
+    """Сэмплирование запросов: профилируется примерно доля `rate` из них."""
+    return rate >= 1 or random.random() < rate
+
+
+def parse_modes(value: str | None) -> set[str]:
+    """Разбирает строку вида "cpu,memory" (или "all") в набор режимов."""
+    if not value:
+        return set()
+    modes = {mode.strip() for mode in value.split(",") if mode.strip()}
+    if "all" in modes or "1" in modes or "true" in modes:
+        return set(PROFILE_MODES)
+    return modes & set(PROFILE_MODES)
+
+
+def profile_call(func, *args, modes=PROFILE_MODES, interval: float = SAMPLE_INTERVAL, **kwargs):
+    """
+    Выполняет func(*args, **kwargs) под профилировщиком.
+
+    :param modes: "cpu" — cProfile и сэмплирование стеков, "memory" — tracemalloc.
+    :return: Кортеж (результат вызова, ProfileReport).
+    """
+    report = ProfileReport()
+    if not _profile_lock.acquire(blocking=False):
+        # Уже профилируется другой запрос — просто выполняем вызов
+        report.skipped = True
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        report.elapsed = time.perf_counter() - started
+        return result, report
+
+    try:
+        profiler = cProfile.Profile() if "cpu" in modes else None
+        sampler = _StackSampler(threading.get_ident(), interval) if "cpu" in modes else None
+        if "memory" in modes:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+        if sampler:
+            sampler.start()
+        started = time.perf_counter()
+        try:
+            if profiler:
+                result = profiler.runcall(func, *args, **kwargs)
+            else:
+                result = func(*args, **kwargs)
+        finally:
+            report.elapsed = time.perf_counter() - started
+            if sampler:
+                sampler.stop()
+            if "memory" in modes:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                report.allocations = _top_allocations(snapshot)
+
+        if sampler:
+            report.samples = sampler.samples
+            report.collapsed = dict(sampler.stacks.most_common(MAX_STACKS))
+        if profiler:
+            report.top_functions = _top_functions(profiler)
+        return result, report
+    finally:
+        _profile_lock.release()
+
+
+def _top_functions(profiler) -> str:
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+    return stream.getvalue()
+
+
+def _top_allocations(snapshot):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    allocations = []
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[-1]
+        allocations.append({
+            "size": stat.size,
+            "count": stat.count,
+            "where": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+        })
+    return allocations
@@ -0,0 +1,123 @@
+from collections import deque
+
+from alphabet import SymbolClasses
+
+# Ключ, под которым в таблице состояния хранится распознанный токен
+_TOKEN = None
+
+
+class ScanError(ValueError):
+    """Ни один шаблон не распознаёт непустой префикс с данной позиции."""
+
+    def __init__(self, position: int):
+        super().__init__(f"Не удалось распознать токен в позиции {position}")
+        self.position = position
+
+
+class Scanner:
+    """
+    Лексический сканер над несколькими ДКА-шаблонами.
+
+    Шаблоны объединяются конструкцией произведения: состояние сканера — кортеж
+    состояний всех шаблонов, мёртвые состояния заменяются None. Если в кортеже финальны несколько компонент,
+    состояние помечается токеном шаблона с наименьшим индексом (наивысший приоритет).
+    """
+
+    def __init__(self, patterns):
+        """
+        :param patterns: Список пар (token_id, DFA) в порядке убывания приоритета.
+        """
+        self.token_ids = [token_id for token_id, _ in patterns]
+        dfas = [dfa for _, dfa in patterns]
+        classes = SymbolClasses.from_dfas(*dfas)
+
+        def live(dfa, state):
+            # Мёртвая компонента (поглощающее состояние полного ДКА) считается умершей,
+            # иначе кортеж не умирает никогда и каждый токен дочитывается до конца буфера
+            return state if state is not None and dfa.is_live(state) else None
+
+        start = tuple(live(dfa, dfa.start_state) for dfa in dfas)
+        tables = {start: {}}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            table = tables[current]
+            for idx, state in enumerate(current):
+                if state is not None and state.is_final:
+                    table[_TOKEN] = self.token_ids[idx]
+                    break
+
+            for representative, members in classes.members.items():
+                target = tuple(
+                    live(dfa, dfa.get_next_state(state, representative)) if state is not None else None
+                    for dfa, state in zip(dfas, current)
+                )
+                if all(state is None for state in target):
+                    continue  # все шаблоны умерли — перехода нет
+                if target not in tables:
+                    tables[target] = {}
+                    queue.append(target)
+                for symbol in members:
+                    table[symbol] = tables[target]
+
+        self.state_count = len(tables)
+        self._start = tables[start]
+
+    def scan(self, text: str):
+        """Разбивает строку на токены: генератор кортежей (token_id, start, end)."""
+        return self.scan_stream([text])
+
+    def scan_stream(self, chunks):
+        """
+        Разбивает поток фрагментов текста на токены по правилу leftmost-longest.
+
+        Автомат идёт вперёд, пока есть переходы, запоминая последнюю позицию,
+        где был распознан токен; после остановки токен выдаётся, и разбор
+        продолжается с его конца. Уже разобранная часть буфера отбрасывается.
+
+        :raises ScanError: Если с текущей позиции не распознаётся ни один токен.
+        """
+        chunks = iter(chunks)
+        buffer = ""
+        base = 0        # абсолютная позиция buffer[0]
+        start = 0       # начало текущего токена в буфере
+        exhausted = False
+
+        while True:
+            table = self._start
+            pos = start
+            last = None
+            while True:
+                if pos == len(buffer):
+                    if exhausted:
+                        break
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    buffer = buffer[start:] + chunk
+                    base += start
+                    pos -= start
+                    start = 0
+                    continue
+                table = table.get(buffer[pos])
+                if table is None:
+                    break
+                pos += 1
+                token_id = table.get(_TOKEN)
+                if token_id is not None:
+                    last = (token_id, base + pos)
+
+            if last is None:
+                if exhausted and start == len(buffer):
+                    return
+                raise ScanError(base + start)
+
+            token_id, end = last
+            yield token_id, base + start, end
+            start = end - base
+
+
+def build_scanner(patterns) -> Scanner:
+    """Собирает сканер из списка пар (token_id, DFA); раньше в списке — выше приоритет."""
+    return Scanner(patterns)
@@ -0,0 +1,102 @@
+import json
+import zlib
+
+from models import DFA, State, Transition
+
+# Сколько элементов собирать в один кусок ответа
+CHUNK_SIZE = 1024
+
+# Уровень сжатия gzip: быстрый, выигрыш на длинных однотипных массивах и так большой
+GZIP_LEVEL = 5
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _iter_array(items, chunk_size=CHUNK_SIZE):
+    """JSON-массив по кускам: в памяти одновременно не больше chunk_size элементов."""
+    yield "["
+    buffer = []
+    first = True
+    for item in items:
+        buffer.append(_dumps(item))
+        if len(buffer) >= chunk_size:
+            yield ("" if first else ",") + ",".join(buffer)
+            first = False
+            buffer = []
+    if buffer:
+        yield ("" if first else ",") + ",".join(buffer)
+    yield "]"
+
+
+def iter_dfa_json(dfa: DFA, chunk_size: int = CHUNK_SIZE):
+    """
+    Потоковый вариант dfa_to_json: тот же JSON, но по кускам.
+
+    Список словарей целиком не строится — состояния и переходы сериализуются
+    по chunk_size штук, так что первый байт уходит клиенту сразу.
+    """
+    yield '{"states":'
+    yield from _iter_array(({"name": s.name, "is_final": s.is_final} for s in dfa.states), chunk_size)
+    yield ',"transitions":'
+    yield from _iter_array(({"source": t.source.name, "symbol": t.symbol, "target": t.target.name}
+                            for t in dfa.transitions), chunk_size)
+    yield f',"alphabet":{_dumps(sorted(dfa.alphabet))}'
+    yield f',"start_state":{_dumps(dfa.start_state.name if dfa.start_state else None)}}}'
+
+
+def iter_dfa_columnar(dfa: DFA, chunk_size: int = CHUNK_SIZE):
+    """
+    Компактный колоночный JSON.
+
+    Имена состояний и символы перечисляются один раз, а переходы задаются
+    тремя параллельными массивами индексов source/symbol/target:
+
+        {"format": "columnar", "states": [...], "finals": [0/1, ...],
+         "alphabet": [...], "start": индекс или null,
+         "source": [...], "symbol": [...], "target": [...]}
+    """
+    states = sorted(dfa.states, key=lambda s: s.name)
+    index = {state: idx for idx, state in enumerate(states)}
+    alphabet = sorted(dfa.alphabet)
+    columns = {symbol: idx for idx, symbol in enumerate(alphabet)}
+    transitions = sorted(dfa.transitions, key=lambda t: (index[t.source], columns[t.symbol]))
+
+    yield '{"format":"columnar","states":'
+    yield from _iter_array((s.name for s in states), chunk_size)
+    yield ',"finals":'
+    yield from _iter_array((int(s.is_final) for s in states), chunk_size)
+    yield f',"alphabet":{_dumps(alphabet)}'
+    yield f',"start":{_dumps(index[dfa.start_state] if dfa.start_state else None)}'
+    for name, column in (("source", lambda t: index[t.source]),
+                         ("symbol", lambda t: columns[t.symbol]),
+                         ("target", lambda t: index[t.target])):
+        yield f',"{name}":'
+        yield from _iter_array((column(t) for t in transitions), chunk_size)
+    yield "}"
+
+
+def dfa_from_columnar(data: dict) -> DFA:
+    """Обратное преобразование колоночного JSON в DFA."""
+    states = [State(name, is_final=bool(final)) for name, final in zip(data["states"], data["finals"])]
+    alphabet = data["alphabet"]
+    transitions = {Transition(states[s], alphabet[a], states[t])
+                   for s, a, t in zip(data["source"], data["symbol"], data["target"])}
+    start = data["start"]
+    return DFA(
+        states=set(states),
+        alphabet=set(alphabet),
+        transitions=transitions,
+        start_state=states[start] if start is not None else None,
+    )
+
+
+def gzip_chunks(chunks, level: int = GZIP_LEVEL):
+    """Сжимает поток текстовых кусков в gzip, не собирая ответ целиком."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 — формат gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
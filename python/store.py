@@ -0,0 +1,232 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from models import DFA
+from util import canonical_form, dfa_digest, dfa_from_canonical
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minimized (
+    digest TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS minimized_accessed ON minimized (accessed);
+CREATE TABLE IF NOT EXISTS verdicts (
+    op TEXT NOT NULL,
+    left_digest TEXT NOT NULL,
+    right_digest TEXT NOT NULL,
+    verdict INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (op, left_digest, right_digest)
+);
+CREATE INDEX IF NOT EXISTS verdicts_accessed ON verdicts (accessed);
+"""
+
+# Операции, для которых порядок аргументов не важен
+SYMMETRIC_OPS = {"equivalent"}
+
+# Сколько обращений копить в памяти, прежде чем записать их время в SQLite
+TOUCH_BATCH = 100
+
+
+def encode_dfa(dfa: DFA) -> bytes:
+    """Компактная форма ДКА: каноническая нумерация состояний, JSON и zlib."""
+    alphabet, finals, rows = canonical_form(dfa)
+    payload = json.dumps([alphabet, [int(f) for f in finals], rows], separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(payload.encode("utf-8"))
+
+
+def decode_dfa(blob: bytes) -> DFA:
+    alphabet, finals, rows = json.loads(zlib.decompress(blob).decode("utf-8"))
+    return dfa_from_canonical(alphabet, finals, rows)
+
+
+class ResultStore:
+    """
+    Персистентное хранилище результатов в SQLite, ключ — канонический дайджест ДКА.
+
+    Хранит минимизированные ДКА и вердикты для пар (эквивалентность, пустота разности).
+    Перед SQLite стоит LRU в памяти процесса, поэтому повторные запросы не ходят на диск.
+    База открывается в режиме WAL: её можно делить между несколькими процессами на одной машине.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, memory_entries: int = 10_000, warm: bool = False):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._writes = 0
+        self._touched = {}  # ключ -> время последнего обращения, ещё не записанное в SQLite
+        with self._lock:
+            self._connection().executescript(SCHEMA)
+        if warm:
+            self.warm()
+
+    def _connection(self):
+        # После fork соединение SQLite наследовать нельзя — открываем своё
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._conn
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _touch(self, key):
+        # Вытеснение идёт по accessed, поэтому каждое попадание (и в памяти тоже) его обновляет;
+        # записи на диск копятся и уходят одной транзакцией
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush_touches()
+
+    def _flush_touches(self):
+        if not self._touched:
+            return
+        minimized = [(accessed, key[1]) for key, accessed in self._touched.items() if len(key) == 2]
+        verdicts = [(accessed, *key) for key, accessed in self._touched.items() if len(key) == 3]
+        self._touched.clear()
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("UPDATE minimized SET accessed = ? WHERE digest = ?", minimized)
+            conn.executemany(
+                "UPDATE verdicts SET accessed = ? WHERE op = ? AND left_digest = ? AND right_digest = ?",
+                verdicts)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get_minimized(self, digest: str) -> DFA | None:
+        key = ("minimized", digest)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                return self._memory[key]
+            row = self._connection().execute(
+                "SELECT payload FROM minimized WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                return None
+            self._touch(key)
+            dfa = decode_dfa(row[0])
+            self._remember(key, dfa)
+            return dfa
+
+    def put_minimized(self, digest: str, dfa: DFA):
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO minimized (digest, payload, accessed) VALUES (?, ?, ?)",
+                (digest, encode_dfa(dfa), time.time()))
+            self._remember(("minimized", digest), dfa)
+            self._after_write()
+
+    def get_verdict(self, op: str, left: str, right: str) -> bool | None:
+        left, right = self._order(op, left, right)
+        key = (op, left, right)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                return self._memory[key]
+            row = self._connection().execute(
+                "SELECT verdict FROM verdicts WHERE op = ? AND left_digest = ? AND right_digest = ?",
+                key).fetchone()
+            if row is None:
+                return None
+            self._touch(key)
+            verdict = bool(row[0])
+            self._remember(key, verdict)
+            return verdict
+
+    def put_verdict(self, op: str, left: str, right: str, verdict: bool):
+        left, right = self._order(op, left, right)
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO verdicts (op, left_digest, right_digest, verdict, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (op, left, right, int(verdict), time.time()))
+            self._remember((op, left, right), verdict)
+            self._after_write()
+
+    def warm(self, limit: int | None = None):
+        """Загружает в память последние использованные записи."""
+        limit = limit or self.memory_entries
+        with self._lock:
+            conn = self._connection()
+            for digest, payload in conn.execute(
+                    "SELECT digest, payload FROM minimized ORDER BY accessed DESC LIMIT ?", (limit,)):
+                self._memory[("minimized", digest)] = decode_dfa(payload)
+            for op, left, right, verdict in conn.execute(
+                    "SELECT op, left_digest, right_digest, verdict FROM verdicts ORDER BY accessed DESC LIMIT ?",
+                    (limit,)):
+                self._memory[(op, left, right)] = bool(verdict)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _after_write(self):
+        # Вытеснение проверяем не на каждой записи, а раз в сотню
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._evict()
+
+    def _evict(self):
+        self._flush_touches()
+        conn = self._connection()
+        for table in ("minimized", "verdicts"):
+            (count,) = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    f"DELETE FROM {table} WHERE rowid IN "
+                    f"(SELECT rowid FROM {table} ORDER BY accessed LIMIT ?)", (excess,))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._flush_touches()
+                self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _order(op, left, right):
+        if op in SYMMETRIC_OPS and right < left:
+            return right, left
+        return left, right
+
+
+def cached_minimize(dfa: DFA, store: ResultStore | None, minimize):
+    """Минимизирует через хранилище: при попадании минимизация не выполняется."""
+    if store is None:
+        return minimize(dfa)
+    digest = dfa_digest(dfa)
+    minimized = store.get_minimized(digest)
+    if minimized is None:
+        minimized = minimize(dfa)
+        store.put_minimized(digest, minimized)
+    return minimized
+
+
+def cached_verdict(op: str, dfa1: DFA, dfa2: DFA, store: ResultStore | None, compute) -> bool:
+    """Вычисляет вердикт compute(dfa1, dfa2) с кешированием по паре дайджестов."""
+    if store is None:
+        return compute(dfa1, dfa2)
+    left, right = dfa_digest(dfa1), dfa_digest(dfa2)
+    verdict = store.get_verdict(op, left, right)
+    if verdict is None:
+        verdict = compute(dfa1, dfa2)
+        store.put_verdict(op, left, right, verdict)
+    return verdict
@@ -0,0 +1,326 @@
+from bisect import bisect_right
+from collections import deque
+
+from difference import is_difference_final
+from metrics import registry as metrics
+from models import DFA, State, Transition
+
+
+class IntervalSet:
+    """
+    Предикат над алфавитом битовых векторов: множество чисел 0..2^k-1,
+    заданное отсортированными непересекающимися полуинтервалами [lo, hi).
+
+    Представление каноническое (соседние интервалы склеены), поэтому равные
+    множества равны и как объекты — их можно класть в множества и ключи словарей.
+    Биты вектора нумеруются от старшего: условия на старшие биты дают мало интервалов.
+    """
+
+    __slots__ = ("intervals", "_hash")
+
+    def __init__(self, intervals=()):
+        merged = []
+        for lo, hi in sorted(intervals):
+            if lo >= hi:
+                continue
+            if merged and lo <= merged[-1][1]:
+                if hi > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], hi)
+            else:
+                merged.append((lo, hi))
+        object.__setattr__(self, "intervals", tuple(merged))
+        object.__setattr__(self, "_hash", hash(self.intervals))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("IntervalSet неизменяем")
+
+    def __reduce__(self):
+        return IntervalSet, (self.intervals,)
+
+    @classmethod
+    def range(cls, lo: int, hi: int):
+        """Полуинтервал [lo, hi)."""
+        return cls([(lo, hi)])
+
+    @classmethod
+    def single(cls, value: int):
+        return cls([(value, value + 1)])
+
+    @classmethod
+    def bit(cls, bits: int, index: int, value: bool = True):
+        """Векторы длины bits, у которых бит index (0 — старший) равен value."""
+        step = 1 << (bits - 1 - index)
+        start = step if value else 0
+        return cls((lo, lo + step) for lo in range(start, 1 << bits, 2 * step))
+
+    def __or__(self, other):
+        return IntervalSet(self.intervals + other.intervals)
+
+    def __and__(self, other):
+        result = []
+        i = j = 0
+        a, b = self.intervals, other.intervals
+        while i < len(a) and j < len(b):
+            lo, hi = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+            if lo < hi:
+                result.append((lo, hi))
+            if a[i][1] < b[j][1]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(result)
+
+    def complement(self, size: int):
+        """Дополнение до [0, size)."""
+        result = []
+        previous = 0
+        for lo, hi in self.intervals:
+            result.append((previous, lo))
+            previous = hi
+        result.append((previous, size))
+        return IntervalSet(result)
+
+    def __sub__(self, other):
+        if not self or not other:
+            return self
+        return self & other.complement(self.intervals[-1][1])
+
+    def __bool__(self):
+        return bool(self.intervals)
+
+    def __contains__(self, value: int):
+        idx = bisect_right(self.intervals, (value, float("inf"))) - 1
+        return idx >= 0 and self.intervals[idx][0] <= value < self.intervals[idx][1]
+
+    def __len__(self):
+        return sum(hi - lo for lo, hi in self.intervals)
+
+    def pick(self) -> int:
+        """Наименьший элемент непустого множества."""
+        return self.intervals[0][0]
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.intervals == other.intervals
+
+    def __hash__(self):
+        return self._hash
+
+    def __lt__(self, other):
+        return self.intervals < other.intervals
+
+    def __repr__(self):
+        return "{" + ",".join(f"{lo}" if hi == lo + 1 else f"{lo}..{hi - 1}" for lo, hi in self.intervals) + "}"
+
+
+class SymbolicDFA:
+    """
+    ДКА над алфавитом битовых векторов длины bits, переходы помечены предикатами.
+
+    edges[состояние] — кортеж пар (IntervalSet, цель); предикаты одного
+    состояния не пересекаются. Символы, не покрытые ни одним предикатом, —
+    отсутствующие переходы, как в обычном DFA.
+    """
+
+    __slots__ = ("bits", "states", "edges", "start_state")
+
+    def __init__(self, bits: int, states, edges: dict, start_state: State | None):
+        self.bits = bits
+        self.states = frozenset(states)
+        self.edges = {state: tuple(edges.get(state, ())) for state in self.states}
+        self.start_state = start_state
+
+    @property
+    def size(self) -> int:
+        """Число символов алфавита, 2^bits."""
+        return 1 << self.bits
+
+    def get_next_state(self, state: State, symbol: int) -> State | None:
+        for predicate, target in self.edges.get(state, ()):
+            if symbol in predicate:
+                return target
+        return None
+
+    def check_word(self, word) -> bool:
+        """word — последовательность чисел-векторов."""
+        state = self.start_state
+        for symbol in word:
+            if state is None:
+                return False
+            state = self.get_next_state(state, symbol)
+        return state is not None and state.is_final
+
+    def completed(self, sink_name: str = "⊥"):
+        """Копия, где непокрытые символы ведут в поглощающее нефинальное состояние."""
+        sink = State(sink_name, is_final=False)
+        edges = {}
+        needs_sink = False
+        for state in self.states:
+            covered = IntervalSet()
+            for predicate, _ in self.edges[state]:
+                covered = covered | predicate
+            rest = covered.complement(self.size)
+            edges[state] = self.edges[state] + (((rest, sink),) if rest else ())
+            needs_sink = needs_sink or bool(rest)
+        if not needs_sink:
+            return self
+        edges[sink] = ((IntervalSet.range(0, self.size), sink),)
+        return SymbolicDFA(self.bits, self.states | {sink}, edges, self.start_state)
+
+
+def encode_symbol(value: int, bits: int) -> str:
+    """Число-вектор -> символ явного алфавита вида '0101' (старший бит первым)."""
+    return format(value, f"0{bits}b")
+
+
+def from_dfa(dfa: DFA, bits: int) -> SymbolicDFA:
+    """Символьный ДКА из явного; символы явного алфавита — строки из bits нулей и единиц."""
+    groups = {}
+    for t in dfa.transitions:
+        value = int(t.symbol, 2)
+        groups.setdefault(t.source, {}).setdefault(t.target, []).append((value, value + 1))
+    edges = {source: tuple((IntervalSet(intervals), target) for target, intervals in by_target.items())
+             for source, by_target in groups.items()}
+    return SymbolicDFA(bits, dfa.states, edges, dfa.start_state)
+
+
+def to_dfa(sdfa: SymbolicDFA) -> DFA:
+    """Явный ДКА; перечисляет все 2^bits символов — только для небольших bits."""
+    transitions = {
+        Transition(source, encode_symbol(value, sdfa.bits), target)
+        for source, edges in sdfa.edges.items()
+        for predicate, target in edges
+        for lo, hi in predicate.intervals
+        for value in range(lo, hi)
+    }
+    alphabet = {encode_symbol(value, sdfa.bits) for value in range(sdfa.size)}
+    return DFA(set(sdfa.states), alphabet, transitions, sdfa.start_state)
+
+
+def find_accepted_word(sdfa: SymbolicDFA) -> list[int] | None:
+    """Кратчайшее принимаемое слово (список векторов) или None для пустого языка."""
+    if sdfa.start_state is None:
+        return None
+    parents = {sdfa.start_state: None}
+    queue = deque([sdfa.start_state])
+    while queue:
+        state = queue.popleft()
+        if state.is_final:
+            word = []
+            while parents[state] is not None:
+                state, symbol = parents[state]
+                word.append(symbol)
+            return word[::-1]
+        for predicate, target in sdfa.edges[state]:
+            if predicate and target not in parents:
+                parents[target] = (state, predicate.pick())
+                queue.append(target)
+    return None
+
+
+def is_empty(sdfa: SymbolicDFA) -> bool:
+    return find_accepted_word(sdfa) is None
+
+
+def product(sdfa1: SymbolicDFA, sdfa2: SymbolicDFA, is_final=is_difference_final, budget=None) -> SymbolicDFA:
+    """
+    Автомат на парах состояний: предикат перехода пары — пересечение предикатов
+    компонент. Недостающие переходы ведут в ⊥1/⊥2, как в difference.build_pair_automaton.
+    """
+    if sdfa1.bits != sdfa2.bits:
+        raise ValueError("Автоматы над алфавитами разной разрядности")
+    if sdfa1.start_state is None or sdfa2.start_state is None:
+        raise ValueError("В одном из автоматов отсутствует стартовое состояние!")
+    first, second = sdfa1.completed("⊥1"), sdfa2.completed("⊥2")
+
+    def pair_state(pair):
+        if pair not in states:
+            states[pair] = State(f"({pair[0].name},{pair[1].name})", is_final(*pair))
+            queue.append(pair)
+        return states[pair]
+
+    with metrics.timer("symbolic_product"):
+        states = {}
+        edges = {}
+        queue = deque()
+        start = pair_state((first.start_state, second.start_state))
+        while queue:
+            q1, q2 = pair = queue.popleft()
+            if budget is not None:
+                budget.charge(states=1, transitions=len(first.edges[q1]) * len(second.edges[q2]))
+            edges[states[pair]] = tuple(
+                (predicate, pair_state((t1, t2)))
+                for p1, t1 in first.edges[q1]
+                for p2, t2 in second.edges[q2]
+                if (predicate := p1 & p2)
+            )
+        metrics.observe("dfa_product_states_explored", len(states), operation="symbolic_product")
+    return SymbolicDFA(sdfa1.bits, states.values(), edges, start)
+
+
+def minimize(sdfa: SymbolicDFA, budget=None) -> SymbolicDFA:
+    """
+    Минимизация без перебора символов: раунды Мура, где сигнатура состояния —
+    его блок и множество пар (блок цели, объединение предикатов в этот блок).
+    Как и minimize_dfa, удаляет недостижимые и мёртвые состояния.
+    """
+    if sdfa.start_state is None:
+        return sdfa
+    with metrics.timer("symbolic_minimize"):
+        complete = sdfa.completed()
+        reachable = {complete.start_state}
+        queue = deque(reachable)
+        while queue:
+            for _, target in complete.edges[queue.popleft()]:
+                if target not in reachable:
+                    reachable.add(target)
+                    queue.append(target)
+
+        def grouped(state):
+            by_block = {}
+            for predicate, target in complete.edges[state]:
+                block = blocks[target]
+                by_block[block] = by_block[block] | predicate if block in by_block else predicate
+            return by_block
+
+        blocks = {state: int(state.is_final) for state in reachable}
+        count = len(set(blocks.values()))
+        while True:
+            if budget is not None:
+                budget.next_round("symbolic_refine")
+            signatures = {}
+            refined = {}
+            for state in reachable:
+                signature = (blocks[state], frozenset(grouped(state).items()))
+                refined[state] = signatures.setdefault(signature, len(signatures))
+            blocks = refined
+            if len(signatures) == count:
+                break
+            count = len(signatures)
+
+        representatives = {}
+        for state in reachable:
+            representatives.setdefault(blocks[state], state)
+        # Мёртвый блок — нефинальный, все переходы которого ведут в него же
+        dead = next((block for block, state in representatives.items()
+                     if not state.is_final and set(grouped(state)) == {block}), None)
+        if blocks[complete.start_state] == dead:
+            return SymbolicDFA(sdfa.bits, (), {}, None)
+
+        # Нумерация блоков обходом в ширину от стартового
+        order = {blocks[complete.start_state]: 0}
+        queue = deque(order)
+        while queue:
+            for block in sorted(grouped(representatives[queue.popleft()])):
+                if block != dead and block not in order:
+                    order[block] = len(order)
+                    queue.append(block)
+        states = {block: State(f"S{idx}", representatives[block].is_final) for block, idx in order.items()}
+        edges = {
+            states[block]: tuple(sorted(((predicate, states[target])
+                                         for target, predicate in grouped(representatives[block]).items()
+                                         if target != dead), key=lambda edge: edge[0]))
+            for block in order
+        }
+        result = SymbolicDFA(sdfa.bits, states.values(), edges, states[blocks[complete.start_state]])
+        metrics.observe("dfa_output_states", len(result.states), operation="symbolic_minimize")
+    return result
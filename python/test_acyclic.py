@@ -0,0 +1,59 @@
+import random
+
+import pytest
+from acyclic import AcyclicDFABuilder, dfa_from_sorted_words
+from equivalency import are_equivalent
+from minimize import minimize_dfa
+from models import DFA, State, Transition
+
+
+def trie_dfa(words):
+    """Наивный вариант: бор в виде ДКА без минимизации."""
+    root = State("", is_final="" in words)
+    states = {"": root}
+    transitions = set()
+    for word in words:
+        for i in range(1, len(word) + 1):
+            prefix = word[:i]
+            if prefix not in states:
+                states[prefix] = State(prefix, is_final=prefix in words)
+            transitions.add(Transition(states[word[:i - 1]], word[i - 1], states[prefix]))
+    alphabet = {symbol for word in words for symbol in word}
+    return DFA(set(states.values()), alphabet, transitions, root)
+
+
+def test_matches_minimized_trie():
+    rng = random.Random(0)
+    words = sorted({"".join(rng.choice("abc") for _ in range(rng.randint(0, 7))) for _ in range(300)})
+
+    built = dfa_from_sorted_words(words)
+    expected = minimize_dfa(trie_dfa(set(words)))
+
+    assert len(built.states) == len(expected.states)
+    assert are_equivalent(built, expected)
+    for word in words:
+        assert built.check_word(word)
+    assert not built.check_word("abcabcabc")
+
+
+def test_shared_suffixes_are_merged():
+    words = ["cats", "dogs", "hats", "rats"]
+    builder = AcyclicDFABuilder()
+    for word in words:
+        builder.add(word)
+    builder.finish()
+    # корень, {c,h,r}->a->t->s, d->o->g->s: суффикс "s" и финальное состояние общие
+    assert builder.state_count == 7
+
+
+def test_duplicates_and_order():
+    assert len(dfa_from_sorted_words(["a", "a", "b"]).states) == 2
+    with pytest.raises(ValueError):
+        dfa_from_sorted_words(["b", "a"])
+
+
+def test_compact_form():
+    alphabet, finals, rows = dfa_from_sorted_words(["", "ab"], compact=True)
+    assert alphabet == ("a", "b")
+    assert finals == (True, False, True)
+    assert rows == ((1, -1), (-1, 2), (-1, -1))
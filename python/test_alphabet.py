@@ -0,0 +1,64 @@
+import string
+
+from alphabet import SymbolClasses, compress_dfa, expand_dfa, range_label
+from equivalency import are_equivalent
+from final_state import has_reachable_final_state
+from minimize import minimize_dfa
+from models import DFA, State, Transition
+
+
+def make_identifier_dfa():
+    # Язык: буква, затем любые буквы и цифры
+    start = State("start")
+    ident = State("ident", is_final=True)
+    alphabet = set(string.ascii_lowercase + string.digits + " ")
+    transitions = {Transition(start, c, ident) for c in string.ascii_lowercase}
+    transitions |= {Transition(ident, c, ident) for c in string.ascii_lowercase + string.digits}
+    return DFA({start, ident}, alphabet, transitions, start)
+
+
+def test_range_label():
+    assert range_label({"a", "b", "c", "x"}) == "a-c,x"
+    assert range_label(set("0123456789")) == "0-9"
+    assert range_label({"a", "b", "eps"}) == "a,b,eps"
+
+
+def test_classes_group_identical_columns():
+    classes = SymbolClasses.from_dfas(make_identifier_dfa())
+
+    assert len(classes) == 3
+    assert classes.representative["b"] == classes.representative["z"]
+    assert classes.representative["0"] != classes.representative["a"]
+    assert classes.label("q") == "a-z"
+    assert classes.label("5") == "0-9"
+    assert classes.label(" ") == " "
+
+
+def test_compress_expand_roundtrip():
+    dfa = make_identifier_dfa()
+    classes = SymbolClasses.from_dfas(dfa)
+    compressed = compress_dfa(dfa, classes)
+
+    assert len(compressed.alphabet) == 3
+    expanded = expand_dfa(compressed, classes)
+    assert expanded.transitions == dfa.transitions
+    assert expanded.alphabet == dfa.alphabet
+
+
+def test_algorithms_over_classes_keep_full_alphabet():
+    dfa = make_identifier_dfa()
+    minimized = minimize_dfa(dfa)
+
+    assert len(minimized.states) == 2
+    assert minimized.alphabet == dfa.alphabet
+    assert minimized.check_word("abc123")
+    assert not minimized.check_word("1abc")
+    assert has_reachable_final_state(minimized)
+    assert are_equivalent(dfa, minimized)
+
+
+def test_explicit_classes_are_used_even_if_empty():
+    dfa = make_identifier_dfa()
+    assert has_reachable_final_state(dfa, SymbolClasses.from_dfas(dfa))
+    # Пустой набор классов ложен (len == 0), но переданный явно не должен подменяться
+    assert not has_reachable_final_state(dfa, SymbolClasses([]))
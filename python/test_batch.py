@@ -0,0 +1,60 @@
+import json
+
+from dfal import process_job, run_batch
+
+DFA_A_PLUS = {"states": {"s0": False, "s1": True}, "alphabet": ["a"],
+              "transitions": [["s0", "a", "s1"], ["s1", "a", "s1"]], "start": "s0"}
+DFA_A = {"states": {"q0": False, "q1": True}, "alphabet": ["a"],
+         "transitions": [["q0", "a", "q1"]], "start": "q0"}
+
+
+def make_jobs(count):
+    ops = ["minimize", "equivalent", "difference", "product"]
+    for i in range(count):
+        op = ops[i % len(ops)]
+        dfas = [DFA_A_PLUS] if op == "minimize" else [DFA_A_PLUS, DFA_A]
+        yield json.dumps({"id": i, "op": op, "dfas": dfas})
+
+
+def test_process_job_uses_both_operands():
+    result = json.loads(process_job(json.dumps({"id": "x", "op": "equivalent", "dfas": [DFA_A_PLUS, DFA_A]})))
+    assert result == {"id": "x", "result": False}
+
+    result = json.loads(process_job(json.dumps({"id": "y", "op": "equivalent", "dfas": [DFA_A, DFA_A]})))
+    assert result == {"id": "y", "result": True}
+
+
+def test_process_job_reports_errors():
+    result = json.loads(process_job(json.dumps({"id": 7, "op": "minimize", "dfas": [DFA_A, DFA_A]})))
+    assert result["id"] == 7
+    assert "error" in result
+    assert "error" in json.loads(process_job("not json"))
+
+
+def test_malformed_jobs_do_not_stop_batch():
+    no_start = {"states": {"q0": True}, "alphabet": ["a"], "transitions": [], "start": None}
+    lines = ["[1, 2]", json.dumps({"id": "n", "op": "minimize", "dfas": [no_start]}),
+             json.dumps({"id": "ok", "op": "minimize", "dfas": [DFA_A]})]
+    out = []
+    run_batch(lines, out.append)
+    results = [json.loads(line) for line in out]
+    assert len(results) == 3
+    assert results[0] == {"id": None, "error": results[0]["error"]}
+    assert results[1]["id"] == "n" and results[1]["result"]["start"] is None
+    assert results[2]["id"] == "ok" and "result" in results[2]
+
+
+def test_batch_preserves_order_across_workers():
+    sequential, parallel = [], []
+    run_batch(make_jobs(30), sequential.append)
+    run_batch(make_jobs(30), parallel.append, workers=2)
+
+    assert [json.loads(line)["id"] for line in parallel] == list(range(30))
+    verdicts = [json.loads(line)["result"] for line in parallel[1::4]]
+    assert verdicts == [json.loads(line)["result"] for line in sequential[1::4]]
+
+
+def test_batch_unordered_returns_every_job():
+    out = []
+    run_batch(make_jobs(30), out.append, workers=2, ordered=False)
+    assert sorted(json.loads(line)["id"] for line in out) == list(range(30))
@@ -0,0 +1,74 @@
+import pytest
+from budget import Budget, BudgetExceeded, CancellationToken, InvalidLimits, merge_limits
+from difference import build_product_automaton
+from equivalency import are_equivalent
+from minimize import minimize_dfa
+from models import DFA, State, Transition
+
+
+def make_counter_dfa(n, prefix):
+    # Считает символы 'a' по модулю n
+    states = [State(f"{prefix}{i}", is_final=(i == 0)) for i in range(n)]
+    transitions = {Transition(states[i], "a", states[(i + 1) % n]) for i in range(n)}
+    return DFA(set(states), {"a"}, transitions, states[0])
+
+
+def test_product_stops_at_state_limit():
+    with pytest.raises(BudgetExceeded) as error:
+        build_product_automaton(make_counter_dfa(7, "p"), make_counter_dfa(11, "q"), Budget(max_states=20))
+    assert error.value.reason == "states"
+    assert error.value.stats["states_explored"] == 21
+    assert error.value.stats["stage"] == "product"
+
+
+def test_cancelled_token_stops_minimization():
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(BudgetExceeded) as error:
+        minimize_dfa(make_counter_dfa(5, "s"), Budget(token=token))
+    assert error.value.reason == "cancelled"
+    assert error.value.stats["stage"] == "refine"
+
+
+def test_cancellation_is_checked_inside_large_block():
+    token = CancellationToken()
+    # Отмена приходит в начале первого раунда; весь раунд — один блок из 999 нефинальных состояний
+    budget = Budget(token=token, on_progress=lambda stats: token.cancel())
+    with pytest.raises(BudgetExceeded) as error:
+        minimize_dfa(make_counter_dfa(1000, "s"), budget)
+    assert error.value.reason == "cancelled"
+    assert error.value.stats["rounds"] == 1
+
+
+def test_deadline():
+    with pytest.raises(BudgetExceeded) as error:
+        are_equivalent(make_counter_dfa(5, "s"), make_counter_dfa(5, "t"), Budget(timeout=-1))
+    assert error.value.reason == "deadline"
+
+
+def test_generous_budget_does_not_change_result():
+    budget = Budget(max_states=10_000, max_transitions=10_000, timeout=60)
+    assert are_equivalent(make_counter_dfa(3, "s"), make_counter_dfa(6, "t"), budget) is False
+    assert budget.states > 0 and budget.rounds > 0
+
+
+def test_merge_limits_takes_smaller():
+    assert merge_limits({"max_states": "100", "timeout": None}, {"max_states": 500, "timeout": "2.5"}) == {
+        "max_states": 100, "timeout": 2.5,
+    }
+
+
+def test_merge_limits_rejects_invalid_values():
+    for requested in ({"timeout": "abc"}, {"max_states": "1.5"}, {"max_transitions": -1}, {"timeout": "nan"}, [1]):
+        with pytest.raises(InvalidLimits):
+            merge_limits({}, requested)
+
+
+def test_invalid_limits_are_bad_request():
+    pytest.importorskip("flask")
+    from main import app
+
+    empty = {"states": [], "alphabet": [], "transitions": [], "start_state": None}
+    response = app.test_client().post("/minimize?timeout=abc", json=empty)
+    assert response.status_code == 400
+    assert "timeout" in response.get_json()["error"]
@@ -0,0 +1,75 @@
+import itertools
+import re
+
+from closure import concatenation, left_quotient, reversal, right_quotient, star
+from minimize import minimize_dfa
+from util import canonical_form, dfa_from_string
+
+
+def words(max_length, alphabet="ab"):
+    for length in range(max_length + 1):
+        for letters in itertools.product(alphabet, repeat=length):
+            yield "".join(letters)
+
+
+def make_ab():
+    # Язык {ab}
+    return dfa_from_string({
+        'states': {'a0': False, 'a1': False, 'a2': True},
+        'alphabet': {'a', 'b'},
+        'start': 'a0',
+        'transitions': {('a0', 'a'): 'a1', ('a1', 'b'): 'a2'}
+    })
+
+
+def make_odd_b():
+    # Слова с нечётным числом b
+    return dfa_from_string({
+        'states': {'e': False, 'o': True},
+        'alphabet': {'a', 'b'},
+        'start': 'e',
+        'transitions': {('e', 'a'): 'e', ('e', 'b'): 'o', ('o', 'a'): 'o', ('o', 'b'): 'e'}
+    })
+
+
+def assert_language(dfa, predicate, max_length=7):
+    for word in words(max_length):
+        assert dfa.check_word(word) == predicate(word), word
+
+
+def assert_minimal(dfa):
+    assert len(dfa.states) == len(minimize_dfa(dfa).states)
+
+
+def test_concatenation():
+    ab, odd = make_ab(), make_odd_b()
+    result = concatenation(ab, odd)
+    assert_language(result, lambda w: w.startswith("ab") and w[2:].count("b") % 2 == 1)
+    assert_minimal(result)
+    result = concatenation(odd, ab)
+    assert_language(result, lambda w: w.endswith("ab") and w[:-2].count("b") % 2 == 1)
+    assert_minimal(result)
+
+
+def test_star_and_reversal():
+    result = star(make_ab())
+    assert_language(result, lambda w: re.fullmatch("(ab)*", w) is not None)
+    assert_minimal(result)
+
+    result = reversal(make_ab())
+    assert_language(result, lambda w: w == "ba")
+    assert canonical_form(reversal(reversal(make_odd_b()))) == canonical_form(minimize_dfa(make_odd_b()))
+
+
+def test_quotients():
+    ab, odd = make_ab(), make_odd_b()
+    result = right_quotient(ab, star(ab))
+    assert_language(result, lambda w: w in ("", "ab"))
+    assert_language(right_quotient(odd, ab), lambda w: w.count("b") % 2 == 0)
+    assert_language(left_quotient(ab, concatenation(ab, odd)), lambda w: w.count("b") % 2 == 1)
+
+
+def test_empty_operands():
+    empty = dfa_from_string({'states': {'z': False}, 'alphabet': {'a', 'b'}, 'start': 'z', 'transitions': {}})
+    assert concatenation(make_ab(), empty).start_state is None
+    assert_language(star(empty), lambda w: w == "")
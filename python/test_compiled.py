@@ -0,0 +1,56 @@
+import random
+
+from compiled import compile_dfa
+from minimize import minimize_dfa
+from util import dfa_digest, dfa_from_string
+
+
+def make_even_a_dfa(prefix="s"):
+    # Язык: слова над {a, b} с чётным числом 'a'
+    return dfa_from_string({
+        'states': {f'{prefix}0': True, f'{prefix}1': False},
+        'alphabet': {'a', 'b'},
+        'start': f'{prefix}0',
+        'transitions': {
+            (f'{prefix}0', 'a'): f'{prefix}1', (f'{prefix}1', 'a'): f'{prefix}0',
+            (f'{prefix}0', 'b'): f'{prefix}0', (f'{prefix}1', 'b'): f'{prefix}1',
+        }
+    })
+
+
+def test_digest_ignores_state_names():
+    assert dfa_digest(make_even_a_dfa("s")) == dfa_digest(make_even_a_dfa("q"))
+    assert dfa_digest(make_even_a_dfa()) != dfa_digest(minimize_dfa(dfa_from_string({
+        'states': {'s0': False, 's1': True},
+        'alphabet': {'a', 'b'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1'}
+    })))
+
+
+def test_compiled_matches_like_dfa():
+    dfa = make_even_a_dfa()
+    matcher = compile_dfa(dfa)
+    rng = random.Random(0)
+    words = ["", "a", "aa", "ab", "bab", "abc"] + [
+        "".join(rng.choice("ab") for _ in range(rng.randint(0, 30))) for _ in range(200)
+    ]
+    for word in words:
+        assert matcher.check_word(word) == dfa.check_word(word), word
+
+
+def test_compiled_cache_by_digest():
+    assert compile_dfa(make_even_a_dfa("s")) is compile_dfa(make_even_a_dfa("q"))
+
+
+def test_compiled_rejects_through_dead_state():
+    dfa = dfa_from_string({
+        'states': {'s0': False, 's1': True, 'dead': False},
+        'alphabet': {'a', 'b'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s0', 'b'): 'dead', ('dead', 'a'): 'dead', ('dead', 'b'): 'dead'}
+    })
+    matcher = compile_dfa(dfa)
+    assert matcher.check_word("a")
+    assert not matcher.check_word("b" + "a" * 1000)
+    assert matcher.state_count == 2
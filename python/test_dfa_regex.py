@@ -0,0 +1,89 @@
+import itertools
+import re
+import time
+
+from dfa_regex import RegexBuilder, dfa_to_regex
+from models import DFA, State, Transition
+from util import dfa_from_string
+
+
+def words(alphabet, max_length):
+    for length in range(max_length + 1):
+        for letters in itertools.product(sorted(alphabet), repeat=length):
+            yield "".join(letters)
+
+
+def assert_same_language(dfa, regex, max_length=7):
+    pattern = re.compile("" if regex == "ε" else regex)
+    for word in words(dfa.alphabet, max_length):
+        matched = regex != "∅" and pattern.fullmatch(word) is not None
+        assert matched == dfa.check_word(word), (regex, word)
+
+
+def test_simple_languages():
+    even_a = dfa_from_string({
+        'states': {'q0': True, 'q1': False},
+        'alphabet': {'a', 'b'},
+        'start': 'q0',
+        'transitions': {('q0', 'a'): 'q1', ('q1', 'a'): 'q0', ('q0', 'b'): 'q0', ('q1', 'b'): 'q1'}
+    })
+    regex = dfa_to_regex(even_a)
+    assert_same_language(even_a, regex)
+
+    empty = dfa_from_string({'states': {'q': False}, 'alphabet': {'a'}, 'start': 'q', 'transitions': {('q', 'a'): 'q'}})
+    assert dfa_to_regex(empty) == "∅"
+
+
+def test_character_classes():
+    digits = dfa_from_string({
+        'states': {'s': False, 'n': True},
+        'alphabet': set("0123456789"),
+        'start': 's',
+        'transitions': {**{('s', d): 'n' for d in "0123456789"}, **{('n', d): 'n' for d in "0123456789"}}
+    })
+    regex = dfa_to_regex(digits)
+    assert "[0-9]" in regex
+    assert_same_language(digits, regex, max_length=3)
+
+
+def test_hash_consing_shares_nodes():
+    builder = RegexBuilder()
+    a, b = builder.symbol("a"), builder.symbol("b")
+    assert builder.union(a, b) is builder.union(b, a)
+    assert builder.concat(a, builder.epsilon, b) is builder.concat(a, b)
+    assert builder.star(builder.star(a)) is builder.star(a)
+    assert builder.star(builder.union(builder.epsilon, a)) is builder.star(a)
+
+
+def test_divisibility_automaton_stays_practical():
+    # Числа в двоичной записи, делящиеся на n: каждое состояние связано с каждым
+    n = 7
+    dfa = dfa_from_string({
+        'states': {f"r{i}": i == 0 for i in range(n)},
+        'alphabet': {'0', '1'},
+        'start': 'r0',
+        'transitions': {(f"r{i}", bit): f"r{(2 * i + int(bit)) % n}" for i in range(n) for bit in "01"}
+    })
+    started = time.perf_counter()
+    regex = dfa_to_regex(dfa)
+    assert time.perf_counter() - started < 5
+    assert_same_language(dfa, regex, max_length=9)
+
+
+def test_long_chain_is_linear():
+    size = 300
+    dfa = dfa_from_string({
+        'states': {f"c{i}": i == size for i in range(size + 1)},
+        'alphabet': {'a', 'b'},
+        'start': 'c0',
+        'transitions': {(f"c{i}", 'ab'[i % 2]): f"c{i + 1}" for i in range(size)}
+    })
+    assert dfa_to_regex(dfa) == "ab" * (size // 2)
+
+
+def test_equal_weights_and_names_do_not_compare_states():
+    # Без минимизации имена могут повторяться: две вершины "q" с одинаковым весом
+    s, q, q_final = State("s"), State("q"), State("q", is_final=True)
+    dfa = DFA({s, q, q_final}, {"a", "b"}, {Transition(s, "a", q), Transition(q, "b", q_final)}, s)
+    regex = dfa_to_regex(dfa, minimize=False)
+    assert_same_language(dfa, regex)
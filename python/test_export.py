@@ -0,0 +1,84 @@
+import gzip
+import xml.etree.ElementTree as ET
+
+import pytest
+from dfal import write_export
+from export import iter_dot, iter_graphml
+from util import dfa_from_string
+
+
+def make_dfa():
+    digits = "0123456789"
+    transitions = {('s', d): 'n' for d in digits}
+    transitions.update({('n', d): 'n' for d in digits})
+    transitions[('n', 'x')] = 'dead'
+    transitions[('lost', 'a')] = 'n'
+    return dfa_from_string({
+        'states': {'s': False, 'n': True, 'dead': False, 'lost': False},
+        'alphabet': set(digits) | {'x', 'a'},
+        'start': 's',
+        'transitions': transitions
+    })
+
+
+def test_dot_merges_parallel_edges():
+    text = "".join(iter_dot(make_dfa()))
+    assert '"s" -> "n" [label="0-9"];' in text
+    assert '"n" -> "n" [label="0-9"];' in text
+    assert text.count("->") == 1 + 4  # стрелка старта и четыре склеенных ребра
+    assert '"n" [label="n", shape=doublecircle];' in text
+
+
+def test_trim_drops_dead_and_unreachable():
+    text = "".join(iter_dot(make_dfa(), trim=True))
+    assert '"dead"' not in text and '"lost"' not in text
+
+
+def test_graphml_is_well_formed(tmp_path):
+    path = tmp_path / "dfa.graphml"
+    write_export(make_dfa(), "graphml", True, str(path))
+    ns = {"g": "http://graphml.graphdrawing.org/xmlns"}
+    root = ET.parse(path).getroot()
+    assert sorted(node.get("id") for node in root.iterfind(".//g:node", ns)) == ["n", "s"]
+    labels = [edge.find("g:data", ns).text for edge in root.iterfind(".//g:edge", ns)]
+    assert labels == ["0-9", "0-9"]
+    assert "".join(iter_graphml(make_dfa())).count("<edge ") == 4
+
+
+def test_separator_symbols_are_escaped():
+    dfa = dfa_from_string({
+        'states': {'s': False, 'f': True},
+        'alphabet': {',', '-', '.', 'a'},
+        'start': 's',
+        'transitions': {('s', ','): 'f', ('s', '-'): 'f', ('s', '.'): 'f', ('f', '-'): 's', ('f', 'a'): 'f'}
+    })
+    text = "".join(iter_dot(dfa))
+    assert '"s" -> "f" [label="\\\\,-."];' in text  # диапазон от `,` до `.`, в DOT `\` удвоена
+    assert '"f" -> "s" [label="\\\\-"];' in text
+    assert '"f" -> "f" [label="a"];' in text
+
+
+def test_export_endpoint_streams_and_compresses():
+    pytest.importorskip("flask")
+    from main import app
+
+    source = make_dfa()
+    dfa = {
+        "states": [state.to_dict() for state in source.states],
+        "alphabet": sorted(source.alphabet),
+        "transitions": [{"source": t.source.to_dict(), "symbol": t.symbol, "target": t.target.to_dict()}
+                        for t in source.transitions],
+        "start_state": source.start_state.to_dict(),
+    }
+    client = app.test_client()
+
+    response = client.post("/export?format=dot&trim=1", json=dfa)
+    assert response.status_code == 200
+    assert response.mimetype == "text/vnd.graphviz"
+    assert response.get_data(as_text=True) == "".join(iter_dot(make_dfa(), trim=True))
+
+    compressed = client.post("/export?format=graphml", json=dfa, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.get_data()).decode("utf-8") == "".join(iter_graphml(make_dfa()))
+
+    assert client.post("/export?format=svg", json=dfa).status_code == 400
@@ -0,0 +1,42 @@
+import random
+
+from external import TableWriter, load_dfa, minimize_external, write_dfa
+from minimize import minimize_dfa
+from util import canonical_form, dfa_from_string
+
+
+def random_dfa(size, seed):
+    rnd = random.Random(seed)
+    states = {f"s{i}": rnd.random() < 0.3 for i in range(size)}
+    transitions = {(f"s{i}", symbol): f"s{rnd.randrange(size)}"
+                   for i in range(size) for symbol in "abc" if rnd.random() < 0.8}
+    return dfa_from_string({'states': states, 'alphabet': {'a', 'b', 'c'}, 'start': 's0', 'transitions': transitions})
+
+
+def test_matches_in_memory_minimization(tmp_path):
+    for seed in range(10):
+        dfa = random_dfa(40, seed)
+        write_dfa(dfa, tmp_path / f"in{seed}")
+        # Маленькие прогоны, чтобы внешняя сортировка действительно сливала несколько файлов
+        states = minimize_external(str(tmp_path / f"in{seed}"), str(tmp_path / f"out{seed}"), chunk_records=7)
+        result = load_dfa(str(tmp_path / f"out{seed}"))
+        expected = minimize_dfa(dfa)
+        assert states == len(expected.states)
+        assert canonical_form(result) == canonical_form(expected)
+
+
+def test_empty_language_and_streamed_input(tmp_path):
+    writer = TableWriter(str(tmp_path / "in"), ("a",))
+    writer.add_row([1], False)
+    writer.add_row([0], False)
+    writer.close()
+    assert minimize_external(str(tmp_path / "in"), str(tmp_path / "out")) == 0
+    assert load_dfa(str(tmp_path / "out")).start_state is None
+
+
+def test_workdir_is_left_clean(tmp_path):
+    write_dfa(random_dfa(20, 1), tmp_path / "in")
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    minimize_external(str(tmp_path / "in"), str(tmp_path / "out"), workdir=str(workdir), chunk_records=5)
+    assert list(workdir.iterdir()) == []
@@ -0,0 +1,51 @@
+from inclusion import find_uncovered_word, is_included
+from util import dfa_from_string
+
+
+def ends_with(symbol, name):
+    # Слова над {a, b, c}, оканчивающиеся на symbol
+    return dfa_from_string({
+        'states': {f"{name}0": False, f"{name}1": True},
+        'alphabet': {'a', 'b', 'c'},
+        'start': f"{name}0",
+        'transitions': {(f"{name}{i}", s): f"{name}{int(s == symbol)}" for i in range(2) for s in "abc"}
+    })
+
+
+def non_empty():
+    return dfa_from_string({
+        'states': {'n0': False, 'n1': True},
+        'alphabet': {'a', 'b', 'c'},
+        'start': 'n0',
+        'transitions': {(f"n{i}", s): "n1" for i in range(2) for s in "abc"}
+    })
+
+
+def test_union_covers_spec():
+    covers = [ends_with('a', "x"), ends_with('b', "y"), ends_with('c', "z")]
+    assert is_included(non_empty(), covers)
+
+
+def test_uncovered_word_is_shortest_witness():
+    covers = [ends_with('a', "x"), ends_with('b', "y")]
+    word = find_uncovered_word(non_empty(), covers)
+    assert word == "c"
+    assert non_empty().check_word(word)
+    assert not any(b.check_word(word) for b in covers)
+
+
+def test_partial_covers_and_empty_union():
+    only_a = dfa_from_string({
+        'states': {'p0': True},
+        'alphabet': {'a'},
+        'start': 'p0',
+        'transitions': {('p0', 'a'): 'p0'}
+    })
+    spec = dfa_from_string({
+        'states': {'s0': False, 's1': True},
+        'alphabet': {'a', 'b'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s1', 'a'): 's1', ('s1', 'b'): 's1'}
+    })
+    assert find_uncovered_word(spec, [only_a]) == "ab"
+    assert find_uncovered_word(spec, []) == "a"
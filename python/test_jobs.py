@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+from jobs import CANCELLED, DONE, FAILED, Job, JobManager, JobQueueFull
+from minimize import minimize_dfa
+from util import dfa_from_string
+
+
+def make_dfa():
+    return dfa_from_string({
+        'states': {'s0': False, 's1': True, 's2': True},
+        'alphabet': {'a'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s1', 'a'): 's2', ('s2', 'a'): 's1'}
+    })
+
+
+def wait_finished(job, timeout=5):
+    deadline = time.time() + timeout
+    while job.status not in (DONE, FAILED, CANCELLED) and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+
+def slow_operation(release, budget):
+    # Крутится, пока не отпустят, и проверяет бюджет как настоящие алгоритмы
+    while not release.is_set():
+        budget.charge(states=1)
+        time.sleep(0.001)
+    return "ok"
+
+
+def test_job_runs_and_keeps_result():
+    manager = JobManager(workers=1)
+    job = manager.submit(minimize_dfa, (make_dfa(),))
+    assert wait_finished(job) == DONE
+    assert len(manager.get(job.id).result.states) == 2
+    assert job.events and job.events[-1][1]["status"] == DONE
+
+
+def test_cancel_running_job():
+    manager = JobManager(workers=1)
+    release = threading.Event()
+    job = manager.submit(slow_operation, (release,))
+    while job.status != "running":
+        time.sleep(0.01)
+    manager.cancel(job.id)
+    assert wait_finished(job) == CANCELLED
+    assert job.error["reason"] == "cancelled"
+    release.set()
+
+
+def test_limits_fail_job_with_stats():
+    manager = JobManager(workers=1)
+    job = manager.submit(slow_operation, (threading.Event(),), limits={"max_states": 5})
+    assert wait_finished(job) == FAILED
+    assert job.error["reason"] == "states"
+    assert job.progress["states_explored"] == 6
+
+
+def test_bounded_queue_and_ttl():
+    manager = JobManager(workers=1, max_queue=1, ttl=0)
+    release = threading.Event()
+    running = manager.submit(slow_operation, (release,))
+    while running.status != "running":
+        time.sleep(0.01)
+    queued = manager.submit(slow_operation, (release,))
+    with pytest.raises(JobQueueFull):
+        manager.submit(slow_operation, (release,))
+
+    manager.cancel(queued.id)
+    release.set()
+    wait_finished(running)
+    time.sleep(0.01)
+    assert manager.get(running.id) is None
+
+
+def test_cancelled_queued_job_frees_slot():
+    manager = JobManager(workers=0, max_queue=1)
+    queued = manager.submit(minimize_dfa, (make_dfa(),))
+    with pytest.raises(JobQueueFull):
+        manager.submit(minimize_dfa, (make_dfa(),))
+    assert manager.cancel(queued.id).status == CANCELLED
+    manager.submit(minimize_dfa, (make_dfa(),))
+
+
+def test_cancel_is_not_overwritten_by_worker():
+    manager = JobManager(workers=0)
+    job = manager.submit(minimize_dfa, (make_dfa(),))
+    manager.cancel(job.id)
+    manager._run(job)  # воркер, забравший задание до отмены
+    assert job.status == CANCELLED
+    assert job.result is None
+
+
+def test_eta_only_with_upper_bound():
+    stats = {"states_explored": 50, "elapsed": 1.0}
+    assert Job(None, (), {}, expected_states=100)._eta(stats) == 1.0
+    assert Job(None, (), {})._eta(stats) is None
+
+
+JSON_DFA = {
+    "states": [{"name": "s0", "is_final": False}, {"name": "s1", "is_final": True}],
+    "alphabet": ["a"],
+    "transitions": [
+        {"source": {"name": "s0", "is_final": False}, "symbol": "a", "target": {"name": "s1", "is_final": True}},
+        {"source": {"name": "s1", "is_final": True}, "symbol": "a", "target": {"name": "s1", "is_final": True}},
+    ],
+    "start_state": {"name": "s0", "is_final": False},
+}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    pytest.importorskip("flask")
+    import main
+
+    def use_manager(**kwargs):
+        monkeypatch.setattr(main, "job_manager", JobManager(**kwargs))
+
+    use_manager(workers=1)
+    return main.app.test_client(), use_manager
+
+
+def test_jobs_endpoints_submit_poll_result(api):
+    client, _ = api
+    response = client.post("/jobs", json={"op": "product", "dfas": [JSON_DFA, JSON_DFA]})
+    assert response.status_code == 202
+    job_id = response.get_json()["id"]
+
+    deadline = time.time() + 5
+    while client.get(f"/jobs/{job_id}").get_json()["status"] != DONE and time.time() < deadline:
+        time.sleep(0.01)
+    result = client.get(f"/jobs/{job_id}/result").get_json()["result"]
+    assert result["start_state"] == "(s0,s0)"
+
+    events = client.get(f"/jobs/{job_id}/events").get_data(as_text=True)
+    assert '"status": "done"' in events
+
+
+def test_jobs_endpoints_cancel_and_errors(api):
+    client, use_manager = api
+    use_manager(workers=0, max_queue=1)
+    job_id = client.post("/jobs", json={"op": "minimize", "dfas": [JSON_DFA]}).get_json()["id"]
+    assert client.get(f"/jobs/{job_id}/result").status_code == 409
+
+    full = client.post("/jobs", json={"op": "minimize", "dfas": [JSON_DFA]})
+    assert full.status_code == 429
+    assert full.headers["Retry-After"]
+
+    assert client.delete(f"/jobs/{job_id}").get_json()["status"] == CANCELLED
+    assert client.post("/jobs", json={"op": "minimize", "dfas": [JSON_DFA]}).status_code == 202
+
+    assert client.get("/jobs/missing").status_code == 404
+    assert client.delete("/jobs/missing").status_code == 404
+    assert client.get("/jobs/missing/result").status_code == 404
+    assert client.post("/jobs", json={"op": "explode", "dfas": []}).status_code == 400
+    assert client.post("/jobs", json={"op": "minimize", "dfas": []}).status_code == 400
@@ -0,0 +1,42 @@
+from equivalency import are_equivalent
+from learning import MembershipOracle, RandomWalkOracle, ReferenceOracle, learn_dfa
+from minimize import minimize_dfa
+from util import dfa_from_string
+
+
+def make_target():
+    # Слова над {a, b}, в которых число a делится на 3. Состояния помнят ещё и то,
+    # был ли последний символ b, поэтому автомат избыточен: 6 состояний вместо 3
+    states, transitions = {}, {}
+    for count in range(3):
+        for suffix in ("", "b"):
+            states[f"c{count}{suffix}"] = count == 0
+    for count in range(3):
+        for suffix in ("", "b"):
+            transitions[(f"c{count}{suffix}", 'a')] = f"c{(count + 1) % 3}"
+            transitions[(f"c{count}{suffix}", 'b')] = f"c{count}b"
+    return dfa_from_string({'states': states, 'alphabet': {'a', 'b'}, 'start': 'c0', 'transitions': transitions})
+
+
+def test_learns_minimal_equivalent_dfa():
+    target = make_target()
+    membership = MembershipOracle(target.check_word)
+    learned = learn_dfa({'a', 'b'}, membership, ReferenceOracle(target))
+    assert are_equivalent(learned, target)
+    assert len(learned.states) == len(minimize_dfa(target).states)
+    assert membership.queries < membership.lookups
+
+
+def test_membership_cache_asks_each_word_once():
+    asked = []
+    membership = MembershipOracle(lambda word: asked.append(word) or word.endswith("a"))
+    assert membership("ba") and membership("ba") and not membership("b")
+    assert asked == ["ba", "b"]
+    assert (membership.queries, membership.lookups) == (2, 3)
+
+
+def test_random_walk_oracle():
+    target = make_target()
+    membership = MembershipOracle(target.check_word)
+    learned = learn_dfa({'a', 'b'}, membership, RandomWalkOracle(membership, {'a', 'b'}, seed=1))
+    assert are_equivalent(learned, target)
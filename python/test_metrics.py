@@ -0,0 +1,53 @@
+import pytest
+from difference import build_difference_automaton
+from metrics import MetricsRegistry, registry
+from minimize import minimize_dfa
+from util import dfa_from_string
+
+
+@pytest.fixture
+def enabled_registry():
+    registry.reset()
+    registry.enabled = True
+    yield registry
+    registry.enabled = False
+    registry.reset()
+
+
+def make_dfa():
+    return dfa_from_string({
+        'states': {'s0': False, 's1': True, 's2': True},
+        'alphabet': {'a'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s1', 'a'): 's2', ('s2', 'a'): 's1'}
+    })
+
+
+def test_disabled_registry_collects_nothing():
+    metrics = MetricsRegistry()
+    metrics.inc("dfa_operations_total", operation="minimize")
+    metrics.observe("dfa_operation_seconds", 0.1, operation="minimize")
+    with metrics.timer("minimize"):
+        pass
+    assert metrics.render_prometheus() == "\n"
+
+
+def test_minimize_records_stages(enabled_registry):
+    minimize_dfa(make_dfa())
+    text = enabled_registry.render_prometheus()
+
+    assert 'dfa_operations_total{operation="minimize"} 1' in text
+    for stage in ("trim", "refine", "build"):
+        assert f'dfa_stage_seconds_count{{operation="minimize",stage="{stage}"}} 1' in text
+    assert 'dfa_input_states_sum{operation="minimize"} 3' in text
+    assert 'dfa_output_states_sum{operation="minimize"} 2' in text
+    assert 'dfa_refinement_rounds_count{operation="minimize"} 1' in text
+
+
+def test_difference_records_explored_pairs(enabled_registry):
+    build_difference_automaton(make_dfa(), make_dfa())
+    text = enabled_registry.render_prometheus()
+
+    assert "# TYPE dfa_product_states_explored histogram" in text
+    assert 'dfa_product_states_explored_sum{operation="difference"} 3' in text
+    assert 'dfa_product_states_explored_bucket{operation="difference",le="+Inf"} 1' in text
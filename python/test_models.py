@@ -0,0 +1,113 @@
+import pickle
+
+import pytest
+from difference import build_difference_automaton
+from models import DFA, State, Transition
+from util import dfa_from_string
+
+
+def test_state_and_transition_are_immutable():
+    s0 = State("s0")
+    t = Transition(s0, "a", s0)
+    with pytest.raises(AttributeError):
+        s0.is_final = True
+    with pytest.raises(AttributeError):
+        t.target = State("s1")
+    assert not hasattr(s0, "__dict__")
+    assert not hasattr(t, "__dict__")
+
+
+def test_dfa_is_immutable():
+    s0 = State("s0", is_final=True)
+    dfa = DFA({s0}, {"a"}, {Transition(s0, "a", s0)}, s0)
+    with pytest.raises(AttributeError):
+        dfa.start_state = None
+    with pytest.raises(AttributeError):
+        dfa.states.add(State("s1"))
+
+
+def test_dfa_interns_equal_states():
+    # Как при чтении из JSON: у каждого перехода свои копии состояний
+    dfa = DFA(
+        states={State("s0"), State("s1", is_final=True)},
+        alphabet={"a"},
+        transitions={Transition(State("s0"), "a", State("s1", is_final=True))},
+        start_state=State("s0"),
+    )
+    states = {s.name: s for s in dfa.states}
+    (t,) = dfa.transitions
+    assert t.source is states["s0"]
+    assert t.target is states["s1"]
+    assert dfa.start_state is states["s0"]
+
+
+def test_pickle_roundtrip():
+    dfa = dfa_from_string({
+        'states': {'s0': False, 's1': True},
+        'alphabet': {'a'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1'}
+    })
+    restored = pickle.loads(pickle.dumps(dfa))
+    assert restored.states == dfa.states
+    assert restored.transitions == dfa.transitions
+    assert restored.check_word("a") and not restored.check_word("aa")
+
+
+def test_difference_states_are_consistent_in_hashed_lookups():
+    dfa1 = dfa_from_string({
+        'states': {'s0': False, 's1': True},
+        'alphabet': {'a'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s1', 'a'): 's1'}
+    })
+    dfa2 = dfa_from_string({
+        'states': {'q0': True},
+        'alphabet': {'a'},
+        'start': 'q0',
+        'transitions': {}
+    })
+    diff = build_difference_automaton(dfa1, dfa2)
+    for t in diff.transitions:
+        assert t.source in diff.states
+        assert t.target in diff.states
+        assert diff.get_next_state(t.source, t.symbol) is t.target
+    assert diff.check_word("aa")
+
+
+def make_dfa_with_trap():
+    # Язык: a b* c; после любого 'c' или 'a' не в начале — ловушка
+    return dfa_from_string({
+        'states': {'s0': False, 's1': False, 's2': True, 'trap': False},
+        'alphabet': {'a', 'b', 'c'},
+        'start': 's0',
+        'transitions': {
+            ('s0', 'a'): 's1', ('s0', 'b'): 'trap', ('s0', 'c'): 'trap',
+            ('s1', 'a'): 'trap', ('s1', 'b'): 's1', ('s1', 'c'): 's2',
+            ('s2', 'a'): 'trap', ('s2', 'b'): 'trap', ('s2', 'c'): 'trap',
+            ('trap', 'a'): 'trap', ('trap', 'b'): 'trap', ('trap', 'c'): 'trap',
+        }
+    })
+
+
+def test_distances_to_final_skip_dead_states():
+    dfa = make_dfa_with_trap()
+    distances = {s.name: d for s, d in dfa.distances_to_final().items()}
+    assert distances == {'s2': 0, 's1': 1, 's0': 2}
+    assert not dfa.is_live(State('trap'))
+
+
+def test_check_word_rejects_after_entering_dead_state():
+    dfa = make_dfa_with_trap()
+    assert dfa.check_word("abbbc")
+    assert not dfa.check_word("b" + "a" * 10_000)
+    assert not dfa.check_word("abc" + "c")
+
+
+def test_min_remaining_length():
+    dfa = make_dfa_with_trap()
+    assert dfa.min_remaining_length("") == 2
+    assert dfa.min_remaining_length("abb") == 1
+    assert dfa.min_remaining_length("abc") == 0
+    assert dfa.min_remaining_length("ac" + "c") is None
+    assert dfa.min_remaining_length("x") is None
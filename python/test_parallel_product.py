@@ -0,0 +1,47 @@
+from difference import build_pair_automaton, is_intersection_final, is_xor_final
+from parallel_product import ParallelProductExplorer
+from util import canonical_form, dfa_from_string
+
+
+def make_mod(n, name):
+    # Слова над {a, b}, где число a делится на n
+    return dfa_from_string({
+        'states': {f"{name}{i}": i == 0 for i in range(n)},
+        'alphabet': {'a', 'b'},
+        'start': f"{name}0",
+        'transitions': {**{(f"{name}{i}", 'a'): f"{name}{(i + 1) % n}" for i in range(n)},
+                        **{(f"{name}{i}", 'b'): f"{name}{i}" for i in range(n)}}
+    })
+
+
+def make_partial():
+    return dfa_from_string({
+        'states': {'p0': False, 'p1': True},
+        'alphabet': {'a', 'c'},
+        'start': 'p0',
+        'transitions': {('p0', 'c'): 'p1'}
+    })
+
+
+def test_build_matches_sequential_product():
+    for dfa1, dfa2 in ((make_mod(3, "x"), make_mod(4, "y")), (make_mod(3, "x"), make_partial())):
+        expected = build_pair_automaton(dfa1, dfa2, is_xor_final)
+        built = ParallelProductExplorer(dfa1, dfa2, is_xor_final, workers=3).build()
+        assert canonical_form(built) == canonical_form(expected)
+        assert {s.name for s in built.states} == {s.name for s in expected.states}
+
+
+def test_emptiness_and_witness():
+    dfa1, dfa2 = make_mod(3, "x"), make_mod(4, "y")
+    explorer = ParallelProductExplorer(dfa1, dfa2, is_xor_final, workers=2)
+    assert not explorer.is_empty()
+    word = explorer.witness()
+    assert dfa1.check_word(word) != dfa2.check_word(word)
+    assert word.count('a') == 3 and len(word) == 3
+
+    same = ParallelProductExplorer(dfa1, make_mod(3, "z"), is_xor_final, workers=2)
+    assert same.is_empty()
+    assert same.witness() is None
+
+    both = ParallelProductExplorer(dfa1, dfa2, is_intersection_final, workers=2)
+    assert both.witness() == ""
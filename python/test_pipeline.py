@@ -0,0 +1,108 @@
+import pytest
+from pipeline import PipelineError, run_pipeline
+from util import dfa_from_string
+
+
+def make_a_star():
+    return dfa_from_string({
+        'states': {'s0': True, 's1': True},
+        'alphabet': {'a', 'b'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s1', 'a'): 's0'}
+    })
+
+
+def make_even_a():
+    return dfa_from_string({
+        'states': {'q0': True, 'q1': False},
+        'alphabet': {'a', 'b'},
+        'start': 'q0',
+        'transitions': {('q0', 'a'): 'q1', ('q1', 'a'): 'q0'}
+    })
+
+
+STEPS = {
+    "mA": {"op": "minimize", "args": ["A"]},
+    "mB": {"op": "minimize", "args": ["B"]},
+    "x": {"op": "xor", "args": ["mA", "mB"]},
+    "empty": {"op": "is_empty", "args": ["x"]},
+    "w": {"op": "witness", "args": ["x"]},
+}
+
+
+def test_xor_witness_pipeline():
+    results = run_pipeline({"A": make_a_star(), "B": make_even_a()}, STEPS, ["empty", "w"])
+    assert results == {"empty": False, "w": "a"}
+
+
+def test_only_needed_steps_run_once():
+    parsed = []
+
+    def parse(name):
+        parsed.append(name)
+        return {"A": make_a_star, "B": make_even_a}[name]()
+
+    results = run_pipeline({"A": "A", "B": "B", "C": "C"}, STEPS, ["mA", "x", "empty"], parse=parse)
+    assert sorted(parsed) == ["A", "B"]
+    assert results["empty"] is False
+    assert len(results["mA"].states) == 1
+
+
+def test_invalid_pipelines():
+    inputs = {"A": make_a_star()}
+    with pytest.raises(PipelineError):
+        run_pipeline(inputs, {"s": {"op": "explode", "args": ["A"]}}, ["s"])
+    with pytest.raises(PipelineError):
+        run_pipeline(inputs, {"s": {"op": "minimize", "args": ["t"]}, "t": {"op": "minimize", "args": ["s"]}}, ["s"])
+    with pytest.raises(PipelineError):
+        run_pipeline(inputs, {"e": {"op": "is_empty", "args": ["A"]}, "w": {"op": "witness", "args": ["e"]}}, ["w"])
+    with pytest.raises(PipelineError):
+        run_pipeline(inputs, {}, ["missing"])
+
+
+def test_malformed_structure_is_pipeline_error():
+    inputs = {"A": make_a_star()}
+    for steps, outputs in [({"x": "minimize"}, ["x"]), ({"x": {"op": "minimize", "args": "A"}}, ["x"]),
+                           ([], ["A"]), ({}, "A"), ({}, [["A"]])]:
+        with pytest.raises(PipelineError):
+            run_pipeline(inputs, steps, outputs)
+
+
+def test_non_object_bodies_are_bad_request():
+    pytest.importorskip("flask")
+    from main import app
+
+    client = app.test_client()
+    assert client.post("/pipeline", json=[1, 2]).status_code == 400
+    response = client.post("/pipeline", json={"inputs": {}, "steps": {"x": "minimize"}, "outputs": ["x"]})
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    assert client.post("/jobs", json="minimize").status_code == 400
+
+
+def test_closure_operations_in_pipeline():
+    results = run_pipeline(
+        {"A": make_a_star(), "B": make_even_a()},
+        {"c": {"op": "concatenation", "args": ["B", "B"]},
+         "same": {"op": "equivalent", "args": ["c", "B"]}},
+        ["same"],
+    )
+    assert results["same"] is True
+
+
+def test_empty_language_operand():
+    empty = dfa_from_string({
+        'states': {'e0': False},
+        'alphabet': {'a', 'b'},
+        'start': 'e0',
+        'transitions': {('e0', 'a'): 'e0'}
+    })
+    results = run_pipeline({"A": make_even_a(), "B": empty}, STEPS, ["mB", "empty", "w"])
+    assert results["mB"].start_state is None
+    assert results == {"mB": results["mB"], "empty": False, "w": ""}
+
+    both_empty = run_pipeline({"A": empty, "B": empty}, STEPS, ["empty", "w"])
+    assert both_empty == {"empty": True, "w": None}
+
+    steps = {"mA": STEPS["mA"], "i": {"op": "intersection", "args": ["mA", "B"]}, "w": {"op": "witness", "args": ["i"]}}
+    assert run_pipeline({"A": empty, "B": make_a_star()}, steps, ["w"]) == {"w": None}
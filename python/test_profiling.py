@@ -0,0 +1,38 @@
+import time
+
+from profiling import parse_modes, profile_call
+
+
+def busy(n):
+    deadline = time.perf_counter() + 0.05
+    data = []
+    while time.perf_counter() < deadline:
+        data.append([0] * n)
+    return len(data)
+
+
+def test_parse_modes():
+    assert parse_modes(None) == set()
+    assert parse_modes("cpu") == {"cpu"}
+    assert parse_modes("all") == {"cpu", "memory"}
+    assert parse_modes("cpu, bogus") == {"cpu"}
+
+
+def test_cpu_profile_collects_collapsed_stacks():
+    result, report = profile_call(busy, 10, modes={"cpu"})
+
+    assert result > 0
+    assert not report.skipped
+    assert report.samples > 0
+    assert any(stack.endswith("test_profiling.py:busy") for stack in report.collapsed)
+    assert "busy" in report.top_functions
+    line = report.collapsed_text().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_memory_profile_reports_allocation_sites():
+    _, report = profile_call(busy, 1000, modes={"memory"})
+
+    assert report.allocations
+    assert report.allocations[0]["where"].startswith("test_profiling.py:")
+    assert report.collapsed == {}
@@ -0,0 +1,87 @@
+import string
+
+import pytest
+from models import DFA, State, Transition
+from scanner import ScanError, build_scanner
+
+
+def make_word_dfa(word):
+    states = [State(f"w{i}", is_final=(i == len(word))) for i in range(len(word) + 1)]
+    transitions = {Transition(states[i], c, states[i + 1]) for i, c in enumerate(word)}
+    return DFA(set(states), set(word), transitions, states[0])
+
+
+def make_plus_dfa(chars):
+    # Язык: [chars]+
+    s0 = State("p0")
+    s1 = State("p1", is_final=True)
+    transitions = {Transition(s0, c, s1) for c in chars} | {Transition(s1, c, s1) for c in chars}
+    return DFA({s0, s1}, set(chars), transitions, s0)
+
+
+@pytest.fixture
+def scanner():
+    return build_scanner([
+        ("IF", make_word_dfa("if")),
+        ("ID", make_plus_dfa(string.ascii_lowercase)),
+        ("NUM", make_plus_dfa(string.digits)),
+        ("WS", make_plus_dfa(" ")),
+    ])
+
+
+def test_priority_and_longest_match(scanner):
+    tokens = list(scanner.scan("if iffy 42"))
+    assert tokens == [
+        ("IF", 0, 2), ("WS", 2, 3), ("ID", 3, 7), ("WS", 7, 8), ("NUM", 8, 10),
+    ]
+
+
+def test_backtracks_to_last_accepting_position():
+    # Шаблоны "a" и "abc": на входе "abd" берём "a", затем ошибка на "b"
+    scanner = build_scanner([("A", make_word_dfa("a")), ("ABC", make_word_dfa("abc"))])
+    tokens = scanner.scan("aabc")
+    assert next(tokens) == ("A", 0, 1)
+    assert next(tokens) == ("ABC", 1, 4)
+
+    with pytest.raises(ScanError) as error:
+        list(scanner.scan("abd"))
+    assert error.value.position == 1
+
+
+def test_stream_chunks_match_whole_text(scanner):
+    text = "if x1 iffy 2024 abc "
+    expected = list(scanner.scan(text))
+    chunks = [text[i:i + 3] for i in range(0, len(text), 3)]
+    assert list(scanner.scan_stream(chunks)) == expected
+    assert list(scanner.scan_stream(iter(text))) == expected
+
+
+def test_stream_error_position_is_absolute(scanner):
+    with pytest.raises(ScanError) as error:
+        list(scanner.scan_stream(["if ab", "c ?"]))
+    assert error.value.position == 7
+
+
+def make_complete_plus_dfa(chars, alphabet):
+    # [chars]+ как полный ДКА: остальные символы ведут в поглощающее состояние
+    s0, s1, sink = State("c0"), State("c1", is_final=True), State("sink")
+    transitions = {Transition(state, c, s1 if c in chars and state != sink else sink)
+                   for state in (s0, s1, sink) for c in alphabet}
+    return DFA({s0, s1, sink}, set(alphabet), transitions, s0)
+
+
+def test_complete_patterns_stop_at_sink():
+    alphabet = string.ascii_lowercase + " "
+    scanner = build_scanner([
+        ("ID", make_complete_plus_dfa(string.ascii_lowercase, alphabet)),
+        ("WS", make_complete_plus_dfa(" ", alphabet)),
+    ])
+    assert list(scanner.scan("ab cd")) == [("ID", 0, 2), ("WS", 2, 3), ("ID", 3, 5)]
+
+    # Сканер не заглядывает дальше конца токена: из бесконечного потока токены выдаются сразу
+    def chunks():
+        while True:
+            yield "ab "
+
+    tokens = scanner.scan_stream(chunks())
+    assert [next(tokens) for _ in range(4)] == [("ID", 0, 2), ("WS", 2, 3), ("ID", 3, 5), ("WS", 5, 6)]
@@ -0,0 +1,39 @@
+import gzip
+import json
+
+from serialization import dfa_from_columnar, gzip_chunks, iter_dfa_columnar, iter_dfa_json
+from util import canonical_form, dfa_from_string
+
+
+def make_dfa():
+    return dfa_from_string({
+        'states': {'s0': False, 's1': True, 's2': False},
+        'alphabet': {'a', 'b'},
+        'start': 's0',
+        'transitions': {('s0', 'a'): 's1', ('s1', 'b'): 's2', ('s2', 'a'): 's0', ('s1', 'a'): 's1'}
+    })
+
+
+def test_streamed_json_matches_plain_structure():
+    dfa = make_dfa()
+    data = json.loads("".join(iter_dfa_json(dfa, chunk_size=2)))
+    assert {(s["name"], s["is_final"]) for s in data["states"]} == {(s.name, s.is_final) for s in dfa.states}
+    assert {(t["source"], t["symbol"], t["target"]) for t in data["transitions"]} == \
+        {(t.source.name, t.symbol, t.target.name) for t in dfa.transitions}
+    assert data["alphabet"] == ["a", "b"]
+    assert data["start_state"] == "s0"
+
+
+def test_columnar_roundtrip():
+    dfa = make_dfa()
+    data = json.loads("".join(iter_dfa_columnar(dfa, chunk_size=1)))
+    assert data["format"] == "columnar"
+    assert len(data["source"]) == len(data["symbol"]) == len(data["target"]) == 4
+    assert canonical_form(dfa_from_columnar(data)) == canonical_form(dfa)
+
+
+def test_empty_arrays_and_gzip():
+    dfa = dfa_from_string({'states': {'q': False}, 'alphabet': {'a'}, 'start': 'q', 'transitions': {}})
+    text = "".join(iter_dfa_columnar(dfa))
+    assert json.loads(text)["source"] == []
+    assert gzip.decompress(b"".join(gzip_chunks(iter_dfa_columnar(dfa)))).decode() == text
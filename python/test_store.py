@@ -0,0 +1,81 @@
+import pytest
+from equivalency import are_equivalent
+from minimize import minimize_dfa
+from store import ResultStore, cached_minimize, cached_verdict, decode_dfa, encode_dfa
+from util import dfa_digest, dfa_from_string
+
+
+def make_dfa(prefix="s", final_first=False):
+    return dfa_from_string({
+        'states': {f'{prefix}0': final_first, f'{prefix}1': True, f'{prefix}2': True},
+        'alphabet': {'a', 'b'},
+        'start': f'{prefix}0',
+        'transitions': {(f'{prefix}0', 'a'): f'{prefix}1', (f'{prefix}1', 'a'): f'{prefix}2',
+                        (f'{prefix}2', 'a'): f'{prefix}1'}
+    })
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "results.sqlite")
+
+
+def test_encode_decode_keeps_language():
+    dfa = minimize_dfa(make_dfa())
+    restored = decode_dfa(encode_dfa(dfa))
+    assert dfa_digest(restored) == dfa_digest(dfa)
+    assert are_equivalent(restored, dfa)
+
+
+def test_minimized_survives_restart(store_path):
+    calls = []
+
+    def counting_minimize(dfa):
+        calls.append(dfa)
+        return minimize_dfa(dfa)
+
+    store = ResultStore(store_path)
+    first = cached_minimize(make_dfa("s"), store, counting_minimize)
+    store.close()
+
+    store = ResultStore(store_path, warm=True)
+    # Другие имена состояний, тот же канонический дайджест
+    second = cached_minimize(make_dfa("q"), store, counting_minimize)
+    assert len(calls) == 1
+    assert dfa_digest(second) == dfa_digest(first)
+
+
+def test_symmetric_verdicts(store_path):
+    store = ResultStore(store_path)
+    a, b = make_dfa(), make_dfa(final_first=True)
+    assert cached_verdict("equivalent", a, b, store, are_equivalent) is False
+    assert store.get_verdict("equivalent", dfa_digest(b), dfa_digest(a)) is False
+
+
+def test_eviction_bounds_size(store_path):
+    store = ResultStore(store_path, max_entries=10, memory_entries=5)
+    for i in range(300):
+        store.put_verdict("difference_empty", f"l{i}", "r", True)
+    (count,) = store._connection().execute("SELECT COUNT(*) FROM verdicts").fetchone()
+    assert count <= 10 + 100
+    assert store.get_verdict("difference_empty", "l299", "r") is True
+    assert store.get_verdict("difference_empty", "l0", "r") is None
+
+
+def test_eviction_keeps_recently_read_entries(store_path):
+    store = ResultStore(store_path, max_entries=150)
+    store.put_verdict("difference_empty", "old", "r", True)
+    store.put_minimized("old", minimize_dfa(make_dfa()))
+    for i in range(97):
+        store.put_verdict("difference_empty", f"l{i}", "r", False)
+    # Оба попадания обслуживает LRU в памяти, но время обращения должно дойти до SQLite
+    assert store.get_verdict("difference_empty", "old", "r") is True
+    assert store.get_minimized("old") is not None
+    for i in range(97, 250):
+        store.put_verdict("difference_empty", f"l{i}", "r", False)
+    store.close()
+
+    reopened = ResultStore(store_path, max_entries=150)
+    assert reopened.get_verdict("difference_empty", "old", "r") is True
+    assert reopened.get_verdict("difference_empty", "l0", "r") is None
+    assert reopened.get_minimized("old") is not None
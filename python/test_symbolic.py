@@ -0,0 +1,73 @@
+import itertools
+import pickle
+
+from difference import build_pair_automaton, is_intersection_final, is_xor_final
+from minimize import minimize_dfa
+from symbolic import (IntervalSet, SymbolicDFA, find_accepted_word, from_dfa, is_empty, minimize,
+                      product, to_dfa)
+from models import State
+from util import canonical_form
+
+
+def test_interval_set_algebra():
+    a = IntervalSet([(0, 4), (4, 6), (10, 12)])
+    assert a.intervals == ((0, 6), (10, 12))
+    assert (a & IntervalSet.range(5, 11)).intervals == ((5, 6), (10, 11))
+    assert a.complement(16).intervals == ((6, 10), (12, 16))
+    assert (a - IntervalSet.range(2, 11)).intervals == ((0, 2), (11, 12))
+    assert 11 in a and 7 not in a and len(a) == 8
+    assert IntervalSet.bit(3, 0).intervals == ((4, 8),)
+    assert IntervalSet.bit(3, 2, False).intervals == ((0, 1), (2, 3), (4, 5), (6, 7))
+    assert pickle.loads(pickle.dumps(a)) == a
+
+
+def counter(bits, index, modulo, name):
+    """Считает шаги, где бит index поднят; принимает, когда счёт делится на modulo."""
+    high, low = IntervalSet.bit(bits, index), IntervalSet.bit(bits, index, False)
+    states = [State(f"{name}{i}", i == 0) for i in range(modulo)]
+    edges = {state: ((high, states[(i + 1) % modulo]), (low, state)) for i, state in enumerate(states)}
+    return SymbolicDFA(bits, states, edges, states[0])
+
+
+def redundant(bits):
+    """Те же слова, что counter(bits, 0, 2), но с лишними копиями состояний и частичными переходами."""
+    high, low = IntervalSet.bit(bits, 0), IntervalSet.bit(bits, 0, False)
+    half = IntervalSet.range(0, 1 << (bits - 2))
+    a, b, c, d = (State(n, f) for n, f in (("a", True), ("b", False), ("c", True), ("d", False)))
+    edges = {a: ((high, b), (low - half, a), (half, c)), b: ((high, c), (low, d)),
+             c: ((high, d), (low, a)), d: ((high, a), (low, b))}
+    return SymbolicDFA(bits, [a, b, c, d, State("lost", True)], edges, a)
+
+
+def all_words(bits, length):
+    for n in range(length + 1):
+        yield from itertools.product(range(1 << bits), repeat=n)
+
+
+def test_matches_explicit_algorithms_on_small_alphabet():
+    bits = 3
+    sdfa = redundant(bits)
+    explicit = to_dfa(sdfa)
+    assert canonical_form(to_dfa(minimize(sdfa))) == canonical_form(minimize_dfa(explicit))
+    assert canonical_form(to_dfa(from_dfa(explicit, bits))) == canonical_form(explicit)
+
+    other = counter(bits, 2, 3, "m")
+    symbolic_result = to_dfa(product(sdfa, other, is_intersection_final))
+    explicit_result = build_pair_automaton(explicit, to_dfa(other), is_intersection_final)
+    assert canonical_form(minimize_dfa(symbolic_result)) == canonical_form(minimize_dfa(explicit_result))
+    for word in all_words(bits, 3):
+        assert minimize(sdfa).check_word(word) == sdfa.check_word(word)
+
+
+def test_large_alphabet_without_enumeration():
+    bits = 24  # 16 миллионов символов — перебор был бы безнадёжен
+    first, second = counter(bits, 0, 2, "x"), counter(bits, 0, 4, "y")
+    assert len(minimize(redundant(bits)).states) == 2
+    # Чётное число поднятых битов, но не кратное четырём: кратчайший свидетель — два шага
+    word = find_accepted_word(product(first, second))
+    assert len(word) == 2 and first.check_word(word) and not second.check_word(word)
+    assert is_empty(product(second, first))
+
+    same = product(first, counter(bits, 0, 2, "z"), is_xor_final)
+    assert is_empty(same)
+    assert is_empty(minimize(same)) and minimize(same).start_state is None
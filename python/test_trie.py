@@ -0,0 +1,56 @@
+import random
+
+from trie import check_sorted_words, check_words
+from util import dfa_from_string
+
+
+def make_dfa():
+    # Язык: (ab)* — после 'aa' или 'b' в начале автомат уходит в ловушку
+    return dfa_from_string({
+        'states': {'s0': True, 's1': False, 'trap': False},
+        'alphabet': {'a', 'b'},
+        'start': 's0',
+        'transitions': {
+            ('s0', 'a'): 's1', ('s0', 'b'): 'trap',
+            ('s1', 'a'): 'trap', ('s1', 'b'): 's0',
+            ('trap', 'a'): 'trap', ('trap', 'b'): 'trap',
+        }
+    })
+
+
+def random_words(count, seed=0):
+    rng = random.Random(seed)
+    words = ["", "ab", "abab", "aab", "ab", "abc"]
+    for _ in range(count):
+        words.append("".join(rng.choice("ab") for _ in range(rng.randint(0, 8))))
+    return words
+
+
+def test_check_words_matches_check_word():
+    dfa = make_dfa()
+    words = random_words(500)
+    assert check_words(dfa, words) == [dfa.check_word(w) for w in words]
+
+
+def test_check_sorted_words_matches_check_word():
+    dfa = make_dfa()
+    words = sorted(random_words(500, seed=1))
+    assert list(check_sorted_words(dfa, words)) == [dfa.check_word(w) for w in words]
+
+
+def test_dead_subtree_is_pruned():
+    dfa = make_dfa()
+    visited = []
+    original = dfa.get_next_state
+
+    class Spy:
+        def __getattr__(self, name):
+            return getattr(dfa, name)
+
+        def get_next_state(self, state, symbol):
+            visited.append((state, symbol))
+            return original(state, symbol)
+
+    words = ["b" + "a" * 50, "b" + "b" * 50, "ab"]
+    assert check_words(Spy(), words) == [False, False, True]
+    assert len(visited) == 3
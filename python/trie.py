@@ -0,0 +1,78 @@
+from models import DFA
+
+# Ключ, под которым в узле бора лежат индексы слов, оканчивающихся в этом узле
+_WORDS = None
+
+
+def build_trie(words):
+    """Строит бор: узел — словарь «символ -> дочерний узел», в узле под ключом None — индексы слов."""
+    root = {}
+    for idx, word in enumerate(words):
+        node = root
+        for symbol in word:
+            node = node.setdefault(symbol, {})
+        node.setdefault(_WORDS, []).append(idx)
+    return root
+
+
+def check_words(dfa: DFA, words) -> list[bool]:
+    """
+    Пакетная проверка принадлежности слов языку ДКА.
+
+    Один обход бора в глубину синхронно с автоматом: общий префикс проходится
+    один раз, а поддерево отбрасывается целиком, как только автомат попадает
+    в мёртвое состояние или перехода нет.
+
+    :return: Список результатов в порядке слов.
+    """
+    words = list(words)
+    result = [False] * len(words)
+    if dfa.start_state is None or not dfa.is_live(dfa.start_state):
+        return result
+
+    stack = [(build_trie(words), dfa.start_state)]
+    while stack:
+        node, state = stack.pop()
+        for symbol, child in node.items():
+            if symbol is _WORDS:
+                if state.is_final:
+                    for idx in child:
+                        result[idx] = True
+                continue
+            next_state = dfa.get_next_state(state, symbol)
+            if next_state is not None and dfa.is_live(next_state):
+                stack.append((child, next_state))
+    return result
+
+
+def check_sorted_words(dfa: DFA, words):
+    """
+    Потоковый вариант для отсортированного списка слов: бор не строится.
+
+    Для каждого слова переиспользуются состояния общего префикса с предыдущим
+    словом; память — O(длины самого длинного слова).
+
+    :return: Генератор результатов в порядке слов.
+    """
+    previous = ""
+    # path[i] — состояние после первых i символов; хранятся только живые префиксы
+    path = [dfa.start_state] if dfa.start_state is not None and dfa.is_live(dfa.start_state) else []
+    for word in words:
+        common = 0
+        limit = min(len(previous), len(word), len(path))
+        while common < limit and previous[common] == word[common]:
+            common += 1
+        previous = word
+        del path[common + 1:]
+        if len(path) <= common:
+            # Прогон умер внутри общего префикса — слово отвергается без разбора
+            yield False
+            continue
+
+        state = path[-1]
+        for symbol in word[common:]:
+            state = dfa.get_next_state(state, symbol)
+            if state is None or not dfa.is_live(state):
+                break
+            path.append(state)
+        yield len(path) == len(word) + 1 and path[-1].is_final
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from collections import deque
 
 from models import DFA, State, Transition
@@ -46,3 +48,59 @@ def dfa_from_string(description):
         start_state=states[description['start']]
     )
 
+
+def canonical_form(dfa: DFA):
+    """
+    Каноническое представление ДКА, не зависящее от имён состояний.
+
+    Состояния, достижимые из стартового, нумеруются в порядке BFS с перебором
+    символов по возрастанию. Изоморфные ДКА дают одинаковую форму.
+
+    :return: Кортеж (алфавит, финальность по номерам, переходы по номерам).
+    """
+    alphabet = tuple(sorted(dfa.alphabet))
+    if dfa.start_state is None:
+        return alphabet, (), ()
+
+    numbering = {dfa.start_state: 0}
+    order = [dfa.start_state]
+    rows = []
+    queue = deque([dfa.start_state])
+    while queue:
+        state = queue.popleft()
+        row = []
+        for symbol in alphabet:
+            target = dfa.get_next_state(state, symbol)
+            if target is None:
+                row.append(-1)
+                continue
+            if target not in numbering:
+                numbering[target] = len(order)
+                order.append(target)
+                queue.append(target)
+            row.append(numbering[target])
+        rows.append(tuple(row))
+
+    finals = tuple(state.is_final for state in order)
+    return alphabet, finals, tuple(rows)
+
+
+def dfa_digest(dfa: DFA) -> str:
+    """SHA-256 от канонической формы ДКА."""
+    alphabet, finals, rows = canonical_form(dfa)
+    payload = json.dumps([alphabet, finals, rows], separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def dfa_from_canonical(alphabet, finals, rows, prefix: str = "Q") -> DFA:
+    """Обратное к canonical_form: строит ДКА с состояниями Q0, Q1, ... (Q0 — стартовое)."""
+    if not rows:
+        return DFA(set(), set(alphabet), set(), None)
+    states = [State(f"{prefix}{idx}", is_final=bool(final)) for idx, final in enumerate(finals)]
+    transitions = {
+        Transition(states[source], symbol, states[target])
+        for source, row in enumerate(rows)
+        for symbol, target in zip(alphabet, row)
+        if target != -1
+    }
+    return DFA(set(states), set(alphabet), transitions, states[0])